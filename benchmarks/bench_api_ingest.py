@@ -0,0 +1,89 @@
+"""Load-test the PowerBI ingestion API in-process: requests/sec and latency for single and batch posts"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from src.monitoring import LatencyTracker
+from src.powerbi_integration.api_endpoints import create_app
+from src.powerbi_integration.upload_pipeline import InMemoryStorage
+
+class SlowStorage(InMemoryStorage):
+    def __init__(self, latency_seconds: float):
+        """In-memory blob storage with a fixed per-upload network delay"""
+        super().__init__()
+        self.latency_seconds = latency_seconds
+
+    def upload(self, blob_name: str, data: bytes) -> None:
+        time.sleep(self.latency_seconds)
+        super().upload(blob_name, data)
+
+def make_record(i: int) -> dict:
+    return {
+        'date': f'2024-01-{i % 28 + 1:02d}T00:00:00',
+        'predicted_profit': 1000.0 + i,
+        'actual_profit': 990.0 + i,
+        'features': {'Route Type': 'Domestic', 'Load Factor (%)': 80.0}
+    }
+
+async def run_load(app, path: str, payloads: list, concurrency: int) -> dict:
+    """Post every payload with bounded concurrency and summarize latency"""
+    tracker = LatencyTracker(window=len(payloads))
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        async def post(payload):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(path, json=payload)
+                tracker.record(time.perf_counter() - start)
+                assert response.status_code == 202, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(post(payload) for payload in payloads))
+        elapsed = time.perf_counter() - start
+        flushed = (await client.post('/flush')).json()
+
+    return {**tracker.summary(), 'seconds': elapsed, 'uploaded': flushed}
+
+async def main_async(args):
+    storage = SlowStorage(args.upload_latency_ms / 1000)
+    config = {'powerbi': {'upload': {'window_seconds': 0.5, 'max_queue': 10000}}}
+    app = create_app(storage=storage, config=config)
+
+    # ASGITransport does not send lifespan events, so run startup/shutdown here
+    async with app.router.lifespan_context(app):
+        single = [make_record(i) for i in range(args.requests)]
+        batches = [[make_record(i) for i in range(start, start + args.batch_size)]
+                   for start in range(0, args.requests * args.batch_size, args.batch_size)]
+
+        print(f"requests: {args.requests}  concurrency: {args.concurrency}  "
+              f"upload latency: {args.upload_latency_ms} ms")
+        print(f"{'endpoint':<28} {'req/s':>9} {'records/s':>11} {'p50 ms':>8} {'p99 ms':>8} {'blobs':>6}")
+        blobs = 0
+        for path, payloads, per_request in (('/update_predictions', single, 1),
+                                            ('/update_predictions/batch', batches, args.batch_size)):
+            result = await run_load(app, path, payloads, args.concurrency)
+            rps = len(payloads) / result['seconds']
+            print(f"{path:<28} {rps:>9.0f} {rps * per_request:>11.0f} "
+                  f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                  f"{result['uploaded']['blobs_uploaded'] - blobs:>6}")
+            blobs = result['uploaded']['blobs_uploaded']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--batch_size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--upload_latency_ms", type=float, default=50.0,
+                        help="Simulated blob upload time; uploads run off the event loop")
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure warm-path latency of the FastAPI /predict and /predict/batch routes in-process"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from src.monitoring import LatencyTracker
+from src.model_training import AirlineProfitModel
+from src.powerbi_integration.api_endpoints import create_app
+from src.powerbi_integration.upload_pipeline import InMemoryStorage
+from synthetic_data import make_data
+
+async def measure(client, path: str, payloads: list, concurrency: int) -> dict:
+    tracker = LatencyTracker(window=len(payloads))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def post(payload):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(path, json=payload)
+            tracker.record(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*(post(payload) for payload in payloads))
+    return {**tracker.summary(), 'seconds': time.perf_counter() - start}
+
+async def main_async(args):
+    X, y = make_data(5000)
+    model = AirlineProfitModel(n_estimators=args.n_estimators, max_depth=15)
+    model.fit(X, y)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = os.path.join(tmp_dir, 'model.joblib')
+        model.save_model(model_path)
+        model.export_model(os.path.splitext(model_path)[0] + '_artifact', model_path)
+
+        n_rows = max(args.requests, args.requests // 10 * args.batch_size)
+        rows = make_data(n_rows, seed=3)[0].to_dict(orient='records')
+        batches = [rows[i:i + args.batch_size] for i in range(0, len(rows), args.batch_size)]
+
+        print(f"trees: {args.n_estimators}  requests: {args.requests}  (latency is per request)")
+        print(f"{'route':<34} {'rows/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for label, compiled, coalesce, concurrency in (
+            ('/predict sklearn', False, False, 1),
+            ('/predict compiled', True, False, 1),
+            ('/predict compiled, concurrent', True, False, args.concurrency),
+            ('/predict coalesced, concurrent', True, True, args.concurrency),
+        ):
+            config = {
+                'features': {'numerical': list(X.columns)},
+                'serving': {'model_path': model_path, 'compiled': compiled,
+                            'coalescing': {'enabled': coalesce}}
+            }
+            app = create_app(storage=InMemoryStorage(), config=config)
+            async with app.router.lifespan_context(app):
+                async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                             base_url='http://test') as client:
+                    await measure(client, '/predict', rows[:20], 1)
+                    result = await measure(client, '/predict', rows[:args.requests], concurrency)
+                    print(f"{label:<34} {args.requests / result['seconds']:>8.0f} "
+                          f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}")
+
+                    if compiled and not coalesce and concurrency == 1:
+                        subset = batches[:max(1, args.requests // 10)]
+                        result = await measure(client, '/predict/batch', subset, 1)
+                        print(f"{'/predict/batch x' + str(args.batch_size):<34} "
+                              f"{len(subset) * args.batch_size / result['seconds']:>8.0f} {result['p50_ms']:>8.2f} "
+                              f"{result['p99_ms']:>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--batch_size", type=int, default=100)
+    parser.add_argument("--n_estimators", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
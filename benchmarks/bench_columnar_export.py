@@ -0,0 +1,80 @@
+"""Compare bytes written and serialize/parse time of the PowerBI feed as CSV, gzipped CSV and Parquet"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.powerbi_integration.columnar_export import (
+    PartitionedExporter, serialize_frame, deserialize_frame
+)
+from src.powerbi_integration.upload_pipeline import InMemoryStorage
+from synthetic_data import make_data
+
+def make_feed(n_rows: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    """Prediction rows spread over n_days with dates and route types"""
+    rng = np.random.default_rng(seed)
+    X, y = make_data(n_rows, seed)
+    feed = X.assign(
+        Date=pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, n_days, n_rows), unit='D'),
+        **{'Route Type': rng.choice(['Domestic', 'International', 'Regional'], n_rows)},
+        PredictedProfit=y.to_numpy() + rng.normal(0, 1e4, n_rows),
+        ActualProfit=y.to_numpy()
+    )
+    return feed.sort_values('Date', ignore_index=True)
+
+def time_format(df: pd.DataFrame, name: str, serialize, parse):
+    start = time.perf_counter()
+    data = serialize(df)
+    write_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    parse(data)
+    read_seconds = time.perf_counter() - start
+    print(f"{name:<18} {len(data) / 1e6:>9.2f} {write_seconds:>11.3f} {read_seconds:>10.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    feed = make_feed(args.rows, args.days)
+    print(f"rows: {args.rows}  days: {args.days}")
+    print(f"{'format':<18} {'MB':>9} {'write (s)':>11} {'read (s)':>10}")
+    time_format(feed, 'csv', lambda df: df.to_csv(index=False).encode('utf-8'),
+                lambda data: pd.read_csv(io.BytesIO(data)))
+    time_format(feed, 'csv.gz', lambda df: serialize_frame(df, 'csv'),
+                lambda data: deserialize_frame(data, 'csv'))
+
+    file_format = 'csv'
+    try:
+        for codec in ('snappy', 'zstd'):
+            time_format(feed, f'parquet ({codec})', lambda df: serialize_frame(df, 'parquet', codec),
+                        deserialize_frame)
+        file_format = 'parquet'
+    except ImportError:
+        print("parquet            skipped: install pyarrow or fastparquet")
+
+    # An incremental refresh only reads the partitions written since the last one
+    exporter = PartitionedExporter(InMemoryStorage(), 'predictions', file_format=file_format)
+    last_day = feed['Date'] == feed['Date'].max()
+    exporter.export(feed[~last_day])
+    seen = exporter.read_manifest()['last_sequence']
+    exporter.export(feed[last_day])
+
+    total = sum(entry['bytes'] for entry in exporter.new_partitions())
+    new = exporter.new_partitions(seen)
+    start = time.perf_counter()
+    delta = exporter.read_partitions(new)
+    elapsed = time.perf_counter() - start
+    print(f"\nIncremental refresh ({file_format}): read {len(new)} new partition(s), "
+          f"{len(delta)} rows, {sum(entry['bytes'] for entry in new) / 1e6:.2f} of "
+          f"{total / 1e6:.2f} MB in {elapsed:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare batch scoring throughput of list-of-dicts JSON input against columnar .npz input"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model_training import AirlineProfitModel
+from src.input_output import AirlineProfitIO, load_columnar_input
+from src.utils import load_config
+from synthetic_data import make_data
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--n_estimators", type=int, default=20)
+    args = parser.parse_args()
+
+    X, y = make_data(5000)
+    model = AirlineProfitModel(n_estimators=args.n_estimators)
+    model.fit(X, y)
+
+    config = load_config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      'config.yaml'))
+    schema = {'numerical': config.get('features', {}).get('numerical', [])}
+    io_handler = AirlineProfitIO(model, schema=schema)
+
+    batch, _ = make_data(args.rows, seed=7)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, 'batch.json')
+        npz_path = os.path.join(tmp_dir, 'batch.npz')
+        with open(json_path, 'w') as f:
+            json.dump(batch.to_dict(orient='records'), f)
+        np.savez(npz_path, **{name: batch[name].to_numpy() for name in batch.columns})
+
+        start = time.perf_counter()
+        with open(json_path) as f:
+            json_result = io_handler.process_batch_input(json.load(f))
+        json_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        columnar_result = io_handler.process_columnar_input(load_columnar_input(npz_path))
+        columnar_time = time.perf_counter() - start
+
+        json_size = os.path.getsize(json_path)
+        npz_size = os.path.getsize(npz_path)
+
+    assert np.allclose(json_result['predictions'], columnar_result['predictions'])
+
+    print(f"rows: {args.rows}")
+    print(f"{'path':>10} {'seconds':>9} {'rows/sec':>12} {'file MB':>9}")
+    print(f"{'json':>10} {json_time:>9.3f} {args.rows / json_time:>12,.0f} {json_size / 1e6:>9.1f}")
+    print(f"{'npz':>10} {columnar_time:>9.3f} {args.rows / columnar_time:>12,.0f} {npz_size / 1e6:>9.1f}")
+    print(f"speedup: {json_time / columnar_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
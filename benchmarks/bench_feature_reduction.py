@@ -0,0 +1,121 @@
+"""Check chunked PCA and feature selection against the in-memory fits and compare their peak memory"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.feature_selection import SelectKBest, f_regression
+from src.feature_engineering import FeatureEngineer, StreamingFeatureSelector
+
+def make_data(n_rows: int, n_features: int, seed: int = 0):
+    """Correlated features with a target driven by a few of them"""
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=(n_rows, 4))
+    mixing = rng.normal(size=(4, n_features))
+    X = pd.DataFrame(latent @ mixing + rng.normal(0, 0.5, (n_rows, n_features)) + 1e3,
+                     columns=[f'feature_{i}' for i in range(n_features)])
+    y = pd.Series(latent[:, 0] * 3e5 + latent[:, 1] * 1e5 + rng.normal(0, 5e4, n_rows), name='Profit (USD)')
+    return X, y
+
+def check_selection(X, y, k: int) -> None:
+    """Streaming scores, p-values and selection match SelectKBest(f_regression)"""
+    reference = SelectKBest(f_regression, k=k).fit(X, y)
+    for chunksize in (1000, 7777, len(X)):
+        engineer = FeatureEngineer()
+        selected = engineer.select_features(X, y, k=k, chunksize=chunksize)
+        assert list(selected.columns) == list(X.columns[reference.get_support()])
+        assert np.allclose(engineer.feature_selector.scores_, reference.scores_, rtol=1e-7)
+        assert np.allclose(engineer.feature_selector.pvalues_, reference.pvalues_, rtol=1e-6, atol=1e-300)
+
+    # Accumulators filled separately merge to the same result, and edge cases follow force_finite
+    halves = StreamingFeatureSelector(k).partial_fit(X[:500], y[:500]).merge(
+        StreamingFeatureSelector(k).partial_fit(X[500:], y[500:]))
+    assert np.allclose(halves.scores_, reference.scores_, rtol=1e-7)
+    edge = pd.DataFrame({'constant': np.ones(50), 'copy': np.arange(50.0), 'noise': np.sin(np.arange(50.0))})
+    expected, expected_p = f_regression(edge, np.arange(50.0))
+    scores, p_values = StreamingFeatureSelector(2).partial_fit(edge[:13], np.arange(13.0)).partial_fit(
+        edge[13:], np.arange(13.0, 50.0)).scores()
+    assert np.allclose(scores, expected, rtol=1e-7) and np.allclose(p_values, expected_p, rtol=1e-6)
+
+def check_pca(X, chunksize: int) -> None:
+    """IncrementalPCA finds the same subspace as PCA on all rows"""
+    full = FeatureEngineer()
+    expected = full.apply_pca(X.copy(), n_components=3)
+    chunked = FeatureEngineer()
+    actual = chunked.apply_pca(X.copy(), n_components=3, chunksize=chunksize)
+    assert np.allclose(chunked.pca.explained_variance_ratio_, full.pca.explained_variance_ratio_, rtol=1e-3)
+    for i in range(3):
+        column = f'PCA_{i + 1}'
+        correlation = np.corrcoef(actual[column], expected[column])[0, 1]
+        assert abs(correlation) > 0.999, f"{column} differs: correlation {correlation}"
+
+def peak(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak_bytes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--features", type=int, default=40)
+    parser.add_argument("--chunksize", type=int, default=50000)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    X, y = make_data(20000, args.features)
+    check_selection(X, y, args.k)
+    check_pca(X, 3000)
+    print("parity with SelectKBest(f_regression) and PCA: ok")
+
+    X, y = make_data(args.rows, args.features)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'features.csv')
+        pd.concat([X, y], axis=1).to_csv(path, index=False)
+        features = list(X.columns)
+        del X, y
+
+        def read_all():
+            frame = pd.read_csv(path)
+            return frame[features], frame['Profit (USD)']
+
+        def in_memory_selection():
+            X, y = read_all()
+            FeatureEngineer().select_features(X, y, k=args.k)
+
+        def streamed_selection():
+            chunks = ((c[features], c['Profit (USD)']) for c in pd.read_csv(path, chunksize=args.chunksize))
+            FeatureEngineer().fit_selector_chunks(chunks, k=args.k)
+
+        def in_memory_pca():
+            X, _ = read_all()
+            FeatureEngineer().apply_pca(X, n_components=3)
+
+        def streamed_pca():
+            chunks = (c[features] for c in pd.read_csv(path, chunksize=args.chunksize))
+            FeatureEngineer().fit_pca_chunks(chunks, n_components=3)
+
+        rows = [
+            ('SelectKBest, whole file', *peak(in_memory_selection)),
+            ('StreamingFeatureSelector, chunks', *peak(streamed_selection)),
+            ('PCA, whole file', *peak(in_memory_pca)),
+            ('IncrementalPCA, chunks', *peak(streamed_pca)),
+        ]
+
+    print(f"rows: {args.rows}  features: {args.features}  chunksize: {args.chunksize}")
+    print(f"{'fit':<34} {'seconds':>9} {'peak MB':>9}")
+    for label, seconds, peak_bytes in rows:
+        print(f"{label:<34} {seconds:>9.2f} {peak_bytes / 1e6:>9.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Compare peak memory and time of the in-memory pd.merge against the streaming sorted merge-join"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.monitoring import track_peak_memory
+from src.powerbi_integration.merge_join import sorted_merge_join, read_sorted_csv
+
+def write_sorted(path: str, n_rows: int, n_days: int, value_column: str, seed: int) -> None:
+    """Flight-level rows over n_days, sorted by Date, with many rows per date"""
+    rng = np.random.default_rng(seed)
+    days = np.sort(rng.integers(0, n_days, n_rows))
+    pd.DataFrame({
+        'Date': pd.Timestamp('2015-01-01') + pd.to_timedelta(days, unit='D'),
+        'Flight': rng.integers(0, 10000, n_rows),
+        value_column: rng.normal(50000, 20000, n_rows)
+    }).to_csv(path, index=False)
+
+def check_parity() -> None:
+    """Streaming output must equal pd.merge(..., sort=True) for any chunking, duplicates included"""
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        n_left, n_right = rng.integers(0, 50, 2)
+        left = pd.DataFrame({'Date': np.sort(rng.integers(0, 12, n_left)), 'Profit': rng.normal(size=n_left)})
+        right = pd.DataFrame({'Date': np.sort(rng.integers(0, 12, n_right)), 'Profit': rng.normal(size=n_right)})
+        expected = pd.merge(left, right, on='Date', suffixes=('_predicted', '_actual'), sort=True)
+
+        left_size, right_size = rng.integers(1, 8, 2)
+        batches = list(sorted_merge_join(
+            (left.iloc[i:i + left_size] for i in range(0, n_left, left_size)),
+            (right.iloc[i:i + right_size] for i in range(0, n_right, right_size))
+        ))
+        result = pd.concat(batches, ignore_index=True) if batches else expected.iloc[:0]
+        pd.testing.assert_frame_equal(result, expected.reset_index(drop=True))
+    print("parity with pd.merge: ok")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--days", type=int, default=3650)
+    parser.add_argument("--chunksize", type=int, default=100000)
+    args = parser.parse_args()
+
+    check_parity()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        predictions_path = os.path.join(tmp_dir, 'predictions.csv')
+        actuals_path = os.path.join(tmp_dir, 'actuals.csv')
+        write_sorted(predictions_path, args.rows, args.days, 'Profit', seed=0)
+        write_sorted(actuals_path, args.rows // 10, args.days, 'Profit', seed=1)
+
+        stats = {}
+        start = time.perf_counter()
+        with track_peak_memory(stats, 'in_memory'):
+            merged = pd.merge(pd.read_csv(predictions_path, parse_dates=['Date']),
+                              pd.read_csv(actuals_path, parse_dates=['Date']),
+                              on='Date', suffixes=('_predicted', '_actual'))
+            in_memory_rows = len(merged)
+            del merged
+        in_memory_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        streamed_rows = 0
+        with track_peak_memory(stats, 'streaming'):
+            for batch in sorted_merge_join(read_sorted_csv(predictions_path, chunksize=args.chunksize),
+                                           read_sorted_csv(actuals_path, chunksize=args.chunksize)):
+                streamed_rows += len(batch)
+        streaming_seconds = time.perf_counter() - start
+
+    assert streamed_rows == in_memory_rows
+    print(f"joined rows: {in_memory_rows}")
+    print(f"{'method':<12} {'seconds':>9} {'peak MB':>9}")
+    print(f"{'pd.merge':<12} {in_memory_seconds:>9.2f} {stats['in_memory'] / 1e6:>9.1f}")
+    print(f"{'streaming':<12} {streaming_seconds:>9.2f} {stats['streaming'] / 1e6:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Report parallel batch scoring speedup against worker count on a synthetic airline dataset"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model_training import AirlineProfitModel
+from src.parallel_scoring import ParallelScorer
+from synthetic_data import make_data
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000000)
+    parser.add_argument("--n_estimators", type=int, default=100)
+    parser.add_argument("--backend", choices=['process', 'thread'], default='process')
+    parser.add_argument("--workers", type=int, nargs='+')
+    args = parser.parse_args()
+
+    cores = os.cpu_count()
+    workers = args.workers or sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+
+    X, y = make_data(20000)
+    model = AirlineProfitModel(n_estimators=args.n_estimators, max_depth=15)
+    model.fit(X, y)
+    batch, _ = make_data(args.rows, seed=7)
+    columns = {name: batch[name].to_numpy() for name in batch.columns}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = os.path.join(tmp_dir, 'model.joblib')
+        model.save_model(model_path)
+
+        print(f"rows: {args.rows}  trees: {args.n_estimators}  backend: {args.backend}  cores: {cores}")
+        print(f"{'workers':>8} {'seconds':>9} {'rows/sec':>12} {'speedup':>8}")
+        baseline = None
+        reference = None
+        for n_workers in workers:
+            with ParallelScorer(model_path, n_workers=n_workers, backend=args.backend) as scorer:
+                # Warm the pool so worker start-up and model loading are not timed
+                scorer.predict({name: column[:n_workers] for name, column in columns.items()})
+                start = time.perf_counter()
+                predictions = scorer.predict(columns)
+                elapsed = time.perf_counter() - start
+
+            if reference is None:
+                reference = predictions
+            assert np.array_equal(predictions, reference), "Results differ across worker counts"
+            baseline = baseline or elapsed
+            print(f"{n_workers:>8} {elapsed:>9.2f} {args.rows / elapsed:>12,.0f} {baseline / elapsed:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare serial and process-pool permutation importance and check the per-version cache"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.inspection import permutation_importance
+from src.model_training import AirlineProfitModel
+from src.permutation_importance import PermutationImportance, stratified_subsample
+from synthetic_data import make_data
+
+def config(**settings) -> dict:
+    return {'evaluation': {'permutation_importance': settings}}
+
+def check_subsample() -> None:
+    """The subsample has the requested size, no duplicates, and keeps the target's quantiles"""
+    rng = np.random.default_rng(0)
+    y = rng.lognormal(13, 0.8, 200000)
+    rows = stratified_subsample(y, 5000)
+    assert len(rows) == 5000 and len(np.unique(rows)) == 5000
+    deciles = np.quantile(y, np.linspace(0.1, 0.9, 9))
+    assert np.allclose(np.quantile(y[rows], np.linspace(0.1, 0.9, 9)), deciles, rtol=0.05)
+    assert np.array_equal(stratified_subsample(y[:100], 500), np.arange(100))
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--n_estimators", type=int, default=50)
+    parser.add_argument("--n_repeats", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    check_subsample()
+    print("stratified subsample: ok")
+
+    X, y = make_data(args.rows)
+    split = int(args.rows * 0.8)
+    model = AirlineProfitModel(n_estimators=args.n_estimators)
+    model.fit(X[:split], y[:split])
+    X_test, y_test = X[split:], y[split:]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        def engine(n_jobs, **settings):
+            return PermutationImportance(config(n_repeats=args.n_repeats, **settings), n_jobs=n_jobs,
+                                         cache_dir=os.path.join(tmp_dir, f'cache_{n_jobs}'),
+                                         shared_dir=os.path.join(tmp_dir, 'shared'))
+
+        reference, sklearn_time = timed(lambda: permutation_importance(
+            model.model, X_test, y_test, n_repeats=args.n_repeats, random_state=42))
+        serial, serial_time = timed(lambda: engine(1).run(model, X_test, y_test))
+        pooled, pool_time = timed(lambda: engine(max(2, args.workers)).run(model, X_test, y_test))
+        cached, cached_time = timed(lambda: engine(max(2, args.workers)).run(model, X_test, y_test))
+
+        # The same seeds give the same permutations whether jobs run in or out of process
+        assert np.allclose(serial['importance'], pooled['importance'], rtol=1e-9, atol=1e-12)
+        assert np.allclose(pooled['importance'], cached['importance'], rtol=0, atol=0)
+        assert list(serial['feature']) == list(pooled['feature'])
+        # Rankings agree with sklearn's (different permutations, so values only approximately)
+        expected = [X_test.columns[i] for i in np.argsort(reference.importances_mean)[::-1]]
+        assert list(serial['feature'][:2]) == expected[:2], (list(serial['feature']), expected)
+        print("serial/pool parity, cache hit and ranking vs sklearn: ok")
+
+        model.version = 'retrained'
+        _, miss_time = timed(lambda: engine(max(2, args.workers)).run(model, X_test, y_test))
+        sampled, sampled_time = timed(lambda: engine(max(2, args.workers), max_samples=len(y_test) // 4)
+                                      .run(model, X_test, y_test))
+        assert sampled.attrs['result']['rows'] == len(y_test) // 4
+
+    print(f"holdout rows: {len(y_test)}  features: {X_test.shape[1]}  repeats: {args.n_repeats}  "
+          f"cores: {os.cpu_count()}")
+    print(f"{'path':<36} {'seconds':>9}")
+    for label, seconds in (
+        ('sklearn permutation_importance', sklearn_time),
+        ('PermutationImportance, serial', serial_time),
+        (f'PermutationImportance, {max(2, args.workers)} workers', pool_time),
+        ('cached (same model version)', cached_time),
+        ('new model version (cache miss)', miss_time),
+        ('stratified 25% subsample', sampled_time),
+    ):
+        print(f"{label:<36} {seconds:>9.2f}")
+
+if __name__ == '__main__':
+    main()
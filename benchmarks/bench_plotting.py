@@ -0,0 +1,103 @@
+"""Compare rendering time of evaluation plots drawn point by point against density and sampled modes"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use('Agg')
+from src.model_evaluation import ModelEvaluator, histogram2d_uniform, stratified_sample
+
+def legacy_plots(y_true, y_pred, directory: str) -> None:
+    """The previous pyplot implementation: every point scattered, seaborn histogram"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(10, 6))
+    plt.scatter(y_true, y_pred, alpha=0.5)
+    plt.plot([y_true.min(), y_true.max()], [y_true.min(), y_true.max()], 'r--', lw=2)
+    plt.savefig(os.path.join(directory, 'legacy_actual_vs_predicted.png'))
+    plt.close()
+
+    residuals = y_true - y_pred
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 5))
+    ax1.scatter(y_pred, residuals, alpha=0.5)
+    sns.histplot(residuals, ax=ax2)
+    plt.savefig(os.path.join(directory, 'legacy_residuals.png'))
+    plt.close()
+
+def check_sample(y_true, y_pred, max_points: int) -> None:
+    """The sample respects its budget, keeps the largest errors and covers every stratum"""
+    indices = stratified_sample(y_true, y_pred, max_points)
+    assert len(indices) <= max_points
+    assert len(np.unique(indices)) == len(indices)
+    errors = np.abs(y_true - y_pred)
+    top = np.argsort(errors)[-int(max_points * 0.05):]
+    assert np.isin(top, indices).all(), "largest errors were dropped"
+    edges = np.linspace(y_true.min(), y_true.max(), 21)
+    occupied = np.unique(np.clip(np.searchsorted(edges, y_true, side='right') - 1, 0, 19))
+    sampled = np.unique(np.clip(np.searchsorted(edges, y_true[indices], side='right') - 1, 0, 19))
+    assert set(occupied) == set(sampled), "a stratum of y_true is missing from the sample"
+
+def check_histogram(x, y, bins: int = 200) -> None:
+    """Arithmetic binning matches np.histogram2d up to points on a bin edge"""
+    counts, x_edges, y_edges = histogram2d_uniform(x, y, bins)
+    expected, expected_x, expected_y = np.histogram2d(x, y, bins=bins)
+    assert np.allclose(x_edges, expected_x) and np.allclose(y_edges, expected_y)
+    assert counts.sum() == len(x)
+    assert np.abs(counts - expected).sum() <= 1e-6 * len(x) + 2
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000000)
+    parser.add_argument("--max_points", type=int, default=50000)
+    parser.add_argument("--skip_legacy", action='store_true',
+                        help="Skip the point-by-point baseline, which is slow on large inputs")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Skewed target with a long tail, as profits are
+    y_true = rng.lognormal(13, 0.8, args.rows)
+    y_pred = y_true * rng.normal(1, 0.05, args.rows) + rng.standard_t(2, args.rows) * 1e4
+    check_sample(y_true, y_pred, args.max_points)
+    check_histogram(y_true, y_pred)
+    print("stratified sample and histogram checks: ok")
+
+    evaluator = ModelEvaluator()
+    evaluator.calculate_metrics(y_true, y_pred)
+    # Warm up font and colormap caches so the first timing is not penalized
+    evaluator.save_plots(tempfile.mkdtemp(), mode='density', bins=10, workers=1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rows = []
+        if not args.skip_legacy:
+            seconds = timed(lambda: legacy_plots(y_true, y_pred, tmp_dir))
+            size = sum(os.path.getsize(os.path.join(tmp_dir, name))
+                       for name in os.listdir(tmp_dir) if name.startswith('legacy_'))
+            rows.append(('pyplot scatter (previous)', seconds, size))
+
+        for mode in ('density', 'sample'):
+            for workers in (1, 3):
+                directory = os.path.join(tmp_dir, f'{mode}_{workers}')
+                seconds = timed(lambda: evaluator.save_plots(directory, mode=mode,
+                                                             max_points=args.max_points, workers=workers))
+                size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+                rows.append((f'{mode}, {workers} thread(s)', seconds, size))
+
+    print(f"rows: {args.rows}  max_points: {args.max_points}")
+    print(f"{'renderer':<28} {'seconds':>9} {'PNG KB':>8}")
+    for label, seconds, size in rows:
+        print(f"{label:<28} {seconds:>9.2f} {size / 1e3:>8.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Compare parsing the raw CSV against reloading the dtype-optimized processed data cache"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.processed_cache import cache_format, iter_processed, load_processed
+from synthetic_data import make_data
+
+TARGET = 'Profit (USD)'
+
+def make_raw(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Synthetic airline CSV with whole-number, decimal and low-cardinality string columns"""
+    rng = np.random.default_rng(seed)
+    X, y = make_data(n_rows, seed)
+    X = X.round(2)
+    X['Fleet Availability (%)'] = rng.integers(60, 101, n_rows)
+    X['Maintenance Downtime (Hours)'] = rng.integers(0, 48, n_rows).astype(float)
+    X['Aircraft Type'] = rng.choice(['A320', 'A350', 'B737', 'B787', 'E190'], n_rows)
+    X['Route Type'] = rng.choice(['Domestic', 'International', 'Regional'], n_rows)
+    X[TARGET] = y.round(2)
+    return X
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunksize", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_path = os.path.join(tmp_dir, 'airline_data.csv')
+        cache_dir = os.path.join(tmp_dir, 'processed')
+        make_raw(args.rows).to_csv(raw_path, index=False)
+
+        raw, csv_time = timed(lambda: pd.read_csv(raw_path))
+        built, build_time = timed(lambda: load_processed(raw_path, cache_dir, TARGET))
+        cached, cached_time = timed(lambda: load_processed(raw_path, cache_dir, TARGET))
+        chunks, iter_time = timed(lambda: list(iter_processed(raw_path, cache_dir, args.chunksize, TARGET)))
+
+        # Same values as the CSV, compact dtypes, target kept at full precision
+        for df in (built, cached, pd.concat(chunks, ignore_index=True)):
+            assert list(df.columns) == list(raw.columns)
+            for column in raw.columns:
+                expected, actual = raw[column], df[column]
+                if isinstance(actual.dtype, pd.CategoricalDtype):
+                    assert (actual.astype(object) == expected.astype(object)).all(), column
+                else:
+                    assert np.array_equal(actual.to_numpy(np.float64), expected.to_numpy(np.float64)), column
+        assert cached[TARGET].dtype == raw[TARGET].dtype
+
+        # Editing the raw file invalidates the cache
+        with open(raw_path, 'a') as f:
+            f.write(pd.DataFrame([raw.iloc[0]]).to_csv(index=False, header=False))
+        assert len(load_processed(raw_path, cache_dir, TARGET)) == len(raw) + 1
+        assert len(os.listdir(cache_dir)) == 1, "stale cache was not pruned"
+
+        print(f"rows: {args.rows}  cache format: {cache_format()}")
+        print(f"{'load':<28} {'seconds':>9} {'memory MB':>10}")
+        print(f"{'read_csv':<28} {csv_time:>9.3f} {memory_mb(raw):>10.1f}")
+        print(f"{'load_processed (build)':<28} {build_time:>9.3f} {memory_mb(built):>10.1f}")
+        print(f"{'load_processed (cached)':<28} {cached_time:>9.3f} {memory_mb(cached):>10.1f}")
+        print(f"{'iter_processed (cached)':<28} {iter_time:>9.3f} "
+              f"{max(memory_mb(chunk) for chunk in chunks):>10.1f}  (largest chunk)")
+        print(f"cached reload: {csv_time / cached_time:.1f}x faster, "
+              f"{memory_mb(raw) / memory_mb(cached):.1f}x less memory")
+        print("dtypes:", ', '.join(f"{column}={dtype}" for column, dtype in cached.dtypes.items()))
+
+if __name__ == '__main__':
+    main()
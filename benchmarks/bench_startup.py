@@ -0,0 +1,105 @@
+"""Measure cold-start time of `main.py --mode predict` and check which modules it imports"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.model_training import AirlineProfitModel
+from synthetic_data import make_data
+
+# Top-level packages a single prediction must not pay for
+FORBIDDEN = ['matplotlib', 'seaborn', 'azure', 'pyodbc', 'xgboost', 'fastapi']
+# The compiled path never touches the estimator, so it must not import sklearn either
+FORBIDDEN_COMPILED = FORBIDDEN + ['sklearn', 'joblib']
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def parse_importtime(stderr: str) -> list:
+    """(module, self_us, cumulative_us, depth) for every line of -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return modules
+
+def run_predict(model_path: str, payload: str, compiled: bool, importtime: bool = False):
+    """Run one prediction in a fresh interpreter, returning (seconds, stdout, stderr)"""
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += [os.path.join(REPO_ROOT, 'main.py'), '--mode', 'predict',
+                '--model_path', model_path, '--input', payload, '--no_echo']
+    if compiled:
+        command.append('--compiled')
+
+    start = time.perf_counter()
+    # main.py reads config.yaml from the working directory
+    result = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"main.py exited with {result.returncode}:\n{result.stderr[-2000:]}")
+    return seconds, result.stdout, result.stderr
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level imports to list")
+    parser.add_argument("--max_seconds", type=float,
+                        help="Fail if the median compiled cold start exceeds this budget")
+    args = parser.parse_args()
+
+    X, y = make_data(2000)
+    model = AirlineProfitModel(n_estimators=50, max_depth=10)
+    model.fit(X, y)
+    payload = json.dumps(make_data(1, seed=3)[0].iloc[0].to_dict())
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = os.path.join(tmp_dir, 'model.joblib')
+        model.save_model(model_path)
+        model.export_model(os.path.splitext(model_path)[0] + '_artifact', model_path)
+
+        medians = {}
+        for label, compiled, forbidden in (('sklearn', False, FORBIDDEN),
+                                           ('compiled', True, FORBIDDEN_COMPILED)):
+            _, stdout, stderr = run_predict(model_path, payload, compiled, importtime=True)
+            if 'Prediction Results:' not in stdout:
+                failures.append(f"{label}: no prediction in output:\n{stdout}")
+
+            modules = parse_importtime(stderr)
+            imported = {name.split('.')[0] for name, _, _, _ in modules}
+            leaked = sorted(imported.intersection(forbidden))
+            if leaked:
+                failures.append(f"{label}: predict path imports {', '.join(leaked)}")
+
+            times = [run_predict(model_path, payload, compiled)[0] for _ in range(args.repeats)]
+            medians[label] = statistics.median(times)
+
+            top_level = sorted((m for m in modules if m[3] == 0), key=lambda m: -m[2])
+            print(f"\n{label}: median cold start {medians[label] * 1000:.0f} ms "
+                  f"over {args.repeats} runs, {len(modules)} modules imported")
+            print(f"  {'module':<40} {'cumulative ms':>14}")
+            for name, _, cumulative_us, _ in top_level[:args.top]:
+                print(f"  {name:<40} {cumulative_us / 1000:>14.1f}")
+
+    if args.max_seconds is not None and medians['compiled'] > args.max_seconds:
+        failures.append(f"compiled cold start {medians['compiled']:.2f}s exceeds "
+                        f"the {args.max_seconds:.2f}s budget")
+
+    for failure in failures:
+        print(f"\nFAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
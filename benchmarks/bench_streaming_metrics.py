@@ -0,0 +1,138 @@
+"""Check streaming evaluation metrics against sklearn and compare their peak memory with one-shot evaluation"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.metrics import (
+    mean_absolute_error,
+    mean_absolute_percentage_error,
+    mean_squared_error,
+    r2_score
+)
+from src.model_evaluation import ModelEvaluator, StreamingMetrics
+from src.model_training import AirlineProfitModel
+from src.utils import evaluate_model
+from synthetic_data import make_data
+
+def make_chunk(seed: int, n_rows: int):
+    """Deterministic (y_true, y_pred) chunk, so workers can regenerate their shards"""
+    rng = np.random.default_rng(seed)
+    y_true = rng.normal(5e5, 2e5, n_rows)
+    y_pred = y_true + rng.normal(0, 3e4, n_rows)
+    return y_true, y_pred
+
+def shard_metrics(seeds, chunk_rows: int) -> StreamingMetrics:
+    accumulator = StreamingMetrics()
+    for seed in seeds:
+        accumulator.update(*make_chunk(seed, chunk_rows))
+    return accumulator
+
+def sklearn_metrics(y_true, y_pred) -> dict:
+    return {
+        'r2_score': r2_score(y_true, y_pred),
+        'rmse': np.sqrt(mean_squared_error(y_true, y_pred)),
+        'mae': mean_absolute_error(y_true, y_pred),
+        'mape': mean_absolute_percentage_error(y_true, y_pred) * 100
+    }
+
+def assert_close(actual: dict, expected: dict, label: str) -> None:
+    for name, value in expected.items():
+        assert np.isclose(actual[name], value, rtol=1e-9, atol=1e-12), \
+            f"{label}: {name} {actual[name]} != {value}"
+
+def check_parity() -> None:
+    """Chunked, merged and edge-case results match sklearn"""
+    rng = np.random.default_rng(0)
+    y_true = rng.normal(1e6, 5e5, 100003)
+    y_true[::97] = 0.0  # exercises MAPE's epsilon guard
+    y_pred = y_true + rng.normal(0, 5e4, len(y_true))
+    expected = sklearn_metrics(y_true, y_pred)
+
+    for chunk_rows in (1, 7, 4096, len(y_true)):
+        pieces = [StreamingMetrics().update(y_true[i:i + chunk_rows], y_pred[i:i + chunk_rows])
+                  for i in range(0, len(y_true), chunk_rows)]
+        merged = StreamingMetrics()
+        for piece in reversed(pieces):
+            merged.merge(piece)
+        assert_close(merged.result(), expected, f"chunks of {chunk_rows}")
+
+    summary = StreamingMetrics().update(y_true[:50000], y_pred[:50000]).merge(
+        StreamingMetrics().update(y_true[50000:], y_pred[50000:])).summary()
+    assert np.isclose(summary['actual_summary']['std_actual'], np.std(y_true), rtol=1e-12)
+    assert np.isclose(summary['prediction_summary']['mean_prediction'], np.mean(y_pred), rtol=1e-12)
+    assert summary['actual_summary']['min_actual'] == y_true.min()
+
+    for y_t, y_p in (([3.0, 3.0, 3.0], [3.0, 3.0, 3.0]), ([3.0, 3.0, 3.0], [2.0, 3.0, 4.0])):
+        assert_close(StreamingMetrics().update(y_t, y_p).result(), sklearn_metrics(y_t, y_p), "constant target")
+
+    # Chunked evaluate_model and ModelEvaluator agree with the one-shot sklearn path
+    X, y = make_data(5000)
+    model = AirlineProfitModel(n_estimators=10)
+    model.fit(X, y)
+    predictions = model.predict(X)
+    one_shot = evaluate_model(model, X, y)
+    chunked = evaluate_model(model, X, y, chunksize=333)
+    assert np.isclose(one_shot['R2'], r2_score(y, predictions), rtol=1e-12)
+    assert np.isclose(chunked['RMSE'], one_shot['RMSE'], rtol=1e-12)
+    assert_close(ModelEvaluator().calculate_metrics(y, predictions), sklearn_metrics(y, predictions),
+                 "ModelEvaluator")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000000)
+    parser.add_argument("--chunksize", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    check_parity()
+    print("parity with sklearn: ok")
+
+    seeds = list(range(max(1, args.rows // args.chunksize)))
+    n_rows = len(seeds) * args.chunksize
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = [make_chunk(seed, args.chunksize) for seed in seeds]
+    y_true = np.concatenate([chunk[0] for chunk in chunks])
+    y_pred = np.concatenate([chunk[1] for chunk in chunks])
+    del chunks
+    expected = sklearn_metrics(y_true, y_pred)
+    one_shot_time = time.perf_counter() - start
+    one_shot_peak = tracemalloc.get_traced_memory()[1]
+    del y_true, y_pred
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    streamed = shard_metrics(seeds, args.chunksize).result()
+    streaming_time = time.perf_counter() - start
+    streaming_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert_close(streamed, expected, "streaming")
+
+    # Each worker accumulates its own shard; the parent merges the partial accumulators
+    start = time.perf_counter()
+    shards = [seeds[i::args.workers] for i in range(args.workers)]
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        partials = list(executor.map(shard_metrics, shards, [args.chunksize] * args.workers))
+    merged = StreamingMetrics()
+    for partial in partials:
+        merged.merge(partial)
+    parallel_time = time.perf_counter() - start
+    assert_close(merged.result(), expected, "merged workers")
+
+    print(f"rows: {n_rows}  chunksize: {args.chunksize}")
+    print(f"{'path':<28} {'seconds':>9} {'peak MB':>9}")
+    print(f"{'sklearn, full arrays':<28} {one_shot_time:>9.2f} {one_shot_peak / 1e6:>9.1f}")
+    print(f"{'StreamingMetrics':<28} {streaming_time:>9.2f} {streaming_peak / 1e6:>9.1f}")
+    print(f"{f'{args.workers} workers, merged':<28} {parallel_time:>9.2f} {'':>9}")
+
+if __name__ == '__main__':
+    main()
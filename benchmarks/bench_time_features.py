@@ -0,0 +1,54 @@
+"""Compare rows/sec of vectorized time features and the original per-row lambdas
+
+Parity between the two is checked in tests/test_time_features.py.
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.feature_engineering import FeatureEngineer
+
+def legacy_time_features(df):
+    """Original Series.apply implementation, kept as the parity reference"""
+    df['Peak_Hour'] = df['Scheduled_Departure_Hour'].apply(
+        lambda x: 1 if 6 <= x <= 9 or 17 <= x <= 19 else 0
+    )
+    df['Day_Period'] = df['Scheduled_Departure_Hour'].apply(
+        lambda x: 'Morning' if 5 <= x < 12
+        else 'Afternoon' if 12 <= x < 17
+        else 'Evening' if 17 <= x < 22
+        else 'Night'
+    )
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    hours = rng.integers(0, 24, args.rows).astype(float)
+    hours[rng.random(args.rows) < 0.01] = np.nan
+    df = pd.DataFrame({'Scheduled_Departure_Hour': hours})
+
+    start = time.perf_counter()
+    legacy_time_features(df.copy())
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    FeatureEngineer().create_time_features(df.copy())
+    vectorized_time = time.perf_counter() - start
+
+    print(f"rows: {args.rows}")
+    print(f"apply lambdas: {args.rows / legacy_time:>14,.0f} rows/sec")
+    print(f"vectorized:    {args.rows / vectorized_time:>14,.0f} rows/sec")
+    print(f"speedup:       {legacy_time / vectorized_time:>14.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compare sklearn RandomForestRegressor.predict against the compiled flat-array forest"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model_training import AirlineProfitModel
+from synthetic_data import make_data
+
+def time_call(func, repeats):
+    """Return the median wall time of func over repeats"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--train_rows", type=int, default=20000)
+    parser.add_argument("--batch_sizes", type=int, nargs='+', default=[1, 32, 1000, 100000])
+    args = parser.parse_args()
+
+    X, y = make_data(args.train_rows)
+    model = AirlineProfitModel(n_estimators=100)
+    model.train(X, y, cv_folds=2)
+    forest = model.model
+    compiled = model.compile()
+
+    print(f"{'batch':>8} {'sklearn ms':>12} {'compiled ms':>12} {'speedup':>8} {'max abs diff':>14}")
+    for batch_size in args.batch_sizes:
+        X_batch, _ = make_data(batch_size, seed=batch_size)
+        repeats = 5 if batch_size >= 100000 else 50
+
+        expected = forest.predict(X_batch)
+        actual = compiled.predict(X_batch)
+        sklearn_time = time_call(lambda: forest.predict(X_batch), repeats)
+        compiled_time = time_call(lambda: compiled.predict(X_batch), repeats)
+
+        print(f"{batch_size:>8} {sklearn_time * 1000:>12.3f} {compiled_time * 1000:>12.3f} "
+              f"{sklearn_time / compiled_time:>7.1f}x {np.max(np.abs(expected - actual)):>14.3e}")
+
+if __name__ == "__main__":
+    main()
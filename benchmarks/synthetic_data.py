@@ -0,0 +1,23 @@
+"""Synthetic airline data shared by the benchmarks and the test suite"""
+
+import numpy as np
+import pandas as pd
+
+FEATURES = [
+    'Revenue (USD)',
+    'Operating Cost (USD)',
+    'Load Factor (%)',
+    'Aircraft Utilization (Hours/Day)'
+]
+
+def make_data(n_rows, seed=42):
+    """Generate a synthetic airline dataset"""
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        'Revenue (USD)': rng.uniform(1e5, 5e6, n_rows),
+        'Operating Cost (USD)': rng.uniform(1e5, 4e6, n_rows),
+        'Load Factor (%)': rng.uniform(50, 100, n_rows),
+        'Aircraft Utilization (Hours/Day)': rng.uniform(4, 18, n_rows)
+    })
+    y = X['Revenue (USD)'] - X['Operating Cost (USD)'] + rng.normal(0, 1e4, n_rows)
+    return X, y
@@ -1,20 +1,34 @@
 import argparse
+import copy
 import os
 import json
+import time
 import pandas as pd
 from src.data_preprocessing import load_data, preprocess_data, split_data
 from src.model_training import AirlineProfitModel
-from src.utils import evaluate_model, plot_feature_importance
-from src.input_output import AirlineProfitIO
-from src.powerbi_integration.data_connector import PowerBIConnector
-from src.powerbi_integration.refresh_scheduler import PowerBIScheduler
-import threading
+from src.utils import evaluate_model, plot_feature_importance, load_config
+from src.input_output import AirlineProfitIO, load_columnar_input
+from src.model_registry import ModelRegistry, resolve_model_path
+from src.model_artifact import is_stale
+from src.prediction_cache import PredictionCache
+# scikit-learn, the servers, parallel scoring and PowerBI are imported by the
+# modes that use them, so `--mode predict --compiled` starts without them
 
 class AirlineProfitPrediction:
-    def __init__(self):
+    def __init__(self, config: dict = None):
+        self.config = config or {}
         self.model = None
         self.io_handler = None
+        self.model_source = None
         self.powerbi_connector = None
+        self.upload_pipeline = None
+        self.powerbi_scheduler = None
+
+        cache_config = self.config.get('serving', {}).get('cache', {})
+        self.prediction_cache = PredictionCache(
+            max_size=cache_config.get('max_size', 10000),
+            ttl_seconds=cache_config.get('ttl_seconds', 300)
+        ) if cache_config.get('enabled', False) else None
 
     def train_model(self, data_path: str, model_save_path: str) -> None:
         """
@@ -26,19 +40,20 @@ class AirlineProfitPrediction:
         """
         try:
             # 1. Load and preprocess data
-            print("Loading data...")
-            df = load_data(data_path)
-            if df is None:
-                return
-            
-            print("\nPreprocessing data...")
-            df_processed = preprocess_data(df)
-            X, y = split_data(df_processed)
+            print("Loading and preprocessing data...")
+            training_config = self.config.get('training', {})
+            df_processed = self._load_data(data_path)
+            X, y = split_data(df_processed, training_config.get('target_column', 'Profit (USD)'))
             
             # 2. Train model
             print("\nTraining model...")
-            self.model = AirlineProfitModel(n_estimators=100)
-            training_results = self.model.train(X, y)
+            params = self.config.get('model_params', {}).get('random_forest', {'n_estimators': 100})
+            self.model = AirlineProfitModel(**params)
+            training_results = self.model.train(
+                X, y,
+                test_size=training_config.get('test_size', 0.2),
+                cv_folds=training_config.get('cv_folds', 5)
+            )
             
             print("\nTraining Results:")
             print(f"Cross-validation mean score: {training_results['cv_scores_mean']:.4f}")
@@ -46,104 +61,488 @@ class AirlineProfitPrediction:
             
             # 3. Evaluate model
             print("\nEvaluating model...")
-            metrics = evaluate_model(self.model.model, self.model.X_test, self.model.y_test)
+            metrics = evaluate_model(self.model.model, self.model.X_test, self.model.y_test,
+                                     self._evaluation_chunksize())
             print("\nModel Performance:")
             for metric, value in metrics.items():
                 print(f"{metric}: {value:.4f}")
             
-            # 4. Save model
-            if model_save_path:
-                os.makedirs(os.path.dirname(model_save_path), exist_ok=True)
-                self.model.save_model(model_save_path)
-                print(f"\nModel saved to {model_save_path}")
+            # 4. Register the model and publish it as the production version
+            registry = self._registry()
+            version = registry.register(self.model, metrics, training_rows=len(X))
+            self._publish_model(registry, version, model_save_path)
             
             # 5. Plot feature importance
             print("\nGenerating feature importance plot...")
-            plot_feature_importance(self.model.model, X)
+            importances = self._permutation_importance(self.model.X_test, self.model.y_test)
+            plot_feature_importance(self.model.model, X, importances=importances)
             
             # 6. Initialize IO handler
-            self.io_handler = AirlineProfitIO(self.model)
+            self.io_handler = self._make_io_handler()
             
         except Exception as e:
             print(f"Error in training: {str(e)}")
 
-    def load_model(self, model_path: str) -> None:
+    def _make_io_handler(self) -> AirlineProfitIO:
+        """IO handler for the current model, sharing the prediction cache and feature schema"""
+        return AirlineProfitIO(self.model, cache=self.prediction_cache,
+                               schema=self.config.get('features', {}),
+                               feature_engineer=self._feature_engineer(self.model.feature_names))
+
+    def _feature_engineer(self, feature_names=None, columns=None):
+        """Fused plan for the derived features in config.yaml, see derived_feature_engineer"""
+        from src.feature_engineering import derived_feature_engineer
+        return derived_feature_engineer(self.config, feature_names, columns)
+
+    def _registry(self) -> ModelRegistry:
+        """Model registry under paths.models"""
+        return ModelRegistry(self.config.get('paths', {}).get('models', 'models/saved_models'))
+
+    def _processed_dir(self):
+        """Directory of the processed data cache, or None if caching is disabled"""
+        if not self.config.get('preprocessing', {}).get('cache', False):
+            return None
+        return self.config.get('data_paths', {}).get('processed', 'data/processed/processed_data')
+
+    def _load_data(self, data_path: str, feature_names=None) -> pd.DataFrame:
+        """
+        Load and preprocess data and derive engineered features, reusing the processed data cache
+
+        Args:
+            data_path (str): Path to the input CSV
+            feature_names (list): Features of the model the data is for; None
+                derives every configured feature, for training a new model
+        """
+        target_column = self.config.get('training', {}).get('target_column', 'Profit (USD)')
+        lossy_float32 = self.config.get('preprocessing', {}).get('lossy_float32', False)
+        cache_dir = self._processed_dir()
+        if cache_dir is not None:
+            df = load_data(data_path, cache_dir=cache_dir, target_column=target_column,
+                           lossy_float32=lossy_float32)
+        else:
+            df = preprocess_data(load_data(data_path), target_column, lossy_float32)
+
+        engineer = self._feature_engineer(feature_names, columns=list(df.columns))
+        return engineer.create_all_features(df) if engineer is not None else df
+
+    def _iter_data(self, data_path: str, chunksize: int, feature_names=None):
+        """Chunked _load_data, reusing the processed data cache when enabled"""
+        target_column = self.config.get('training', {}).get('target_column', 'Profit (USD)')
+        lossy_float32 = self.config.get('preprocessing', {}).get('lossy_float32', False)
+        cache_dir = self._processed_dir()
+        if cache_dir is not None:
+            chunks = load_data(data_path, chunksize=chunksize, cache_dir=cache_dir,
+                               target_column=target_column, lossy_float32=lossy_float32)
+        else:
+            chunks = (preprocess_data(chunk, target_column, lossy_float32)
+                      for chunk in load_data(data_path, chunksize=chunksize))
+
+        engineer = self._feature_engineer(feature_names)
+        return chunks if engineer is None else (engineer.create_all_features(chunk) for chunk in chunks)
+
+    def _evaluation_chunksize(self) -> int:
+        return self.config.get('evaluation', {}).get('chunksize', 100000)
+
+    def _permutation_importance(self, X_holdout, y_holdout):
+        """Permutation importance of the current model on a holdout set, if enabled in config.yaml"""
+        if not self.config.get('evaluation', {}).get('permutation_importance', {}).get('enabled', False):
+            return None
+
+        from src.permutation_importance import PermutationImportance
+
+        importances = PermutationImportance(self.config).run(self.model, X_holdout, y_holdout)
+        print("\nPermutation importance (R2 drop on the holdout set):")
+        for row in importances.head(10).itertuples():
+            print(f"{row.feature}: {row.importance:.4f} +/- {row.importance_std:.4f}")
+        return importances
+
+    def _publish_model(self, registry: ModelRegistry, version: str, model_save_path: str = None) -> None:
+        """
+        Make a registered version of the current model the one predict/serve load
+
+        The compiled forest is exported into the version's own directory and
+        registry.json is switched to it, so nothing a running server has
+        mapped is rewritten. A model_save_path outside the registry gets its
+        own copy as well.
+        """
+        registry.publish(version, self.model)
+        print(f"\nPublished model version {version} to {os.path.dirname(registry.model_path(version))}")
+
+        if model_save_path and resolve_model_path(model_save_path) != registry.model_path(version):
+            os.makedirs(os.path.dirname(model_save_path) or '.', exist_ok=True)
+            self.model.save_model(model_save_path)
+            self.model.export_model(os.path.splitext(model_save_path)[0] + '_artifact',
+                                    source_path=model_save_path)
+            print(f"Model saved to {model_save_path}")
+
+    def retrain_model(self, data_path: str, model_save_path: str) -> None:
+        """
+        Retrain the production model on new data and promote it if it holds up
+        
+        Args:
+            data_path (str): Path to the new data
+            model_save_path (str): Path the promoted model is published to
+        """
+        from sklearn.model_selection import train_test_split
+
+        try:
+            retraining = self.config.get('retraining', {})
+            training_config = self.config.get('training', {})
+            registry = self._registry()
+
+            # 1. Load the current production model
+            if registry.production_version:
+                current = registry.load()
+            elif os.path.exists(model_save_path):
+                current = AirlineProfitModel()
+                current.load_model(model_save_path)
+            else:
+                print("Error: No trained model to retrain. Please train a model first.")
+                return
+
+            # 2. Split the new data into training rows and a holdout for the promotion check
+            # Derive only what the production model uses, so the holdout fits both models
+            X, y = split_data(self._load_data(data_path, current.feature_names),
+                              training_config.get('target_column', 'Profit (USD)'))
+            X_train, X_holdout, y_train, y_holdout = train_test_split(
+                X, y, test_size=training_config.get('test_size', 0.2), random_state=42
+            )
+
+            # 3. Retrain on the new data only
+            mode = retraining.get('mode', 'warm_start')
+            print(f"\nRetraining ({mode}) on {len(X_train)} new rows...")
+            start = time.perf_counter()
+            if mode == 'window':
+                window_rows = retraining.get('window_rows', 100000)
+                candidate = AirlineProfitModel(**current.params)
+                candidate.fit(X_train.tail(window_rows), y_train.tail(window_rows))
+            else:
+                candidate = copy.deepcopy(current)
+                candidate.train_incremental(
+                    X_train, y_train,
+                    n_new_trees=retraining.get('n_new_trees', 50),
+                    max_estimators=retraining.get('max_estimators')
+                )
+            elapsed = time.perf_counter() - start
+            print(f"Retraining took {elapsed:.1f}s")
+
+            # 4. Register the candidate and compare it with production on the holdout
+            chunksize = self._evaluation_chunksize()
+            baseline = evaluate_model(current.model, X_holdout, y_holdout, chunksize)
+            metrics = evaluate_model(candidate.model, X_holdout, y_holdout, chunksize)
+            print(f"Production R2: {baseline['R2']:.4f}  Candidate R2: {metrics['R2']:.4f}")
+
+            if registry.production_version is None:
+                registry.publish(registry.register(current, baseline), current)
+            version = registry.register(
+                candidate, metrics,
+                parent=registry.production_version,
+                mode=mode,
+                training_rows=len(X_train),
+                training_seconds=elapsed
+            )
+
+            if metrics['R2'] >= baseline['R2'] - retraining.get('max_r2_drop', 0.01):
+                self.model = candidate
+                self._publish_model(registry, version, model_save_path)
+                self.io_handler = self._make_io_handler()
+                print(f"Promoted model version {version}")
+            else:
+                print(f"Kept production model; version {version} registered but not promoted")
+
+        except Exception as e:
+            print(f"Error in retraining: {str(e)}")
+
+    def evaluate_file(self, data_path: str, chunksize: int) -> None:
+        """
+        Evaluate the loaded model on a labelled holdout file of any size
+        
+        Rows are predicted chunk by chunk and only running sums are kept, so
+        memory is bounded by chunksize.
+        
+        Args:
+            data_path (str): Path to the holdout CSV, including the target column
+            chunksize (int): Number of rows predicted at a time
+        """
+        if self.model is None:
+            print("Error: Model not loaded. Please train or load a model first.")
+            return
+
+        from src.model_evaluation import ModelEvaluator, evaluate_chunks
+
+        try:
+            target_column = self.config.get('training', {}).get('target_column', 'Profit (USD)')
+            start = time.perf_counter()
+            accumulator = evaluate_chunks(self.model, self._iter_data(data_path, chunksize, self.model.feature_names),
+                                          target_column)
+
+            evaluator = ModelEvaluator()
+            metrics = evaluator.finalize(accumulator)
+            print(f"\nEvaluated {accumulator.n} rows in {time.perf_counter() - start:.1f}s")
+            for metric, value in metrics.items():
+                print(f"{metric}: {value:.4f}")
+
+            metrics_dir = self.config.get('paths', {}).get('metrics', 'models/model_metrics')
+            os.makedirs(metrics_dir, exist_ok=True)
+            report_path = os.path.join(metrics_dir, 'evaluation_report.json')
+            evaluator.generate_evaluation_report(report_path)
+            print(f"Evaluation report saved to {report_path}")
+        except Exception as e:
+            print(f"Error evaluating model: {str(e)}")
+
+    def search_hyperparameters(self, data_path: str) -> None:
+        """
+        Run the cross-validated hyperparameter search configured in config.yaml
+        
+        Args:
+            data_path (str): Path to input data
+        """
+        from src.hyperparameter_search import HyperparameterSearch
+
+        try:
+            target_column = self.config.get('training', {}).get('target_column', 'Profit (USD)')
+            X, y = split_data(self._load_data(data_path), target_column)
+
+            search = HyperparameterSearch(self.config)
+            print(f"Searching with {search.n_jobs} worker processes...")
+            results = search.run(X, y)
+
+            print("\nSearch Results (best first):")
+            for result in results:
+                print(f"{result['model']}: R2 {result['mean_score']:.4f} "
+                      f"(+/- {result['std_score']:.4f}, {result['cached_folds']} folds cached) "
+                      f"{result['params']}")
+        except Exception as e:
+            print(f"Error in hyperparameter search: {str(e)}")
+
+    def load_model(self, model_path: str, compiled: bool = False) -> None:
         """
         Load a trained model
         
         Args:
             model_path (str): Path to saved model
+            compiled (bool): Predict with the flat-array inference engine
         """
         try:
+            # The registry's published path follows the production version
+            model_path = resolve_model_path(model_path)
             self.model = AirlineProfitModel()
-            self.model.load_model(model_path)
-            self.io_handler = AirlineProfitIO(self.model)
+            artifact_dir = os.path.splitext(model_path)[0] + '_artifact'
+            if compiled and not is_stale(artifact_dir, source_path=model_path):
+                # Memory-map the exported forest instead of unpickling the estimator
+                self.model.load_compiled(artifact_dir)
+                self.model_source = artifact_dir
+            else:
+                self.model.load_model(model_path)
+                self.model_source = model_path
+                if compiled:
+                    self.model.compile()
+            self.io_handler = self._make_io_handler()
             print(f"Model loaded successfully from {model_path}")
         except Exception as e:
             print(f"Error loading model: {str(e)}")
 
-    def process_prediction(self, input_type: str, input_data: str) -> None:
+    def process_prediction(self, input_type: str, input_data: str,
+                           include_input: bool = True) -> None:
         """
         Process prediction request
         
         Args:
             input_type (str): 'single' or 'batch'
-            input_data (str): Path to JSON input file or JSON string
+            input_data (str): Path to JSON input file, JSON string, or
+                .npz/.npy columnar batch file
+            include_input (bool): Echo the input back in the results
         """
         if self.io_handler is None:
             print("Error: Model not loaded. Please train or load a model first.")
             return
 
         try:
-            # Load input data
-            if input_data.endswith('.json'):
-                with open(input_data, 'r') as f:
-                    data = json.load(f)
+            # Columnar batches go straight to the model without row dicts
+            if input_data.endswith(('.npz', '.npy')):
+                data = load_columnar_input(input_data)
+                result = self.io_handler.process_columnar_input(data, include_input)
             else:
-                data = json.loads(input_data)
+                # Load input data
+                if input_data.endswith('.json'):
+                    with open(input_data, 'r') as f:
+                        data = json.load(f)
+                else:
+                    data = json.loads(input_data)
 
-            # Process input
-            if input_type == 'single':
-                result = self.io_handler.process_single_input(data)
-            else:
-                result = self.io_handler.process_batch_input(data)
+                # Process input
+                if input_type == 'single':
+                    result = self.io_handler.process_single_input(data, include_input)
+                else:
+                    result = self.io_handler.process_batch_input(data, include_input)
             
             # Print results
             print("\nPrediction Results:")
             print(json.dumps(result, indent=2))
 
-            # Update PowerBI if configured
-            if self.powerbi_connector:
-                self.powerbi_connector.upload_to_azure(
-                    pd.DataFrame([result]),
-                    f'predictions_{pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")}.csv'
-                )
+            # Queue rows for PowerBI; the pipeline coalesces them into windowed blobs
+            if self.upload_pipeline and result.get('status') == 'success':
+                single = input_type == 'single' and not input_data.endswith(('.npz', '.npy'))
+                rows = pd.DataFrame([data] if single else data)
+                rows['PredictedProfit'] = result.get('predictions', result.get('predicted_profit'))
+                rows['PredictedAt'] = pd.Timestamp.now()
+                self.upload_pipeline.submit(rows)
 
         except Exception as e:
             print(f"Error processing prediction: {str(e)}")
 
+    def score_file(self, input_path: str, output_path: str, chunksize: int,
+                   workers: int = 1) -> None:
+        """
+        Score a large CSV file chunk by chunk with bounded memory
+        
+        Args:
+            input_path (str): Path to input CSV file
+            output_path (str): Path to write predictions CSV
+            chunksize (int): Number of rows scored at a time
+            workers (int): Worker processes splitting each chunk; 1 scores in-process
+        """
+        if self.model is None:
+            print("Error: Model not loaded. Please train or load a model first.")
+            return
+
+        from src.batch_scoring import score_csv_in_chunks
+
+        scoring_options = {
+            'target_column': self.config.get('training', {}).get('target_column', 'Profit (USD)'),
+            'cache_dir': self._processed_dir(),
+            'lossy_float32': self.config.get('preprocessing', {}).get('lossy_float32', False),
+            'feature_engineer': self._feature_engineer(self.model.feature_names)
+        }
+        try:
+            if workers > 1:
+                from src.parallel_scoring import ParallelScorer
+
+                parallel_config = self.config.get('batch_scoring', {})
+                with ParallelScorer(
+                    self.model_source,
+                    n_workers=workers,
+                    backend=parallel_config.get('backend', 'process'),
+                    partition_rows=parallel_config.get('partition_rows', 100000),
+                    feature_names=self.model.feature_names
+                ) as scorer:
+                    summary = score_csv_in_chunks(scorer, input_path, output_path, chunksize,
+                                                  **scoring_options)
+            else:
+                summary = score_csv_in_chunks(self.model, input_path, output_path, chunksize,
+                                              **scoring_options)
+            print(f"\nScored {summary['rows']} rows in {summary['seconds']:.1f}s "
+                  f"({summary['rows_per_second']:.0f} rows/sec)")
+            print(f"Predictions written to {output_path}")
+
+            # New predictions on disk: push the delta to PowerBI now instead of at the next interval
+            if self.powerbi_scheduler:
+                self.powerbi_scheduler.trigger()
+        except Exception as e:
+            print(f"Error scoring file: {str(e)}")
+
+    def serve(self, host: str, port: int, latency_window: int = 10000,
+              coalescing: dict = None) -> None:
+        """
+        Serve predictions from the warm model until interrupted
+        
+        Args:
+            host (str): Interface to bind
+            port (int): Port to listen on
+            latency_window (int): Number of recent requests used for latency percentiles
+            coalescing (dict): Micro-batching settings (max_batch_size, max_wait_ms),
+                or None to score each request on its own
+        """
+        if self.io_handler is None:
+            print("Error: Model not loaded. Please train or load a model first.")
+            return
+
+        from src.prediction_server import PredictionServer
+        from src.request_coalescer import PredictionCoalescer
+
+        coalescer = None
+        if coalescing is not None:
+            coalescer = PredictionCoalescer(
+                self.io_handler,
+                max_batch_size=coalescing.get('max_batch_size', 64),
+                max_wait_ms=coalescing.get('max_wait_ms', 2.0)
+            )
+            coalescer.start_background()
+
+        server = PredictionServer(self.io_handler, latency_window=latency_window,
+                                  coalescer=coalescer)
+        try:
+            server.serve_forever(host, port)
+        finally:
+            if coalescer:
+                coalescer.stop_background()
+
     def start_powerbi_integration(self) -> None:
         """Initialize and start PowerBI integration"""
+        from src.powerbi_integration.data_connector import PowerBIConnector
+        from src.powerbi_integration.refresh_scheduler import PowerBIScheduler
+        from src.powerbi_integration.upload_pipeline import create_upload_pipeline, LocalFileStorage
+        from src.powerbi_integration.watermarks import WatermarkStore
+
         try:
             self.powerbi_connector = PowerBIConnector()
-            scheduler = PowerBIScheduler(self.powerbi_connector)
-            
-            # Start scheduler in separate thread
-            scheduler_thread = threading.Thread(
-                target=scheduler.schedule_refresh,
-                args=(24,)  # 24-hour refresh interval
+
+            upload_config = self.config.get('powerbi', {}).get('upload', {})
+            if upload_config.get('storage', 'azure') == 'local':
+                # Refreshes go through the connector, so point it at the same directory
+                self.powerbi_connector.storage = LocalFileStorage(
+                    upload_config.get('local_dir', 'data/processed/powerbi_uploads')
+                )
+            self.upload_pipeline = create_upload_pipeline(self.powerbi_connector.storage, upload_config)
+
+            refresh_config = self.config.get('powerbi', {}).get('refresh', {})
+            self.powerbi_scheduler = PowerBIScheduler(
+                self.powerbi_connector,
+                load_data=self._load_refresh_data,
+                watermarks=WatermarkStore(
+                    refresh_config.get('watermark_path', 'data/processed/powerbi_watermarks.json')
+                ),
+                dataset=refresh_config.get('dataset', 'predictions_vs_actuals')
             )
-            scheduler_thread.daemon = True
-            scheduler_thread.start()
+            
+            # Start scheduler in separate thread; it wakes on trigger() or the interval
+            self.powerbi_scheduler.start(refresh_config.get('interval_hours', 24))
             print("PowerBI integration started successfully")
         except Exception as e:
             print(f"Error starting PowerBI integration: {str(e)}")
 
+    def _load_refresh_data(self):
+        """Read the predictions and actuals files the incremental refresh merges"""
+        refresh_config = self.config.get('powerbi', {}).get('refresh', {})
+        predictions_path = refresh_config.get(
+            'predictions_path',
+            self.config.get('data_paths', {}).get('predictions', 'data/processed/predictions.csv')
+        )
+        actuals_path = refresh_config.get('actuals_path', 'data/processed/actuals.csv')
+        chunksize = refresh_config.get('chunksize')
+        if chunksize:
+            # Merged chunk by chunk; both files must be sorted by Date
+            from src.powerbi_integration.merge_join import read_sorted_csv
+            return (read_sorted_csv(predictions_path, chunksize=chunksize),
+                    read_sorted_csv(actuals_path, chunksize=chunksize))
+        return (pd.read_csv(predictions_path, parse_dates=['Date']),
+                pd.read_csv(actuals_path, parse_dates=['Date']))
+
+    def stop_powerbi_integration(self) -> None:
+        """Upload any queued prediction rows and finish requested refreshes before exiting"""
+        if self.powerbi_scheduler:
+            self.powerbi_scheduler.stop()
+        if self.upload_pipeline:
+            self.upload_pipeline.close()
+            stats = self.upload_pipeline.stats()
+            print(f"Uploaded {stats['rows_uploaded']} prediction rows "
+                  f"in {stats['blobs_uploaded']} blobs")
+
 def main():
     parser = argparse.ArgumentParser(description="Airline Profit Prediction System")
     parser.add_argument(
         "--mode",
-        choices=['train', 'predict'],
+        choices=['train', 'retrain', 'predict', 'serve', 'score', 'search', 'evaluate'],
         default='predict',
         help="Mode of operation"
     )
@@ -170,6 +569,47 @@ def main():
         type=str,
         help="Input JSON string or file path"
     )
+    parser.add_argument(
+        "--no_echo",
+        action='store_true',
+        help="Leave the input data out of prediction results"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Output CSV path in score mode (defaults to data_paths.predictions in config.yaml)"
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        help="Rows per chunk in score and evaluate modes "
+             "(defaults to batch_scoring.chunksize / evaluation.chunksize in config.yaml)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Parallel workers in score mode (defaults to batch_scoring.workers in config.yaml)"
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        help="Host to bind in serve mode (defaults to serving.host in config.yaml)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Port to listen on in serve mode (defaults to serving.port in config.yaml)"
+    )
+    parser.add_argument(
+        "--coalesce",
+        action='store_true',
+        help="Micro-batch concurrent single predictions in serve mode"
+    )
+    parser.add_argument(
+        "--compiled",
+        action='store_true',
+        help="Predict with the compiled flat-array forest instead of sklearn"
+    )
     parser.add_argument(
         "--powerbi",
         action='store_true',
@@ -177,9 +617,10 @@ def main():
     )
 
     args = parser.parse_args()
+    config = load_config()
     
     # Initialize system
-    system = AirlineProfitPrediction()
+    system = AirlineProfitPrediction(config)
 
     # Enable PowerBI integration if requested
     if args.powerbi:
@@ -187,13 +628,49 @@ def main():
 
     if args.mode == 'train':
         system.train_model(args.data_path, args.model_path)
+    elif args.mode == 'retrain':
+        system.retrain_model(args.data_path, args.model_path)
+    elif args.mode == 'search':
+        system.search_hyperparameters(args.data_path)
+    elif args.mode == 'serve':
+        # Load model once and keep it warm for all requests
+        serving_config = config.get('serving', {})
+        coalescing = serving_config.get('coalescing', {})
+        if not (args.coalesce or coalescing.get('enabled', False)):
+            coalescing = None
+        system.load_model(args.model_path, args.compiled)
+        system.serve(
+            args.host or serving_config.get('host', '127.0.0.1'),
+            args.port or serving_config.get('port', 8080),
+            serving_config.get('latency_window', 10000),
+            coalescing
+        )
+    elif args.mode == 'evaluate':
+        # Stream a labelled holdout file through the model, keeping only running metrics
+        system.load_model(args.model_path, args.compiled)
+        system.evaluate_file(
+            args.data_path,
+            args.chunksize or config.get('evaluation', {}).get('chunksize', 100000)
+        )
+    elif args.mode == 'score':
+        # Stream a CSV through the model without loading it all into memory
+        system.load_model(args.model_path, args.compiled)
+        system.score_file(
+            args.input or args.data_path,
+            args.output or config.get('data_paths', {}).get('predictions', 'data/processed/predictions.csv'),
+            args.chunksize or config.get('batch_scoring', {}).get('chunksize', 100000),
+            args.workers or config.get('batch_scoring', {}).get('workers', 1)
+        )
     else:
         # Load model for prediction
-        system.load_model(args.model_path)
+        system.load_model(args.model_path, args.compiled)
         if args.input:
-            system.process_prediction(args.input_type, args.input)
+            system.process_prediction(args.input_type, args.input, not args.no_echo)
         else:
             print("Error: Input data required for prediction mode")
 
+    if args.powerbi:
+        system.stop_powerbi_integration()
+
 if __name__ == "__main__":
     main()
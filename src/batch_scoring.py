@@ -0,0 +1,116 @@
+# src/batch_scoring.py
+
+import os
+import time
+import pandas as pd
+from typing import Dict, List, Optional
+from src.data_preprocessing import load_data, preprocess_data
+from src.feature_engineering import FeatureEngineer
+
+def score_csv_in_chunks(model, input_path: str, output_path: str, chunksize: int = 100000,
+                        feature_engineer: Optional[FeatureEngineer] = None,
+                        keep_columns: Optional[List[str]] = None,
+                        target_column: str = 'Profit (USD)', cache_dir: Optional[str] = None,
+                        lossy_float32: bool = False) -> Dict:
+    """
+    Score a CSV file chunk by chunk, appending predictions to an output CSV
+
+    Only one chunk is held in memory at a time, so peak memory depends on
+    chunksize rather than on the size of the input file.
+
+    Args:
+        model: Model exposing predict(), e.g. AirlineProfitModel
+        input_path (str): Path to the input CSV
+        output_path (str): Path of the CSV to write predictions to
+        chunksize (int): Number of rows read and scored at a time
+        feature_engineer (FeatureEngineer): Optional feature pipeline applied per chunk;
+            with a FeaturePlan, derived features are buffered within its memory budget
+        keep_columns (list): Input columns copied to the output next to the
+            predictions; None keeps every input column
+        target_column (str): Target column dropped before scoring if present
+        cache_dir (str): Read preprocessed chunks from the processed data cache
+            in this directory, building it on the first run
+        lossy_float32 (bool): Store every float feature as float32, see preprocess_data
+
+    Returns:
+        dict: Rows scored, chunks processed, elapsed seconds and rows/sec
+    """
+    feature_names = getattr(model, 'feature_names', None)
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    rows = 0
+    chunks = 0
+    if cache_dir is not None:
+        # Cached chunks are downcast, so the output copies its columns from the raw CSV
+        raw_rows = _RawRows(input_path, chunksize)
+        batches = ((raw_rows.take(len(processed)), processed)
+                   for processed in load_data(input_path, chunksize=chunksize, cache_dir=cache_dir,
+                                              target_column=target_column, lossy_float32=lossy_float32))
+    else:
+        # preprocess_data converts in place; the output keeps the chunk as read
+        batches = ((chunk, preprocess_data(chunk.copy(), target_column, lossy_float32))
+                   for chunk in _read_raw(input_path, chunksize))
+
+    for chunk, features in batches:
+        # Feature engineering adds columns in place, so pick output columns first
+        output_columns = list(chunk.columns) if keep_columns is None else keep_columns
+        if feature_engineer is not None and feature_engineer.plan is not None:
+            # Derived features go to their own block, spilled to disk over the memory budget
+            with feature_engineer.create_features_buffered(features, track_memory=False) as frame:
+                predictions = model.predict(_model_input(frame, feature_names, target_column))
+        else:
+            if feature_engineer is not None:
+                features = feature_engineer.create_all_features(features)
+            predictions = model.predict(_model_input(features, feature_names, target_column))
+
+        output = chunk[output_columns].assign(Predicted_Profit=predictions)
+        output.to_csv(output_path, mode='a' if chunks else 'w', header=not chunks, index=False)
+
+        rows += len(chunk)
+        chunks += 1
+        elapsed = time.perf_counter() - start
+        print(f"Scored {rows} rows in {chunks} chunks ({rows / elapsed:.0f} rows/sec)")
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'chunks': chunks,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed else 0.0
+    }
+
+def _read_raw(input_path: str, chunksize: int):
+    """CSV chunks parsed so that floats are written back exactly as they were read"""
+    return pd.read_csv(input_path, chunksize=chunksize, float_precision='round_trip')
+
+class _RawRows:
+    """
+    Rows of the raw CSV, read in step with the processed data cache
+
+    Cache parts are split by the chunksize they were built with, so a cached
+    chunk need not line up with a raw chunk; take() returns exactly the next
+    n rows whatever the split.
+    """
+    def __init__(self, input_path: str, chunksize: int):
+        self._chunks = _read_raw(input_path, chunksize)
+        self._pending = None
+
+    def take(self, n: int) -> pd.DataFrame:
+        parts = []
+        while n:
+            if self._pending is None or self._pending.empty:
+                self._pending = next(self._chunks)
+            part = self._pending.iloc[:n]
+            self._pending = self._pending.iloc[len(part):]
+            parts.append(part)
+            n -= len(part)
+        return parts[0] if len(parts) == 1 else pd.concat(parts)
+
+def _model_input(features, feature_names: Optional[List[str]], target_column: str) -> pd.DataFrame:
+    """Columns the model scores, from a DataFrame or a FeatureFrame"""
+    if not feature_names:
+        feature_names = [column for column in features.columns if column != target_column]
+    return features[feature_names]
@@ -1,17 +1,175 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
 
-def load_data(filepath):
-    """Load and preprocess the airline data"""
-    df = pd.read_csv(filepath)
+# Bump when preprocess_data changes, so cached processed data is rebuilt
+PIPELINE_VERSION = 2
+# String columns become categoricals when at most this fraction of values is distinct
+CATEGORY_MAX_RATIO = 0.5
+
+def load_data(filepath, chunksize=None, cache_dir=None, target_column=None, lossy_float32=False):
+    """
+    Load the airline data
+
+    Args:
+        filepath (str): Path to the CSV file
+        chunksize (int): If given, return an iterator of DataFrames with this
+            many rows each instead of reading the whole file
+        cache_dir (str): If given, load preprocessed data from the binary cache
+            in this directory, building it from the CSV on the first call
+            (see src/processed_cache.py)
+        target_column (str): Column left at full precision by preprocessing
+        lossy_float32 (bool): Store every float column as float32, see preprocess_data
+
+    Returns:
+        pd.DataFrame or iterator of pd.DataFrame
+    """
+    if cache_dir is not None:
+        from src.processed_cache import iter_processed, load_processed
+
+        if chunksize is not None:
+            return iter_processed(filepath, cache_dir, chunksize, target_column, lossy_float32)
+        return load_processed(filepath, cache_dir, target_column, lossy_float32)
+
+    df = pd.read_csv(filepath, chunksize=chunksize)
+    return df
+
+def optimize_dtypes(df, exclude=None, lossy_float32=False):
+    """
+    Downcast columns to the smallest dtype that holds their values
+
+    Integers get the smallest integer type, floats become float32 when every
+    value survives the round trip (or always with lossy_float32), and string
+    columns with few distinct values become categoricals. The forest casts
+    its inputs to float32 anyway, so float32 features predict identically.
+
+    Args:
+        df (pd.DataFrame): Data to convert, modified in place
+        exclude (list): Columns left untouched, e.g. the target
+        lossy_float32 (bool): Downcast floats even if values lose precision
+
+    Returns:
+        pd.DataFrame: df with optimized dtypes
+    """
+    exclude = set(exclude or [])
+    for column in df.columns:
+        if column in exclude:
+            continue
+        values = df[column]
+        if pd.api.types.is_bool_dtype(values) or isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(values):
+            df[column] = pd.to_numeric(values, downcast='integer')
+        elif pd.api.types.is_float_dtype(values):
+            if values.dtype == np.float64:
+                downcast = values.astype(np.float32)
+                if lossy_float32 or np.array_equal(downcast.to_numpy(np.float64), values.to_numpy(),
+                                                   equal_nan=True):
+                    df[column] = downcast
+        elif pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+            if len(values) and values.nunique(dropna=True) <= CATEGORY_MAX_RATIO * len(values):
+                df[column] = values.astype('category')
     return df
 
-def preprocess_data(df):
-    """Preprocess the data"""
-    # Add your preprocessing steps here
+def _smallest_integer(low, high):
+    """Smallest signed integer dtype holding every value in [low, high]"""
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+def infer_dtypes(chunks, exclude=None, lossy_float32=False):
+    """
+    Choose one set of optimize_dtypes targets that fits every chunk
+
+    optimize_dtypes looks at a single frame, so chunks of the same file can
+    come out with different dtypes (int8 in one, int16 in the next). This
+    pass applies the same rules to the file as a whole: integers get a type
+    holding the overall range, floats become float32 only if every chunk
+    survives the round trip, and strings become categoricals only if they
+    qualify in every chunk. Columns read as integers in some chunks and as
+    floats in others (missing values) become float64; other mixes become object.
+
+    Args:
+        chunks (iterable of pd.DataFrame): Raw chunks, e.g. pd.read_csv(..., chunksize=n)
+        exclude (list): Columns left untouched, e.g. the target
+        lossy_float32 (bool): Downcast floats even if values lose precision
+
+    Returns:
+        dict: Column -> dtype string, for preprocess_data(dtypes=...)
+    """
+    exclude = set(exclude or [])
+    columns = {}
+    for chunk in chunks:
+        for column in chunk.columns:
+            values = chunk[column]
+            state = columns.setdefault(column, {'kinds': set(), 'low': None, 'high': None,
+                                                'float32': True, 'category': True,
+                                                'dtype': values.dtype})
+            if pd.api.types.is_bool_dtype(values):
+                state['kinds'].add('bool')
+            elif pd.api.types.is_integer_dtype(values):
+                state['kinds'].add('int')
+                if len(values):
+                    low, high = int(values.min()), int(values.max())
+                    state['low'] = low if state['low'] is None else min(state['low'], low)
+                    state['high'] = high if state['high'] is None else max(state['high'], high)
+            elif pd.api.types.is_float_dtype(values):
+                state['kinds'].add('float')
+            elif pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+                state['kinds'].add('string')
+                if len(values) and values.nunique(dropna=True) > CATEGORY_MAX_RATIO * len(values):
+                    state['category'] = False
+            else:
+                state['kinds'].add('other')
+                state['dtype'] = values.dtype
+
+            if state['float32'] and not lossy_float32 and pd.api.types.is_float_dtype(values):
+                as_float = values.to_numpy(np.float64)
+                state['float32'] = np.array_equal(as_float.astype(np.float32).astype(np.float64),
+                                                  as_float, equal_nan=True)
+
+    dtypes = {}
+    for column, state in columns.items():
+        kinds = state['kinds']
+        if len(kinds) > 1:
+            dtypes[column] = 'float64' if kinds == {'int', 'float'} else 'object'
+        elif column in exclude or kinds <= {'bool', 'other'}:
+            dtypes[column] = str(state['dtype'])
+        elif kinds == {'int'}:
+            dtypes[column] = str(_smallest_integer(state['low'] or 0, state['high'] or 0))
+        elif kinds == {'float'}:
+            dtypes[column] = 'float32' if lossy_float32 or state['float32'] else 'float64'
+        else:
+            dtypes[column] = 'category' if state['category'] else 'object'
+    return dtypes
+
+def apply_dtypes(df, dtypes):
+    """Cast the columns of df to the dtypes chosen by infer_dtypes, in place"""
+    for column, dtype in dtypes.items():
+        if column in df.columns and str(df[column].dtype) != dtype:
+            df[column] = df[column].astype(dtype)
     return df
 
+def preprocess_data(df, target_column=None, lossy_float32=False, dtypes=None):
+    """
+    Preprocess the data
+
+    Args:
+        df (pd.DataFrame): Raw data
+        target_column (str): Column kept at full precision
+        lossy_float32 (bool): Store every float feature as float32
+        dtypes (dict): Dtypes from infer_dtypes; chunks of one file preprocessed
+            with the same dtypes come out identical in type
+
+    Returns:
+        pd.DataFrame: Data with compact dtypes
+    """
+    if dtypes is not None:
+        return apply_dtypes(df, dtypes)
+    exclude = [target_column] if target_column is not None else None
+    return optimize_dtypes(df, exclude=exclude, lossy_float32=lossy_float32)
+
 def split_data(df, target_column='Profit'):
     """Split features and target"""
     X = df.drop(target_column, axis=1)
@@ -0,0 +1,153 @@
+# src/feature_buffer.py
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+
+class MemoryBudgetExceeded(MemoryError):
+    """Raised when feature engineering would allocate more than the memory budget"""
+
+class FeatureFrame:
+    def __init__(self, base: pd.DataFrame, block: np.ndarray, feature_names: List[str],
+                 extra: Optional[Dict[str, pd.Series]] = None,
+                 memory_stats: Optional[Dict[str, int]] = None):
+        """
+        Read-only join of an untouched input frame and a derived-feature block
+
+        Derived columns are served as views into the block, so neither the
+        input frame nor the derived features are copied.
+
+        Args:
+            base (pd.DataFrame): Original input frame, never modified
+            block (np.ndarray): (rows x features) array of derived features,
+                in memory or memory-mapped
+            feature_names (list): Column names of the block
+            extra (dict): Additional derived columns that are not numeric
+            memory_stats (dict): Peak bytes allocated per feature engineering stage
+        """
+        self.base = base
+        self.block = block
+        self.feature_names = list(feature_names)
+        self.extra = extra or {}
+        self.memory_stats = memory_stats or {}
+        self._positions = {name: i for i, name in enumerate(self.feature_names)}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.base.columns) + self.feature_names + list(self.extra)
+
+    @property
+    def index(self) -> pd.Index:
+        return self.base.index
+
+    @property
+    def is_spilled(self) -> bool:
+        """Whether the derived features live in a memory-mapped spill file"""
+        return isinstance(self.block, np.memmap)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __enter__(self) -> 'FeatureFrame':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the derived-feature block and remove its spill file
+
+        allocate_block unlinks the spill file as soon as it is mapped, but where
+        that fails (e.g. on Windows) the file is only removed here, once the
+        mapping is dropped. The frame cannot be used after closing.
+        """
+        if self.block is None:
+            return
+        path = self.block.filename if self.is_spilled else None
+        self.block = None
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._positions or column in self.extra or column in self.base.columns
+
+    def __getitem__(self, key: Union[str, List[str]]) -> Union[pd.Series, pd.DataFrame]:
+        """Select one column as a Series view, or several as a new DataFrame"""
+        if isinstance(key, str):
+            if key in self._positions:
+                return pd.Series(self.block[:, self._positions[key]], index=self.base.index,
+                                 name=key, copy=False)
+            if key in self.extra:
+                return self.extra[key]
+            return self.base[key]
+        return pd.DataFrame({column: self[column] for column in key}, index=self.base.index)
+
+    def to_numpy(self, columns: List[str], dtype=np.float64) -> np.ndarray:
+        """
+        Gather numeric columns into one (rows x columns) array, e.g. for predict
+
+        Args:
+            columns (list): Columns to gather, in order
+            dtype: Output dtype
+
+        Returns:
+            np.ndarray: Column-major feature matrix
+        """
+        matrix = np.empty((len(self), len(columns)), dtype=dtype, order='F')
+        for i, column in enumerate(columns):
+            if column in self._positions:
+                matrix[:, i] = self.block[:, self._positions[column]]
+            else:
+                matrix[:, i] = self[column].to_numpy(dtype=dtype)
+        return matrix
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize the input and derived columns as a single DataFrame (copies)"""
+        derived = pd.DataFrame(self.block, columns=self.feature_names, index=self.base.index)
+        return pd.concat([self.base, derived, pd.DataFrame(self.extra)], axis=1)
+
+def allocate_block(n_rows: int, n_features: int, dtype, memory_budget: Optional[int] = None,
+                   scratch_bytes: int = 0, spill_dir: Optional[str] = None) -> np.ndarray:
+    """
+    Allocate the derived-feature block, spilling to disk if it breaks the budget
+
+    Args:
+        n_rows (int): Number of rows
+        n_features (int): Number of derived features
+        dtype: Block dtype
+        memory_budget (int): Maximum bytes to hold in memory, or None for no limit
+        scratch_bytes (int): Bytes of scratch arrays needed alongside the block
+        spill_dir (str): Directory for a memory-mapped block when over budget;
+            without it an over-budget request raises MemoryBudgetExceeded
+
+    Returns:
+        np.ndarray: Column-major block, possibly an np.memmap
+    """
+    dtype = np.dtype(dtype)
+    block_bytes = n_rows * n_features * dtype.itemsize
+
+    if memory_budget is None or block_bytes + scratch_bytes <= memory_budget:
+        return np.empty((n_rows, n_features), dtype=dtype, order='F')
+
+    if spill_dir is None or scratch_bytes > memory_budget:
+        raise MemoryBudgetExceeded(
+            f"Feature engineering needs {block_bytes + scratch_bytes} bytes "
+            f"but the memory budget is {memory_budget} bytes"
+        )
+
+    os.makedirs(spill_dir, exist_ok=True)
+    handle, path = tempfile.mkstemp(suffix='.features', dir=spill_dir)
+    os.close(handle)
+    block = np.memmap(path, dtype=dtype, mode='w+', shape=(n_rows, n_features), order='F')
+    try:
+        # The mapping stays valid after unlinking and the file vanishes with it
+        os.unlink(path)
+    except OSError:
+        pass
+    return block
@@ -1,15 +1,229 @@
 import pandas as pd
 import numpy as np
-from typing import Tuple, List
+from typing import Iterable, Iterator, Optional, Tuple, List
 import logging
-from sklearn.decomposition import PCA
-from sklearn.feature_selection import SelectKBest, f_regression
+from contextlib import nullcontext
+from src.feature_plan import FeaturePlan, compile_feature_plan
+from src.feature_buffer import FeatureFrame, allocate_block
+from src.monitoring import track_peak_memory
+
+# Inclusive hour ranges counted as peak departure times
+PEAK_HOURS = [(6, 9), (17, 19)]
+
+# Half-open [start, end) hour ranges for each period of the day
+DAY_PERIODS = [(5, 12, 'Morning'), (12, 17, 'Afternoon'), (17, 22, 'Evening')]
+
+def bucketize(values: pd.Series, buckets: List[Tuple[float, float, str]],
+              default: str) -> pd.Series:
+    """
+    Label values by half-open [start, end) buckets without per-row Python calls
+
+    Args:
+        values (pd.Series): Values to bucket
+        buckets (list): (start, end, label) tuples, checked in order
+        default (str): Label for values outside every bucket, including NaN
+
+    Returns:
+        pd.Series: Categorical labels with categories in bucket order
+    """
+    array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    conditions = [(array >= start) & (array < end) for start, end, _ in buckets]
+    codes = np.select(conditions, np.arange(len(buckets)), default=len(buckets))
+    categories = [label for _, _, label in buckets] + [default]
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories),
+        index=values.index,
+        name=values.name
+    )
+
+def iter_row_chunks(data, chunksize: int) -> Iterator:
+    """Consecutive row slices of a DataFrame, Series or array, chunksize rows each"""
+    rows = data.iloc if hasattr(data, 'iloc') else data
+    for start in range(0, len(data), chunksize):
+        yield rows[start:start + chunksize]
+
+class StreamingFeatureSelector:
+    def __init__(self, k: int = 10):
+        """
+        Select the k best features by f_regression from running sums
+
+        Keeps the count, means, sums of squared deviations and co-moments
+        of every feature with the target instead of the rows, so X can be
+        fed chunk by chunk in memory proportional to the chunk. Chunks
+        (or accumulators from separate workers) combine with Chan's
+        pairwise update, and the scores, p-values and selection match
+        SelectKBest(f_regression, k) fitted on all rows at once.
+
+        Args:
+            k (int): Number of features to keep
+        """
+        self.k = k
+        self.n = 0
+        self.feature_names_in_ = None
+        self.mean_x = None
+        self.mean_y = 0.0
+        self.m2_x = None
+        self.m2_y = 0.0
+        self.co_moment = None
+
+    def partial_fit(self, X, y) -> 'StreamingFeatureSelector':
+        """
+        Add one chunk of features and target
+
+        Args:
+            X (pd.DataFrame or np.ndarray): Feature chunk
+            y (pd.Series or np.ndarray): Target chunk
+
+        Returns:
+            StreamingFeatureSelector: self, for chaining
+        """
+        chunk = StreamingFeatureSelector(self.k)
+        if isinstance(X, pd.DataFrame):
+            chunk.feature_names_in_ = X.columns.tolist()
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if len(X) != len(y):
+            raise ValueError(f"X has {len(X)} rows but y has {len(y)}")
+        if not len(y):
+            return self
+
+        chunk.n = len(y)
+        chunk.mean_x = X.mean(axis=0)
+        chunk.mean_y = float(y.mean())
+        x_deviations = X - chunk.mean_x
+        y_deviations = y - chunk.mean_y
+        chunk.m2_x = np.einsum('ij,ij->j', x_deviations, x_deviations)
+        chunk.m2_y = float(np.dot(y_deviations, y_deviations))
+        chunk.co_moment = y_deviations @ x_deviations
+        return self.merge(chunk)
+
+    def merge(self, other: 'StreamingFeatureSelector') -> 'StreamingFeatureSelector':
+        """Fold in an accumulator filled on other rows of the same features"""
+        if not other.n:
+            return self
+        if not self.n:
+            for name in ('n', 'feature_names_in_', 'mean_x', 'mean_y', 'm2_x', 'm2_y', 'co_moment'):
+                setattr(self, name, getattr(other, name))
+            return self
+        if len(other.mean_x) != len(self.mean_x) or (
+            self.feature_names_in_ and other.feature_names_in_
+            and other.feature_names_in_ != self.feature_names_in_
+        ):
+            raise ValueError("Chunks must have the same feature columns in the same order")
+
+        n = self.n + other.n
+        weight = self.n * other.n / n
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        self.mean_x = self.mean_x + delta_x * other.n / n
+        self.mean_y += delta_y * other.n / n
+        self.m2_x = self.m2_x + other.m2_x + delta_x * delta_x * weight
+        self.m2_y += other.m2_y + delta_y * delta_y * weight
+        self.co_moment = self.co_moment + other.co_moment + delta_x * delta_y * weight
+        self.n = n
+        return self
+
+    def scores(self) -> Tuple[np.ndarray, np.ndarray]:
+        """F-statistics and p-values of every feature, as sklearn's f_regression"""
+        from scipy import stats
+
+        if self.n < 3:
+            raise ValueError("f_regression needs at least 3 rows")
+        degrees_of_freedom = self.n - 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = self.co_moment / np.sqrt(self.m2_x * self.m2_y)
+            # Constant features or target: no correlation, as f_regression's force_finite
+            correlation[np.isnan(correlation)] = 0.0
+            correlation_squared = np.minimum(correlation ** 2, 1.0)
+            f_statistic = correlation_squared / (1 - correlation_squared) * degrees_of_freedom
+        p_values = stats.f.sf(f_statistic, 1, degrees_of_freedom)
+
+        # Perfect (anti-)correlation
+        perfect = np.isinf(f_statistic)
+        f_statistic[perfect] = np.finfo(f_statistic.dtype).max
+        p_values[perfect] = 0.0
+        return f_statistic, p_values
+
+    @property
+    def scores_(self) -> np.ndarray:
+        return self.scores()[0]
+
+    @property
+    def pvalues_(self) -> np.ndarray:
+        return self.scores()[1]
+
+    def get_support(self) -> np.ndarray:
+        """Boolean mask of the k highest-scoring features, ties broken as SelectKBest"""
+        scores = self.scores_
+        mask = np.zeros(len(scores), dtype=bool)
+        if self.k == 'all':
+            mask[:] = True
+        elif self.k:
+            mask[np.argsort(scores, kind='mergesort')[-self.k:]] = True
+        return mask
+
+    def transform(self, X):
+        """Keep only the selected columns of X"""
+        mask = self.get_support()
+        return X.loc[:, mask] if isinstance(X, pd.DataFrame) else np.asarray(X)[:, mask]
 
 class FeatureEngineer:
-    def __init__(self):
+    def __init__(self, plan: FeaturePlan = None, memory_budget: int = None,
+                 spill_dir: str = None):
+        """
+        Initialize the feature engineer
+
+        Args:
+            plan (FeaturePlan): Optional compiled plan replacing the financial,
+                operational and interaction feature methods
+            memory_budget (int): Bytes allowed for buffered feature engineering
+            spill_dir (str): Directory for memory-mapped buffers over the budget
+        """
         self.feature_list = []
         self.pca = None
         self.feature_selector = None
+        self.plan = plan
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+
+    @classmethod
+    def from_config(cls, config: dict, required: List[str] = None,
+                    dtype=np.float64) -> 'FeatureEngineer':
+        """
+        Build a feature engineer from the derived features in config.yaml
+
+        Args:
+            config (dict): Loaded project configuration
+            required (list): Features the model uses; unused derived features are skipped
+            dtype: Float dtype for derived features
+
+        Returns:
+            FeatureEngineer: Feature engineer running the compiled plan
+        """
+        features = config.get('features', {})
+        budget_mb = features.get('memory_budget_mb')
+        return cls(
+            compile_feature_plan(features.get('derived', {}), required=required, dtype=dtype),
+            memory_budget=int(budget_mb * 1024 ** 2) if budget_mb else None,
+            spill_dir=features.get('spill_dir')
+        )
+
+    def input_columns(self, feature_names: List[str]) -> List[str]:
+        """
+        Raw columns a caller must supply so that every feature in feature_names exists
+
+        Args:
+            feature_names (list): Model features, raw or derived
+
+        Returns:
+            list: Model features the plan does not derive, then the plan's own inputs
+        """
+        derived = set(self.plan.feature_names) if self.plan is not None else set()
+        columns = [name for name in feature_names if name not in derived]
+        if self.plan is not None:
+            columns += [name for name in self.plan.input_columns if name not in columns]
+        return columns
         
     def create_financial_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create financial-related features"""
@@ -36,16 +250,15 @@ class FeatureEngineer:
         
     def create_time_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create time-related features"""
-        df['Peak_Hour'] = df['Scheduled_Departure_Hour'].apply(
-            lambda x: 1 if 6 <= x <= 9 or 17 <= x <= 19 else 0
-        )
+        hour = df['Scheduled_Departure_Hour']
+        hours = hour.to_numpy(dtype=np.float64, na_value=np.nan)
         
-        df['Day_Period'] = df['Scheduled_Departure_Hour'].apply(
-            lambda x: 'Morning' if 5 <= x < 12
-            else 'Afternoon' if 12 <= x < 17
-            else 'Evening' if 17 <= x < 22
-            else 'Night'
-        )
+        is_peak = np.zeros(len(hours), dtype=bool)
+        for start, end in PEAK_HOURS:
+            is_peak |= (hours >= start) & (hours <= end)
+        df['Peak_Hour'] = is_peak.astype(np.int64)
+        
+        df['Day_Period'] = bucketize(hour, DAY_PERIODS, default='Night')
         
         return df
         
@@ -57,38 +270,135 @@ class FeatureEngineer:
         
         return df
         
-    def apply_pca(self, df: pd.DataFrame, n_components: int = 3) -> pd.DataFrame:
-        """Apply PCA for dimensionality reduction"""
+    def apply_pca(self, df: pd.DataFrame, n_components: int = 3,
+                  chunksize: int = None) -> pd.DataFrame:
+        """
+        Apply PCA for dimensionality reduction
+
+        Args:
+            df (pd.DataFrame): Numeric features
+            n_components (int): Principal components to add
+            chunksize (int): Fit an IncrementalPCA on batches of this many rows
+                and project the rows batch by batch, so the fit's working
+                memory is bounded by the batch instead of the frame
+
+        Returns:
+            pd.DataFrame: df with PCA_1 ... PCA_n columns appended
+        """
+        if self.pca is None and chunksize:
+            self.fit_pca_chunks(iter_row_chunks(df, chunksize), n_components)
+
         if self.pca is None:
+            from sklearn.decomposition import PCA
             self.pca = PCA(n_components=n_components)
             pca_features = self.pca.fit_transform(df)
+        elif chunksize and len(df) > chunksize:
+            pca_features = np.empty((len(df), self.pca.n_components_))
+            for start in range(0, len(df), chunksize):
+                pca_features[start:start + chunksize] = self.pca.transform(df.iloc[start:start + chunksize])
         else:
             pca_features = self.pca.transform(df)
             
-        pca_columns = [f'PCA_{i+1}' for i in range(n_components)]
-        df_pca = pd.DataFrame(pca_features, columns=pca_columns)
+        pca_columns = [f'PCA_{i+1}' for i in range(pca_features.shape[1])]
+        df_pca = pd.DataFrame(pca_features, columns=pca_columns, index=df.index)
         
         return pd.concat([df, df_pca], axis=1)
+
+    def fit_pca_chunks(self, chunks: Iterable[pd.DataFrame], n_components: int = 3):
+        """
+        Fit an IncrementalPCA one chunk at a time, without holding all rows
+
+        Chunks can come from pd.read_csv(..., chunksize=...); afterwards
+        apply_pca projects any frame or chunk with the fitted components.
+
+        Args:
+            chunks (iterable): DataFrames with the same numeric columns
+            n_components (int): Principal components to keep
+
+        Returns:
+            IncrementalPCA: The fitted model, also stored as self.pca
+        """
+        from sklearn.decomposition import IncrementalPCA
+
+        pca = IncrementalPCA(n_components=n_components)
+        pending = []
+        for chunk in chunks:
+            pending.append(chunk)
+            # The first batch needs at least n_components rows; later ones can be any size
+            if hasattr(pca, 'components_') or sum(len(part) for part in pending) >= n_components:
+                pca.partial_fit(pending[0] if len(pending) == 1 else pd.concat(pending))
+                pending = []
+        if pending:
+            pca.partial_fit(pd.concat(pending))
+        if not hasattr(pca, 'components_'):
+            raise ValueError("No rows to fit PCA on")
+
+        self.pca = pca
+        return pca
         
-    def select_features(self, X: pd.DataFrame, y: pd.Series, k: int = 10) -> pd.DataFrame:
-        """Select top k features based on correlation with target"""
+    def select_features(self, X: pd.DataFrame, y: pd.Series, k: int = 10,
+                        chunksize: int = None) -> pd.DataFrame:
+        """
+        Select top k features based on correlation with target
+
+        Args:
+            X (pd.DataFrame): Candidate features
+            y (pd.Series): Target
+            k (int): Number of features to keep
+            chunksize (int): Score the features from running sums over batches
+                of this many rows instead of SelectKBest on all of X
+
+        Returns:
+            pd.DataFrame: The selected columns of X
+        """
         if self.feature_selector is None:
-            self.feature_selector = SelectKBest(score_func=f_regression, k=k)
-            X_selected = self.feature_selector.fit_transform(X, y)
-        else:
-            X_selected = self.feature_selector.transform(X)
+            if chunksize:
+                self.fit_selector_chunks(zip(iter_row_chunks(X, chunksize), iter_row_chunks(y, chunksize)), k)
+            else:
+                from sklearn.feature_selection import SelectKBest, f_regression
+                self.feature_selector = SelectKBest(score_func=f_regression, k=k)
+                self.feature_selector.fit(X, y)
             
         selected_features = X.columns[self.feature_selector.get_support()].tolist()
         return X[selected_features]
+
+    def fit_selector_chunks(self, chunks: Iterable[Tuple[pd.DataFrame, pd.Series]],
+                            k: int = 10) -> StreamingFeatureSelector:
+        """
+        Score features with f_regression one (X, y) chunk at a time
+
+        Args:
+            chunks (iterable): (features, target) pairs, e.g.
+                ((c[columns], c[target]) for c in pd.read_csv(path, chunksize=...))
+            k (int): Number of features to keep
+
+        Returns:
+            StreamingFeatureSelector: The fitted selector, also stored as
+                self.feature_selector for select_features
+        """
+        selector = StreamingFeatureSelector(k)
+        for X_chunk, y_chunk in chunks:
+            selector.partial_fit(X_chunk, y_chunk)
+        if not selector.n:
+            raise ValueError("No rows to select features on")
+
+        self.feature_selector = selector
+        return selector
         
     def create_all_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply all feature engineering steps"""
         try:
-            # Create basic features
-            df = self.create_financial_features(df)
-            df = self.create_operational_features(df)
-            df = self.create_time_features(df)
-            df = self.create_interaction_features(df)
+            if self.plan is not None:
+                # One fused pass over the declared features
+                df[self.plan.feature_names] = self.plan.evaluate(df)
+                if 'Scheduled_Departure_Hour' in df.columns:
+                    df = self.create_time_features(df)
+            else:
+                # Create basic features
+                df = self.create_financial_features(df)
+                df = self.create_operational_features(df)
+                df = self.create_time_features(df)
+                df = self.create_interaction_features(df)
             
             # Store created features
             self.feature_list = df.columns.tolist()
@@ -99,8 +409,81 @@ class FeatureEngineer:
             logging.error(f"Error in feature engineering: {e}")
             raise
             
-    def get_feature_importance(self, model, feature_names: List[str]) -> pd.DataFrame:
-        """Get feature importance from model"""
+    def create_features_buffered(self, df: pd.DataFrame, memory_budget: int = None,
+                                 spill_dir: str = None,
+                                 track_memory: bool = True) -> FeatureFrame:
+        """
+        Derive features into a separate preallocated buffer without touching df
+
+        Args:
+            df (pd.DataFrame): Input frame, left unmodified
+            memory_budget (int): Bytes allowed; defaults to the engineer's budget
+            spill_dir (str): Spill directory; defaults to the engineer's spill_dir
+            track_memory (bool): Record peak bytes allocated per stage
+
+        Returns:
+            FeatureFrame: Input and derived columns, joined without copying
+        """
+        if self.plan is None:
+            raise ValueError("Buffered feature engineering needs a FeaturePlan, "
+                             "see FeatureEngineer.from_config")
+
+        memory_budget = memory_budget if memory_budget is not None else self.memory_budget
+        spill_dir = spill_dir or self.spill_dir
+        has_hour = 'Scheduled_Departure_Hour' in df.columns
+        names = self.plan.feature_names + (['Peak_Hour'] if has_hour else [])
+        n_planned = len(self.plan.feature_names)
+
+        stats = {}
+        stage = (lambda name: track_peak_memory(stats, name)) if track_memory else (
+            lambda name: nullcontext()
+        )
+
+        with stage('allocate'):
+            _, scratch_bytes = self.plan.estimate_bytes(len(df))
+            block = allocate_block(len(df), len(names), self.plan.dtype,
+                                   memory_budget, scratch_bytes, spill_dir)
+
+        with stage('derived'):
+            self.plan.evaluate(df, out=block[:, :n_planned])
+
+        extra = {}
+        if has_hour:
+            with stage('time'):
+                hour = df['Scheduled_Departure_Hour']
+                hours = hour.to_numpy(dtype=np.float64, na_value=np.nan)
+                peak = block[:, n_planned]
+                peak[:] = 0
+                for start, end in PEAK_HOURS:
+                    peak[(hours >= start) & (hours <= end)] = 1
+                extra['Day_Period'] = bucketize(hour, DAY_PERIODS, default='Night')
+
+        frame = FeatureFrame(df, block, names, extra, stats)
+        self.feature_list = frame.columns
+        return frame
+        
+    def get_feature_importance(self, model, feature_names: List[str], method: str = 'impurity',
+                               X=None, y=None, config: dict = None) -> pd.DataFrame:
+        """
+        Get feature importance from model
+
+        Args:
+            model: Fitted model
+            feature_names (list): Feature names
+            method (str): 'impurity' reads feature_importances_; 'permutation'
+                measures the R² drop on a holdout set (see src/permutation_importance.py)
+            X: Holdout features, required for 'permutation'
+            y: Holdout target, required for 'permutation'
+            config (dict): Project configuration with evaluation.permutation_importance settings
+
+        Returns:
+            pd.DataFrame: feature and importance columns, most important first
+        """
+        if method == 'permutation':
+            from src.permutation_importance import PermutationImportance
+            if X is None or y is None:
+                raise ValueError("Permutation importance needs holdout X and y")
+            return PermutationImportance(config or {}).run(model, X, y, feature_names)
         if hasattr(model, 'feature_importances_'):
             importance = model.feature_importances_
             return pd.DataFrame({
@@ -108,3 +491,33 @@ class FeatureEngineer:
                 'importance': importance
             }).sort_values('importance', ascending=False)
         return None
+
+def derived_feature_engineer(config: dict, feature_names: Optional[List[str]] = None,
+                             columns: Optional[List[str]] = None) -> Optional[FeatureEngineer]:
+    """
+    Feature engineer for the derived features of config.yaml used by training and scoring
+
+    Args:
+        config (dict): Loaded project configuration
+        feature_names (list): Features of the model the data is for; derived
+            features it does not use are skipped. None derives all of them,
+            for training a new model
+        columns (list): Columns of the training data; derived features whose
+            inputs are not all present are skipped
+
+    Returns:
+        FeatureEngineer: Engineer running the compiled plan, or None when
+            features.derive is off or no derived feature applies
+    """
+    features = config.get('features', {})
+    spec = features.get('derived')
+    if not features.get('derive', True) or not spec:
+        return None
+    if columns is not None:
+        available = set(columns)
+        feature_names = [
+            name for name in (feature_names if feature_names is not None else spec)
+            if name not in spec or set(compile_feature_plan(spec, required=[name]).input_columns) <= available
+        ]
+    engineer = FeatureEngineer.from_config(config, required=feature_names)
+    return engineer if engineer.plan.feature_names else None
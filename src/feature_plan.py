@@ -0,0 +1,170 @@
+# src/feature_plan.py
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple, Union
+
+OPERATORS = {
+    'add': np.add,
+    'sub': np.subtract,
+    'mul': np.multiply,
+    'div': np.divide
+}
+
+class FeaturePlan:
+    def __init__(self, feature_names: List[str], input_columns: List[str],
+                 steps: List[Tuple], outputs: Dict[int, Tuple], n_temps: int,
+                 dtype=np.float64):
+        """
+        Compiled execution plan for arithmetic derived features
+
+        Built by compile_feature_plan; every distinct subexpression appears in
+        steps exactly once.
+
+        Args:
+            feature_names (list): Derived features, in block column order
+            input_columns (list): Raw columns read from the input frame
+            steps (list): (operator, target, left, right) tuples in evaluation order.
+                Slots are ('input', i), ('temp', i), ('feature', i) or ('const', value).
+            outputs (dict): Slot holding each derived feature that is not written
+                by a step directly
+            n_temps (int): Number of scratch arrays needed
+            dtype: Float dtype used for inputs, scratch arrays and the output block
+        """
+        self.feature_names = feature_names
+        self.input_columns = input_columns
+        self.steps = steps
+        self.outputs = outputs
+        self.n_temps = n_temps
+        self.dtype = np.dtype(dtype)
+
+    def estimate_bytes(self, n_rows: int) -> Tuple[int, int]:
+        """
+        Estimate memory needed to evaluate the plan
+
+        Args:
+            n_rows (int): Number of input rows
+
+        Returns:
+            tuple: Bytes for the output block and bytes for scratch arrays
+        """
+        column_bytes = n_rows * self.dtype.itemsize
+        return column_bytes * len(self.feature_names), column_bytes * self.n_temps
+
+    def evaluate(self, df: pd.DataFrame, out: np.ndarray = None) -> np.ndarray:
+        """
+        Evaluate the plan into a preallocated (rows x features) block
+
+        Args:
+            df (pd.DataFrame): Frame holding the raw input columns
+            out (np.ndarray): Optional preallocated block to write into,
+                e.g. a memory-mapped array
+
+        Returns:
+            np.ndarray: Column-major block of derived features
+        """
+        n_rows = len(df)
+        inputs = [df[column].to_numpy(dtype=self.dtype) for column in self.input_columns]
+        temps = [np.empty(n_rows, dtype=self.dtype) for _ in range(self.n_temps)]
+        block = out if out is not None else np.empty(
+            (n_rows, len(self.feature_names)), dtype=self.dtype, order='F'
+        )
+
+        def resolve(slot):
+            kind, value = slot
+            if kind == 'input':
+                return inputs[value]
+            if kind == 'temp':
+                return temps[value]
+            if kind == 'feature':
+                return block[:, value]
+            return self.dtype.type(value)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for operator, target, left, right in self.steps:
+                OPERATORS[operator](resolve(left), resolve(right), out=resolve(target))
+
+        for index, slot in self.outputs.items():
+            block[:, index] = resolve(slot)
+
+        return block
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Evaluate the plan and return the derived features as a DataFrame"""
+        return pd.DataFrame(self.evaluate(df), columns=self.feature_names, index=df.index)
+
+def compile_feature_plan(spec: Dict[str, Union[dict, str, float]],
+                         required: Optional[List[str]] = None,
+                         dtype=np.float64) -> FeaturePlan:
+    """
+    Compile declarative feature definitions into a FeaturePlan
+
+    Each definition is a column name, a number, another derived feature's
+    name, or a single-key mapping such as {'div': [left, right]} whose operands
+    are definitions themselves. Identical subexpressions are computed once.
+
+    Args:
+        spec (dict): Derived feature name -> definition, e.g. config features.derived
+        required (list): Features the model uses; other derived features are skipped.
+            Names that are not derived features are ignored.
+        dtype: Float dtype for evaluation (np.float32 halves memory)
+
+    Returns:
+        FeaturePlan: Compiled plan
+    """
+    feature_names = [name for name in spec if required is None or name in required]
+
+    nodes = {}
+    order = []
+    input_columns = []
+
+    def canonical(definition, resolving=()):
+        """Turn a definition into a hashable expression key"""
+        if isinstance(definition, dict):
+            if len(definition) != 1:
+                raise ValueError(f"Expected a single operator, got {definition}")
+            (operator, operands), = definition.items()
+            if operator not in OPERATORS or len(operands) != 2:
+                raise ValueError(f"Unsupported expression {definition}")
+            key = (operator,) + tuple(canonical(operand, resolving) for operand in operands)
+            if key not in nodes:
+                nodes[key] = len(order)
+                order.append(key)
+            return key
+        if isinstance(definition, str):
+            if definition in spec:
+                if definition in resolving:
+                    raise ValueError(f"Circular feature definition for {definition}")
+                return canonical(spec[definition], resolving + (definition,))
+            if definition not in input_columns:
+                input_columns.append(definition)
+            return ('input', input_columns.index(definition))
+        return ('const', float(definition))
+
+    feature_keys = [canonical(spec[name], (name,)) for name in feature_names]
+
+    # Write each expression straight into the first feature column that needs it
+    slots = {}
+    for index, key in enumerate(feature_keys):
+        if key in nodes and key not in slots:
+            slots[key] = ('feature', index)
+    n_temps = 0
+    for key in order:
+        if key not in slots:
+            slots[key] = ('temp', n_temps)
+            n_temps += 1
+
+    def slot_of(key):
+        return slots.get(key, key)
+
+    steps = [
+        (key[0], slots[key], slot_of(key[1]), slot_of(key[2]))
+        for key in order
+    ]
+    outputs = {
+        index: slot_of(key)
+        for index, key in enumerate(feature_keys)
+        if slot_of(key) != ('feature', index)
+    }
+
+    return FeaturePlan(feature_names, input_columns, steps, outputs, n_temps, dtype)
@@ -0,0 +1,182 @@
+# src/hyperparameter_search.py
+
+import hashlib
+import json
+import logging
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler
+from src.shared_data import fingerprint_arrays, load_shared, shared_arrays
+
+def build_estimator(model_type: str, params: Dict):
+    """
+    Create an unfitted estimator for a model_params block
+
+    Args:
+        model_type (str): 'random_forest' or 'xgboost'
+        params (dict): Estimator parameters
+
+    Returns:
+        Unfitted sklearn-compatible regressor
+    """
+    if model_type == 'random_forest':
+        return RandomForestRegressor(**params)
+    if model_type == 'xgboost':
+        from xgboost import XGBRegressor
+        return XGBRegressor(**params)
+    raise ValueError(f"Unknown model type: {model_type}")
+
+def _fit_fold(model_type: str, params: Dict, paths: Dict[str, str], fold: int) -> float:
+    """Fit one candidate on one fold inside a worker and return its R² score"""
+    data = load_shared(paths)
+    X, y = data['X'], data['y']
+    train_idx, test_idx = data[f'train_{fold}'], data[f'test_{fold}']
+
+    # The pool already uses every core, so each fit stays single-threaded
+    model = build_estimator(model_type, {**params, 'n_jobs': 1})
+    model.fit(X[train_idx], y[train_idx])
+    return float(r2_score(y[test_idx], model.predict(X[test_idx])))
+
+class HyperparameterSearch:
+    def __init__(self, config: Dict, n_jobs: Optional[int] = None,
+                 cache_dir: Optional[str] = None, shared_dir: Optional[str] = None):
+        """
+        Cross-validated grid/random search over the model_params in config.yaml
+
+        Args:
+            config (dict): Loaded project configuration
+            n_jobs (int): Worker processes; defaults to training.search.n_jobs or all cores
+            cache_dir (str): Directory of cached fold scores
+            shared_dir (str): Directory for the memory-mapped training data, removed after each run
+        """
+        training = config.get('training', {})
+        search = training.get('search', {})
+
+        self.model_params = config.get('model_params', {})
+        self.param_grid = search.get('param_grid', {})
+        self.method = search.get('method', 'grid')
+        self.n_iter = search.get('n_iter', 10)
+        self.cv_folds = training.get('cv_folds', 5)
+        self.random_state = search.get('random_state', 42)
+
+        n_jobs = n_jobs or search.get('n_jobs')
+        self.n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        self.cache_dir = cache_dir or search.get('cache_dir', 'models/model_metrics/search_cache')
+        self.shared_dir = shared_dir or search.get('shared_dir', 'data/processed/shared')
+
+    def candidates(self, model_type: str) -> List[Dict]:
+        """Parameter sets to evaluate: the model_params block updated by each grid point"""
+        base = self.model_params.get(model_type, {})
+        grid = self.param_grid.get(model_type, {})
+        if not grid:
+            return [dict(base)]
+
+        if self.method == 'random':
+            overrides = ParameterSampler(grid, n_iter=self.n_iter, random_state=self.random_state)
+        else:
+            overrides = ParameterGrid(grid)
+        return [{**base, **override} for override in overrides]
+
+    def run(self, X, y, model_types: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Evaluate every candidate on every fold, reusing cached fold scores
+
+        Args:
+            X (pd.DataFrame or np.ndarray): Features
+            y (pd.Series or np.ndarray): Target
+            model_types (list): model_params blocks to search; defaults to all of them
+
+        Returns:
+            list: One result per candidate, best mean R² first
+        """
+        X = X.to_numpy(dtype=np.float64) if isinstance(X, pd.DataFrame) else np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        fingerprint = fingerprint_arrays(X, y)
+
+        results = []
+        jobs = []
+        for model_type in model_types or list(self.model_params):
+            if not self._is_available(model_type):
+                continue
+            for params in self.candidates(model_type):
+                result = {
+                    'model': model_type,
+                    'params': params,
+                    'fold_scores': [None] * self.cv_folds,
+                    'cached_folds': 0
+                }
+                for fold in range(self.cv_folds):
+                    cache_path = self._cache_path(fingerprint, model_type, params, fold)
+                    if os.path.exists(cache_path):
+                        with open(cache_path) as f:
+                            result['fold_scores'][fold] = json.load(f)['score']
+                        result['cached_folds'] += 1
+                    else:
+                        jobs.append((result, fold, cache_path))
+                results.append(result)
+
+        if jobs:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            folds = KFold(self.cv_folds, shuffle=True, random_state=self.random_state).split(X)
+            arrays = {'X': X, 'y': y}
+            for fold, (train_idx, test_idx) in enumerate(folds):
+                arrays[f'train_{fold}'] = train_idx
+                arrays[f'test_{fold}'] = test_idx
+
+            # Workers memory-map one copy of the data; it is deleted once the pool is done
+            with shared_arrays(arrays, self.shared_dir, f'{fingerprint[:16]}_cv{self.cv_folds}') as paths, \
+                    ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                futures = {
+                    executor.submit(_fit_fold, result['model'], result['params'], paths, fold):
+                        (result, fold, cache_path)
+                    for result, fold, cache_path in jobs
+                }
+                for future in as_completed(futures):
+                    result, fold, cache_path = futures[future]
+                    result['fold_scores'][fold] = future.result()
+                    self._write_cache(cache_path, fingerprint, result, fold)
+
+        for result in results:
+            scores = np.array(result['fold_scores'])
+            result['mean_score'] = float(scores.mean())
+            result['std_score'] = float(scores.std())
+
+        return sorted(results, key=lambda result: result['mean_score'], reverse=True)
+
+    def _is_available(self, model_type: str) -> bool:
+        """Skip model types whose optional dependency is not installed"""
+        if model_type != 'xgboost':
+            return True
+        try:
+            import xgboost  # noqa: F401
+            return True
+        except ImportError:
+            logging.warning("xgboost is not installed; skipping xgboost candidates")
+            return False
+
+    def _cache_path(self, fingerprint: str, model_type: str, params: Dict, fold: int) -> str:
+        """Cache file for one (data, split, candidate, fold) combination"""
+        key = json.dumps(
+            [fingerprint, self.cv_folds, self.random_state, model_type, params, fold],
+            sort_keys=True, default=str
+        )
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _write_cache(self, cache_path: str, fingerprint: str, result: Dict, fold: int) -> None:
+        """Store a fold score atomically"""
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'fingerprint': fingerprint,
+                'model': result['model'],
+                'params': result['params'],
+                'fold': fold,
+                'score': result['fold_scores'][fold]
+            }, f, default=str)
+        os.replace(tmp_path, cache_path)
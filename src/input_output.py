@@ -2,40 +2,100 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Union, List
+from typing import Dict, Union, List, Mapping
 import json
+from src.prediction_cache import PredictionCache
+
+def load_columnar_input(filepath: str) -> Dict[str, np.ndarray]:
+    """
+    Load a columnar batch from NumPy files
+
+    Args:
+        filepath (str): .npz archive with one array per column, or .npy
+            structured array with one field per column
+
+    Returns:
+        dict: Column name -> 1-D array
+    """
+    if filepath.endswith('.npy'):
+        array = np.load(filepath, allow_pickle=False)
+        if array.dtype.names is None:
+            raise ValueError(".npy input must be a structured array with named fields")
+        return {name: array[name] for name in array.dtype.names}
+
+    with np.load(filepath, allow_pickle=False) as archive:
+        return {name: archive[name] for name in archive.files}
 
 class AirlineProfitIO:
-    def __init__(self, model):
+    def __init__(self, model, cache: PredictionCache = None, schema: Dict = None,
+                 feature_engineer=None):
         """
         Initialize with trained model
         Args:
             model: Trained machine learning model
+            cache (PredictionCache): Optional prediction cache, keyed on the
+                model's version attribute
+            schema (dict): Feature schema with 'numerical' and 'categorical'
+                column lists, normally config.yaml features
+            feature_engineer (FeatureEngineer): Derives the model's engineered
+                features from raw inputs before predicting, see
+                derived_feature_engineer in src/feature_engineering.py
         """
         self.model = model
+        self.cache = cache
+        self.schema = schema or {}
+        self.feature_engineer = feature_engineer
+
+    @property
+    def input_columns(self) -> List[str]:
+        """Raw columns the model needs from callers, derived features excluded"""
+        feature_names = getattr(self.model, 'feature_names', None) or []
+        if self.feature_engineer is None:
+            return list(feature_names)
+        return self.feature_engineer.input_columns(feature_names)
+
+    def _predict_frame(self, input_df: pd.DataFrame) -> np.ndarray:
+        """Derive engineered features if configured, then predict in model column order"""
+        if self.feature_engineer is not None:
+            input_df = self.feature_engineer.create_all_features(input_df)
+            feature_names = getattr(self.model, 'feature_names', None)
+            if feature_names:
+                input_df = input_df[feature_names]
+        return self.model.predict(input_df)
 
-    def process_single_input(self, input_data: Dict) -> Dict:
+    @property
+    def model_version(self):
+        return getattr(self.model, 'version', None)
+
+    def process_single_input(self, input_data: Dict, include_input: bool = True) -> Dict:
         """
         Process single prediction input
         
         Args:
             input_data (dict): Dictionary containing input features
+            include_input (bool): Echo input_data back in the response
             
         Returns:
             dict: Prediction results
         """
         try:
+            if self.cache is not None:
+                key = PredictionCache.make_key(input_data)
+                prediction = self.cache.get(key, self.model_version)
+                if prediction is not None:
+                    return self._response({'predicted_profit': prediction},
+                                          input_data, include_input)
+
             # Convert input to DataFrame
             input_df = pd.DataFrame([input_data])
             
             # Make prediction
-            prediction = self.model.predict(input_df)[0]
+            prediction = self._predict_frame(input_df)[0]
+            if self.cache is not None:
+                self.cache.put(key, self.model_version, float(prediction))
             
-            return {
-                'status': 'success',
-                'predicted_profit': float(prediction),
-                'input_data': input_data
-            }
+            return self._response({'predicted_profit': float(prediction)},
+                                  input_data, include_input)
         
         except Exception as e:
             return {
@@ -43,31 +103,132 @@ class AirlineProfitIO:
                 'message': str(e)
             }
 
-    def process_batch_input(self, input_data: List[Dict]) -> Dict:
+    def process_batch_input(self, input_data: List[Dict], include_input: bool = True) -> Dict:
         """
         Process batch predictions
         
         Args:
             input_data (list): List of dictionaries containing input features
+            include_input (bool): Echo input_data back in the response
             
         Returns:
             dict: Batch prediction results
         """
         try:
-            # Convert input to DataFrame
-            input_df = pd.DataFrame(input_data)
-            
-            # Make predictions
-            predictions = self.model.predict(input_df)
+            if self.cache is not None:
+                predictions = self._predict_with_cache(input_data)
+            else:
+                # Convert input to DataFrame
+                input_df = pd.DataFrame(input_data)
+                
+                # Make predictions
+                predictions = self._predict_frame(input_df)
             
+            return self._response({'predictions': predictions.tolist()},
+                                  input_data, include_input)
+        
+        except Exception as e:
             return {
+                'status': 'error',
+                'message': str(e)
+            }
+
+    def validate_columns(self, columns: Mapping[str, np.ndarray]) -> int:
+        """
+        Check a columnar batch against the columns the model needs once, not per row
+
+        Only the model's input_columns are required; schema columns the model
+        does not use may be left out. The full schema applies only when the
+        model does not record its feature names.
+
+        Args:
+            columns (dict): Column name -> 1-D array
+
+        Returns:
+            int: Number of rows
+
+        Raises:
+            ValueError: If required columns are missing, mistyped or of unequal length
+        """
+        required = self.input_columns or (
+            list(self.schema.get('numerical', [])) + list(self.schema.get('categorical', []))
+        )
+        numerical = set(self.schema.get('numerical', []))
+
+        errors = [f"missing column '{name}'" for name in required if name not in columns]
+        for name in required:
+            if name in numerical and name in columns and \
+                    not np.issubdtype(np.asarray(columns[name]).dtype, np.number):
+                errors.append(f"column '{name}' must be numeric, got {np.asarray(columns[name]).dtype}")
+
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            errors.append(f"columns have different lengths: {sorted(lengths)}")
+        if errors:
+            raise ValueError("Invalid batch input: " + "; ".join(errors))
+
+        return lengths.pop() if lengths else 0
+
+    def process_columnar_input(self, columns: Mapping[str, np.ndarray],
+                               include_input: bool = False) -> Dict:
+        """
+        Process a columnar batch without building per-row dicts
+
+        Args:
+            columns (dict): Column name -> 1-D array, e.g. from load_columnar_input
+            include_input (bool): Echo the input columns back as lists
+
+        Returns:
+            dict: Batch prediction results
+        """
+        try:
+            n_rows = self.validate_columns(columns)
+            feature_names = self.input_columns or list(columns)
+            input_df = pd.DataFrame({name: columns[name] for name in feature_names}, copy=False)
+            predictions = self._predict_frame(input_df)
+
+            result = {
                 'status': 'success',
-                'predictions': predictions.tolist(),
-                'input_data': input_data
+                'n_rows': n_rows,
+                'predictions': predictions.tolist()
             }
-        
+            if include_input:
+                result['input_data'] = {name: np.asarray(column).tolist()
+                                        for name, column in columns.items()}
+            return result
+
         except Exception as e:
             return {
                 'status': 'error',
                 'message': str(e)
             }
+
+    @staticmethod
+    def _response(result: Dict, input_data, include_input: bool) -> Dict:
+        """Build a success response, echoing the input only when asked to"""
+        response = {'status': 'success', **result}
+        if include_input:
+            response['input_data'] = input_data
+        return response
+
+    def _predict_with_cache(self, input_data: List[Dict]) -> np.ndarray:
+        """Predict a batch, scoring only the rows missing from the cache"""
+        version = self.model_version
+        keys = [PredictionCache.make_key(record) for record in input_data]
+        predictions = np.empty(len(input_data), dtype=np.float64)
+
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key, version)
+            if cached is None:
+                missing.append(i)
+            else:
+                predictions[i] = cached
+
+        if missing:
+            input_df = pd.DataFrame([input_data[i] for i in missing])
+            predictions[missing] = self._predict_frame(input_df)
+            for i in missing:
+                self.cache.put(keys[i], version, float(predictions[i]))
+
+        return predictions
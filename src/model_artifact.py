@@ -0,0 +1,201 @@
+# src/model_artifact.py
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+from src.tree_inference import CompiledForest, NODE_DTYPE
+
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+NODES_FILE = 'nodes.npy'
+
+def file_sha256(filepath: str, block_size: int = 1 << 20) -> str:
+    """Hash a file's bytes without deserializing it"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _content_hash(trees: List[Dict], feature_names: Optional[List[str]]) -> str:
+    """Combine per-tree hashes and the feature schema into one artifact hash"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(feature_names).encode('utf-8'))
+    for tree in trees:
+        digest.update(tree['sha256'].encode('utf-8'))
+    return digest.hexdigest()
+
+def save_artifact(forest: CompiledForest, directory: str, source_path: Optional[str] = None,
+                  metadata: Optional[Dict] = None) -> Dict:
+    """
+    Write a compiled forest as a manifest plus a raw node array
+
+    All trees share one contiguous node file so the whole forest can be
+    memory-mapped at once; the manifest records the file, each tree's node
+    range and hash. Re-exporting into a directory that is being served is
+    safe: processes that mapped the old forest keep reading it.
+
+    Args:
+        forest (CompiledForest): Forest to store
+        directory (str): Artifact directory, created if needed
+        source_path (str): joblib model the forest was exported from, recorded
+            so a retrained model makes this artifact stale
+        metadata (dict): Extra JSON-serializable details, e.g. model version
+
+    Returns:
+        dict: The written manifest
+    """
+    os.makedirs(directory, exist_ok=True)
+    nodes = np.ascontiguousarray(forest.nodes)
+
+    ends = np.append(forest.roots[1:], len(nodes))
+    trees = [
+        {
+            'offset': int(start),
+            'n_nodes': int(end - start),
+            'sha256': hashlib.sha256(nodes[start:end].tobytes()).hexdigest()
+        }
+        for start, end in zip(forest.roots, ends)
+    ]
+    content_hash = _content_hash(trees, forest.feature_names)
+
+    # Serving processes may have the current node file memory-mapped, and
+    # truncating a mapped file kills them with SIGBUS. Each forest therefore
+    # gets its own content-addressed file, renamed into place complete.
+    nodes_file = f'nodes-{content_hash[:16]}.npy'
+    nodes_path = os.path.join(directory, nodes_file)
+    if not os.path.exists(nodes_path):
+        tmp_path = f'{nodes_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, nodes)
+        os.replace(tmp_path, nodes_path)
+
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    previous = _nodes_file(read_manifest(directory)) if os.path.exists(manifest_path) else None
+
+    manifest = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'node_dtype': NODE_DTYPE.descr,
+        'nodes_file': nodes_file,
+        'n_trees': forest.n_trees,
+        'max_depth': forest.max_depth,
+        'feature_names': forest.feature_names,
+        'trees': trees,
+        'content_hash': content_hash,
+        'metadata': metadata or {}
+    }
+    if source_path:
+        stat = os.stat(source_path)
+        manifest['source'] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_sha256(source_path)
+        }
+
+    # Written last and atomically: the manifest is the pointer to the node file,
+    # so readers see either the old forest or the new one, never a mix
+    tmp_path = f'{manifest_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp_path, manifest_path)
+
+    _prune_nodes(directory, keep={nodes_file, previous})
+    return manifest
+
+def _nodes_file(manifest: Dict) -> str:
+    """Node file a manifest points at; artifacts written before versioned files use nodes.npy"""
+    return manifest.get('nodes_file', NODES_FILE)
+
+def _prune_nodes(directory: str, keep) -> None:
+    """
+    Remove node files no manifest points at any more
+
+    The previous file is kept for readers that opened the old manifest just
+    before it was replaced. Unlinking a mapped file is safe on POSIX; where it
+    fails (e.g. Windows) the file is left for a later export to remove.
+    """
+    for name in os.listdir(directory):
+        is_nodes = name == NODES_FILE or (name.startswith('nodes-') and name.endswith('.npy'))
+        if is_nodes and name not in keep:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+def read_manifest(directory: str) -> Dict:
+    """Read an artifact's manifest"""
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+def is_stale(directory: str, source_path: Optional[str] = None,
+             feature_names: Optional[List[str]] = None) -> bool:
+    """
+    Check an artifact against its source model and expected schema from the manifest alone
+
+    Args:
+        directory (str): Artifact directory
+        source_path (str): joblib model the artifact should have been exported from
+        feature_names (list): Feature columns the caller will provide
+
+    Returns:
+        bool: True if the artifact is missing, from another format version,
+            built for other features, or exported from a different model file
+            or from a source_path that no longer exists
+    """
+    if not os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+        return True
+
+    manifest = read_manifest(directory)
+    if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        return True
+    if feature_names is not None and manifest['feature_names'] != list(feature_names):
+        return True
+
+    source = manifest.get('source')
+    if source_path and source:
+        if not os.path.exists(source_path):
+            # Nothing to compare against, so the artifact cannot be vouched for
+            return True
+        stat = os.stat(source_path)
+        if stat.st_size != source['size']:
+            return True
+        # Copies change mtime without changing content, so confirm with the hash
+        if stat.st_mtime_ns != source['mtime_ns']:
+            return file_sha256(source_path) != source['sha256']
+    return False
+
+def verify_artifact(directory: str) -> bool:
+    """Recompute every tree hash and compare it with the manifest"""
+    manifest = read_manifest(directory)
+    nodes = np.load(os.path.join(directory, _nodes_file(manifest)), mmap_mode='r')
+    for tree in manifest['trees']:
+        segment = nodes[tree['offset']:tree['offset'] + tree['n_nodes']]
+        if hashlib.sha256(segment.tobytes()).hexdigest() != tree['sha256']:
+            return False
+    return _content_hash(manifest['trees'], manifest['feature_names']) == manifest['content_hash']
+
+def load_artifact(directory: str, mmap: bool = True) -> CompiledForest:
+    """
+    Load a compiled forest from an artifact directory
+
+    With mmap the node array is mapped read-only instead of read, so loading
+    takes near-constant time and serving processes share the same pages.
+
+    Args:
+        directory (str): Artifact directory
+        mmap (bool): Memory-map the node array instead of reading it
+
+    Returns:
+        CompiledForest: Forest ready for prediction
+    """
+    manifest = read_manifest(directory)
+    if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format version {manifest.get('format_version')}")
+
+    nodes = np.load(os.path.join(directory, _nodes_file(manifest)), mmap_mode='r' if mmap else None)
+    roots = np.array([tree['offset'] for tree in manifest['trees']], dtype=np.int64)
+    return CompiledForest(nodes, roots, manifest['max_depth'], manifest['feature_names'])
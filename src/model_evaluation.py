@@ -1,127 +1,502 @@
+import os
 import pandas as pd
 import numpy as np
-from sklearn.metrics import (
-    mean_squared_error,
-    r2_score,
-    mean_absolute_error,
-    mean_absolute_percentage_error
-)
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Dict, Any
+import json
+from typing import Dict, Any, Iterable, Tuple
 import logging
 
+# Above this many points 'auto' plots switch from scatter to 2D density bins
+SCATTER_MAX_POINTS = 50000
+DENSITY_BINS = 200
+PLOT_MODES = ('auto', 'scatter', 'density', 'sample')
+
+def resolve_plot_mode(mode: str, n_points: int, max_points: int = SCATTER_MAX_POINTS) -> str:
+    """Plot mode to use for n_points; 'auto' scatters small sets and bins large ones"""
+    if mode not in PLOT_MODES:
+        raise ValueError(f"Unknown plot mode '{mode}', expected one of {', '.join(PLOT_MODES)}")
+    if mode == 'auto':
+        return 'scatter' if n_points <= max_points else 'density'
+    if mode == 'sample' and n_points <= max_points:
+        return 'scatter'
+    return mode
+
+def stratified_sample(y_true: np.ndarray, y_pred: np.ndarray, max_points: int,
+                      n_strata: int = 20, outlier_fraction: float = 0.05,
+                      random_state: int = 42) -> np.ndarray:
+    """
+    Indices of at most max_points rows that cover the whole range of y_true
+
+    The rows with the largest absolute errors (outlier_fraction of the
+    budget) are always kept. The rest of the budget is split evenly over
+    n_strata equal-width bins of y_true, so sparse tails are drawn as well
+    as the dense middle; bins with fewer rows than their share pass the
+    remainder on to the others. Rows are drawn independently with their
+    stratum's rate, so the cost is linear in the number of rows.
+
+    Args:
+        y_true (np.ndarray): Actual values
+        y_pred (np.ndarray): Predicted values
+        max_points (int): Most rows returned
+        n_strata (int): Bins of y_true sampled separately
+        outlier_fraction (float): Share of the budget reserved for the largest errors
+        random_state (int): Seed of the sample
+
+    Returns:
+        np.ndarray: Sorted row indices
+    """
+    n = len(y_true)
+    if n <= max_points:
+        return np.arange(n)
+
+    errors = np.abs(y_true - y_pred)
+    n_outliers = int(max_points * outlier_fraction)
+    keep = np.zeros(n, dtype=bool)
+    if n_outliers:
+        keep[np.argpartition(errors, n - n_outliers)[n - n_outliers:]] = True
+
+    candidates = np.flatnonzero(~keep)
+    edges = np.linspace(y_true.min(), y_true.max(), n_strata + 1)
+    strata = np.clip(np.searchsorted(edges, y_true[candidates], side='right') - 1, 0, n_strata - 1)
+    counts = np.bincount(strata, minlength=n_strata)
+
+    # Fill the smallest strata first, then share what is left among the rest
+    allocation = np.zeros(n_strata, dtype=np.int64)
+    budget = max_points - n_outliers
+    order = np.argsort(counts)
+    for position, stratum in enumerate(order):
+        share = budget // (n_strata - position)
+        allocation[stratum] = min(counts[stratum], share)
+        budget -= allocation[stratum]
+
+    # Keep each row of stratum s with probability allocation[s] / counts[s], then trim to the budget
+    rng = np.random.default_rng(random_state)
+    rates = allocation / np.maximum(counts, 1)
+    chosen = np.flatnonzero(rng.random(len(candidates)) < rates[strata])
+    if len(chosen) > max_points - n_outliers:
+        chosen = rng.choice(chosen, max_points - n_outliers, replace=False)
+    keep[candidates[chosen]] = True
+    return np.flatnonzero(keep)
+
+def _uniform_bins(values: np.ndarray, bins: int):
+    low, high = float(values.min()), float(values.max())
+    span = high - low if high > low else 1.0
+    index = np.minimum(((values - low) * (bins / span)).astype(np.intp), bins - 1)
+    return index, np.linspace(low, low + span, bins + 1)
+
+def histogram2d_uniform(x: np.ndarray, y: np.ndarray, bins: int = DENSITY_BINS):
+    """
+    2D histogram over equal-width bins spanning the data, like np.histogram2d
+
+    Bin indices are computed arithmetically and counted with one bincount
+    instead of binary-searching the edges, which is several times faster on
+    millions of points. Non-finite pairs are skipped.
+
+    Returns:
+        tuple: (counts of shape (bins, bins), x edges, y edges)
+    """
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    x_index, x_edges = _uniform_bins(x, bins)
+    y_index, y_edges = _uniform_bins(y, bins)
+    counts = np.bincount(x_index * bins + y_index, minlength=bins * bins).reshape(bins, bins)
+    return counts, x_edges, y_edges
+
+def _figure(figsize):
+    """Figure drawn by the Agg canvas without pyplot, safe to render in any thread"""
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize)
+
+def _draw_points(fig, ax, x: np.ndarray, y: np.ndarray, mode: str, bins: int) -> None:
+    """Scatter points, or bin them into a log-scaled 2D histogram in 'density' mode"""
+    if mode == 'density':
+        from matplotlib.colors import LogNorm
+        counts, x_edges, y_edges = histogram2d_uniform(x, y, bins)
+        mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0),
+                             norm=LogNorm(), cmap='viridis')
+        fig.colorbar(mesh, ax=ax, label='Points per bin')
+    else:
+        ax.scatter(x, y, alpha=0.5, s=None if mode == 'scatter' else 8)
+
+class _Moments:
+    def __init__(self):
+        """Count, mean, sum of squared deviations, min and max of a stream"""
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def update(self, values: np.ndarray) -> None:
+        chunk = _Moments()
+        chunk.n = len(values)
+        chunk.mean = float(values.mean())
+        deviations = values - chunk.mean
+        chunk.m2 = float(np.dot(deviations, deviations))
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        self.merge(chunk)
+
+    def merge(self, other: '_Moments') -> None:
+        if not other.n:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def summary(self, name: str) -> Dict[str, float]:
+        # Population standard deviation, as np.std
+        return {
+            f'mean_{name}': self.mean,
+            f'std_{name}': float(np.sqrt(self.m2 / self.n)) if self.n else float('nan'),
+            f'min_{name}': self.min,
+            f'max_{name}': self.max
+        }
+
+class StreamingMetrics:
+    def __init__(self):
+        """
+        Regression metrics accumulated chunk by chunk
+
+        Keeps counts, sums and running means/variances instead of the arrays,
+        so memory does not grow with the number of rows. Accumulators filled
+        on separate chunks (or in separate workers) combine with merge();
+        means and variances use Chan's pairwise update, so the result does
+        not depend on how the rows were split.
+        """
+        self.n = 0
+        self.sse = 0.0
+        self.sae = 0.0
+        self.sape = 0.0
+        self.true_stats = _Moments()
+        self.pred_stats = _Moments()
+
+    def update(self, y_true, y_pred) -> 'StreamingMetrics':
+        """
+        Add one chunk of targets and predictions
+
+        Args:
+            y_true (array-like): Actual values
+            y_pred (array-like): Predicted values
+
+        Returns:
+            StreamingMetrics: self, for chaining
+        """
+        y_true = np.asarray(y_true, dtype=np.float64).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+        if len(y_true) != len(y_pred):
+            raise ValueError(f"y_true has {len(y_true)} rows but y_pred has {len(y_pred)}")
+        if not len(y_true):
+            return self
+
+        errors = np.abs(y_true - y_pred)
+        self.n += len(y_true)
+        self.sse += float(np.dot(errors, errors))
+        self.sae += float(errors.sum())
+        # Same guard against division by zero as sklearn's mean_absolute_percentage_error
+        self.sape += float((errors / np.maximum(np.abs(y_true), np.finfo(np.float64).eps)).sum())
+        self.true_stats.update(y_true)
+        self.pred_stats.update(y_pred)
+        return self
+
+    def merge(self, other: 'StreamingMetrics') -> 'StreamingMetrics':
+        """Fold another accumulator's rows into this one"""
+        self.n += other.n
+        self.sse += other.sse
+        self.sae += other.sae
+        self.sape += other.sape
+        self.true_stats.merge(other.true_stats)
+        self.pred_stats.merge(other.pred_stats)
+        return self
+
+    def result(self) -> Dict[str, float]:
+        """R2, RMSE, MAE and MAPE (in percent), as returned by ModelEvaluator.calculate_metrics"""
+        if not self.n:
+            raise ValueError("No rows have been added")
+        return {
+            'r2_score': self._r2(),
+            'rmse': float(np.sqrt(self.sse / self.n)),
+            'mae': self.sae / self.n,
+            'mape': self.sape / self.n * 100
+        }
+
+    def _r2(self) -> float:
+        if self.n < 2:
+            return float('nan')
+        total = self.true_stats.m2
+        if total == 0:
+            # Constant target: sklearn scores a perfect fit 1 and anything else 0
+            return 1.0 if self.sse == 0 else 0.0
+        return 1 - self.sse / total
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean, standard deviation, min and max of predictions and actual values"""
+        return {
+            'prediction_summary': self.pred_stats.summary('prediction'),
+            'actual_summary': self.true_stats.summary('actual')
+        }
+
 class ModelEvaluator:
     def __init__(self):
         self.metrics = {}
         self.predictions = None
         self.actual_values = None
+        self.accumulator = None
+        self._sample = None
         
     def calculate_metrics(self, y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
         """Calculate various performance metrics"""
         try:
-            metrics = {
-                'r2_score': r2_score(y_true, y_pred),
-                'rmse': np.sqrt(mean_squared_error(y_true, y_pred)),
-                'mae': mean_absolute_error(y_true, y_pred),
-                'mape': mean_absolute_percentage_error(y_true, y_pred) * 100
-            }
+            self.accumulator = StreamingMetrics().update(y_true, y_pred)
+            metrics = self.accumulator.result()
             
             self.metrics = metrics
             self.predictions = y_pred
             self.actual_values = y_true
+            self._sample = None
             
             return metrics
             
         except Exception as e:
             logging.error(f"Error calculating metrics: {e}")
             raise
+
+    def calculate_metrics_streaming(self, chunks: Iterable[Tuple[np.ndarray, np.ndarray]]) -> Dict[str, float]:
+        """
+        Calculate metrics from (y_true, y_pred) chunks without keeping the arrays
+
+        Plots need the arrays and are unavailable afterwards;
+        generate_evaluation_report works from the accumulated summary.
+
+        Args:
+            chunks (iterable): (y_true, y_pred) pairs
+
+        Returns:
+            dict: Performance metrics
+        """
+        try:
+            accumulator = StreamingMetrics()
+            for y_true, y_pred in chunks:
+                accumulator.update(y_true, y_pred)
+            return self.finalize(accumulator)
+
+        except Exception as e:
+            logging.error(f"Error calculating metrics: {e}")
+            raise
+
+    def finalize(self, accumulator: StreamingMetrics) -> Dict[str, float]:
+        """
+        Take the metrics of an accumulator filled elsewhere
+
+        Use for accumulators from evaluate_chunks or merged from parallel
+        workers; generate_evaluation_report then reports on its rows.
+
+        Args:
+            accumulator (StreamingMetrics): Filled accumulator
+
+        Returns:
+            dict: Performance metrics
+        """
+        self.accumulator = accumulator
+        self.metrics = accumulator.result()
+        self.predictions = None
+        self.actual_values = None
+        self._sample = None
+        return self.metrics
             
-    def plot_actual_vs_predicted(self, save_path: str = None) -> None:
-        """Plot actual vs predicted values"""
+    def _plot_data(self, mode: str, max_points: int):
+        """Actual values, predictions and residuals to draw, plus the resolved plot mode"""
+        if self.predictions is None or self.actual_values is None:
+            raise ValueError("Plots need the arrays passed to calculate_metrics")
+        actual = np.asarray(self.actual_values, dtype=np.float64)
+        predicted = np.asarray(self.predictions, dtype=np.float64)
+        mode = resolve_plot_mode(mode, len(actual), max_points)
+        if mode == 'sample':
+            # Both plots draw the same rows; sample once per set of arrays
+            if self._sample is None or self._sample[0] != max_points:
+                self._sample = (max_points, stratified_sample(actual, predicted, max_points))
+            indices = self._sample[1]
+            actual, predicted = actual[indices], predicted[indices]
+        return actual, predicted, actual - predicted, mode
+
+    def plot_actual_vs_predicted(self, save_path: str = None, mode: str = 'auto',
+                                 max_points: int = SCATTER_MAX_POINTS,
+                                 bins: int = DENSITY_BINS) -> None:
+        """
+        Plot actual vs predicted values
+
+        Args:
+            save_path (str): Image file to write
+            mode (str): 'scatter' draws every point, 'density' bins them into a
+                2D histogram, 'sample' draws a stratified sample that keeps the
+                largest errors; 'auto' scatters up to max_points, else bins
+            max_points (int): Points drawn by 'sample' and the 'auto' threshold
+            bins (int): Bins per axis in 'density' mode
+        """
         try:
-            plt.figure(figsize=(10, 6))
-            plt.scatter(self.actual_values, self.predictions, alpha=0.5)
-            plt.plot([self.actual_values.min(), self.actual_values.max()],
-                    [self.actual_values.min(), self.actual_values.max()],
-                    'r--', lw=2)
-            plt.xlabel('Actual Values')
-            plt.ylabel('Predicted Values')
-            plt.title('Actual vs Predicted Values')
+            actual, predicted, _, mode = self._plot_data(mode, max_points)
+            fig = _figure((10, 6))
+            ax = fig.add_subplot()
+            _draw_points(fig, ax, actual, predicted, mode, bins)
+            ax.plot([actual.min(), actual.max()], [actual.min(), actual.max()], 'r--', lw=2)
+            ax.set_xlabel('Actual Values')
+            ax.set_ylabel('Predicted Values')
+            ax.set_title('Actual vs Predicted Values')
             
             if save_path:
-                plt.savefig(save_path)
-            plt.close()
+                fig.savefig(save_path)
             
         except Exception as e:
             logging.error(f"Error plotting actual vs predicted: {e}")
             raise
             
-    def plot_residuals(self, save_path: str = None) -> None:
-        """Plot residuals analysis"""
+    def plot_residuals(self, save_path: str = None, mode: str = 'auto',
+                       max_points: int = SCATTER_MAX_POINTS, bins: int = DENSITY_BINS) -> None:
+        """
+        Plot residuals analysis
+
+        Args:
+            save_path (str): Image file to write
+            mode (str): 'auto', 'scatter', 'density' or 'sample', as in plot_actual_vs_predicted
+            max_points (int): Points drawn by 'sample' and the 'auto' threshold
+            bins (int): Bins per axis in 'density' mode
+        """
         try:
-            residuals = self.actual_values - self.predictions
+            _, predicted, residuals, mode = self._plot_data(mode, max_points)
+            # The histogram bins every residual, not just the sampled points
+            residuals_all = residuals if mode == 'scatter' else (
+                np.asarray(self.actual_values, dtype=np.float64)
+                - np.asarray(self.predictions, dtype=np.float64)
+            )
             
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 5))
+            fig = _figure((15, 5))
+            ax1, ax2 = fig.subplots(1, 2)
             
             # Residuals vs Predicted
-            ax1.scatter(self.predictions, residuals, alpha=0.5)
+            _draw_points(fig, ax1, predicted, residuals, mode, bins)
             ax1.axhline(y=0, color='r', linestyle='--')
             ax1.set_xlabel('Predicted Values')
             ax1.set_ylabel('Residuals')
             ax1.set_title('Residuals vs Predicted Values')
             
             # Residuals Distribution
-            sns.histplot(residuals, ax=ax2)
-            ax2.set_title('Residuals Distribution')
+            if mode == 'scatter':
+                import seaborn as sns
+                sns.histplot(residuals_all, ax=ax2)
+                ax2.set_title('Residuals Distribution')
+            else:
+                # A few extreme residuals would squeeze every other row into one bin
+                low, high = np.nanpercentile(residuals_all, [0.1, 99.9])
+                counts, edges = np.histogram(residuals_all, bins=bins, range=(low, high))
+                ax2.stairs(counts, edges, fill=True, alpha=0.7)
+                ax2.set_ylabel('Count')
+                ax2.set_title('Residuals Distribution (central 99.8%)')
             
             if save_path:
-                plt.savefig(save_path)
-            plt.close()
+                fig.savefig(save_path)
             
         except Exception as e:
             logging.error(f"Error plotting residuals: {e}")
             raise
             
     def plot_feature_importance(self, model: Any, feature_names: list,
-                              save_path: str = None) -> None:
-        """Plot feature importance"""
+                              save_path: str = None, importances: pd.DataFrame = None) -> None:
+        """
+        Plot feature importance
+
+        Args:
+            model: Fitted model; its feature_importances_ are plotted unless
+                importances is given
+            feature_names (list): Feature names in model order
+            save_path (str): Image file to write
+            importances (pd.DataFrame): Precomputed feature/importance(/importance_std)
+                rows, e.g. from PermutationImportance.run
+        """
         try:
-            if hasattr(model, 'feature_importances_'):
-                importances = model.feature_importances_
-                indices = np.argsort(importances)[::-1]
-                
-                plt.figure(figsize=(12, 6))
-                plt.title('Feature Importances')
-                plt.bar(range(len(importances)), importances[indices])
-                plt.xticks(range(len(importances)),
-                          [feature_names[i] for i in indices],
-                          rotation=45)
-                
-                if save_path:
-                    plt.savefig(save_path)
-                plt.close()
-                
+            title = 'Feature Importances'
+            errors = None
+            if importances is not None:
+                title = 'Permutation Feature Importances'
+                feature_names = list(importances['feature'])
+                values = importances['importance'].to_numpy()
+                if 'importance_std' in importances:
+                    errors = importances['importance_std'].to_numpy()
+            elif hasattr(model, 'feature_importances_'):
+                values = model.feature_importances_
+            else:
+                return
+
+            indices = np.argsort(values)[::-1]
+            fig = _figure((12, 6))
+            ax = fig.add_subplot()
+            ax.set_title(title)
+            ax.bar(range(len(values)), values[indices],
+                   yerr=None if errors is None else errors[indices], capsize=3)
+            ax.set_xticks(range(len(values)))
+            ax.set_xticklabels([feature_names[i] for i in indices], rotation=45)
+
+            if save_path:
+                fig.savefig(save_path)
+
         except Exception as e:
             logging.error(f"Error plotting feature importance: {e}")
             raise
+
+    def save_plots(self, directory: str, mode: str = 'auto', max_points: int = SCATTER_MAX_POINTS,
+                   bins: int = DENSITY_BINS, model: Any = None, feature_names: list = None,
+                   importances: pd.DataFrame = None, workers: int = 3) -> Dict[str, str]:
+        """
+        Render the evaluation plots concurrently to PNG files
+
+        Every plot draws on its own Figure with the Agg canvas and never
+        touches pyplot, so the plots render in parallel threads and need
+        no display.
+
+        Args:
+            directory (str): Directory receiving the images
+            mode (str): 'auto', 'scatter', 'density' or 'sample'
+            max_points (int): Points drawn by 'sample' and the 'auto' threshold
+            bins (int): Bins per axis in 'density' mode
+            model: Fitted model; adds the feature importance plot
+            feature_names (list): Feature names for the importance plot
+            importances (pd.DataFrame): Precomputed importances to plot instead
+                of the model's feature_importances_
+            workers (int): Plots rendered at the same time
+
+        Returns:
+            dict: Plot name -> image path
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        os.makedirs(directory, exist_ok=True)
+        plots = {
+            'actual_vs_predicted': lambda path: self.plot_actual_vs_predicted(path, mode, max_points, bins),
+            'residuals': lambda path: self.plot_residuals(path, mode, max_points, bins)
+        }
+        if importances is not None or (model is not None and feature_names is not None):
+            plots['feature_importance'] = lambda path: self.plot_feature_importance(
+                model, feature_names, path, importances
+            )
+
+        paths = {name: os.path.join(directory, f'{name}.png') for name in plots}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [executor.submit(plot, paths[name]) for name, plot in plots.items()]
+            for future in futures:
+                future.result()
+        return paths
             
     def generate_evaluation_report(self, save_path: str = None) -> Dict:
         """Generate comprehensive evaluation report"""
+        if self.accumulator is None:
+            raise ValueError("No metrics to report; call calculate_metrics, "
+                             "calculate_metrics_streaming or finalize first")
         report = {
             'metrics': self.metrics,
-            'prediction_summary': {
-                'mean_prediction': np.mean(self.predictions),
-                'std_prediction': np.std(self.predictions),
-                'min_prediction': np.min(self.predictions),
-                'max_prediction': np.max(self.predictions)
-            },
-            'actual_summary': {
-                'mean_actual': np.mean(self.actual_values),
-                'std_actual': np.std(self.actual_values),
-                'min_actual': np.min(self.actual_values),
-                'max_actual': np.max(self.actual_values)
-            }
+            **self.accumulator.summary()
         }
         
         if save_path:
@@ -129,3 +504,25 @@ class ModelEvaluator:
                 json.dump(report, f, indent=4)
                 
         return report
+
+def evaluate_chunks(model, chunks: Iterable[pd.DataFrame],
+                    target_column: str = 'Profit (USD)') -> StreamingMetrics:
+    """
+    Score a holdout set chunk by chunk, accumulating metrics in bounded memory
+
+    Args:
+        model: Model exposing predict(), e.g. AirlineProfitModel
+        chunks (iterable): DataFrames with features and the target, e.g.
+            load_data(path, chunksize=...)
+        target_column (str): Target column
+
+    Returns:
+        StreamingMetrics: Accumulated metrics; call result() or merge() it
+            with accumulators from other workers
+    """
+    feature_names = getattr(model, 'feature_names', None)
+    accumulator = StreamingMetrics()
+    for chunk in chunks:
+        X = chunk[feature_names] if feature_names else chunk.drop(columns=[target_column])
+        accumulator.update(chunk[target_column], model.predict(X))
+    return accumulator
@@ -0,0 +1,141 @@
+# src/model_registry.py
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+from src.model_training import AirlineProfitModel
+
+# The path predict/serve load by default (<root>/model.joblib) resolves to the production version
+PUBLISHED_MODEL = 'model.joblib'
+
+def resolve_model_path(model_path: str) -> str:
+    """
+    joblib model that loading model_path should read
+
+    When model_path is a registry's published model and a version has been
+    promoted, the production version's model.joblib is returned; its compiled
+    forest sits beside it in model_artifact/. Any other path is returned as is.
+
+    Args:
+        model_path (str): Path given to predict/serve, e.g. serving.model_path
+
+    Returns:
+        str: Path of the joblib model to load
+    """
+    if os.path.basename(model_path) != PUBLISHED_MODEL:
+        return model_path
+    registry = ModelRegistry(os.path.dirname(model_path) or '.')
+    if registry.production_version is None:
+        return model_path
+    return registry.model_path(registry.production_version)
+
+class ModelRegistry:
+    def __init__(self, root: str = 'models/saved_models'):
+        """
+        Versioned store of trained models with a promoted production version
+
+        Layout: <root>/registry.json indexes <root>/<version>/model.joblib, and
+        published versions have their compiled forest in <root>/<version>/model_artifact.
+        The production entry of registry.json is the pointer predict and serve
+        follow (see resolve_model_path), so publishing never rewrites files a
+        running server has open.
+
+        Args:
+            root (str): Registry directory, normally paths.models from config.yaml
+        """
+        self.root = root
+        self.index_path = os.path.join(root, 'registry.json')
+        self.index = self._read_index()
+
+    def _read_index(self) -> Dict:
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                return json.load(f)
+        return {'production': None, 'versions': []}
+
+    def _write_index(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f'{self.index_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f, indent=4, default=float)
+        os.replace(tmp_path, self.index_path)
+
+    def list_versions(self) -> List[Dict]:
+        """Metadata of every registered version, oldest first"""
+        return list(self.index['versions'])
+
+    def get(self, version: str) -> Dict:
+        """Metadata of a single version"""
+        for entry in self.index['versions']:
+            if entry['version'] == version:
+                return entry
+        raise KeyError(f"Unknown model version: {version}")
+
+    @property
+    def production_version(self) -> Optional[str]:
+        return self.index['production']
+
+    def model_path(self, version: str) -> str:
+        return os.path.join(self.root, version, 'model.joblib')
+
+    def artifact_dir(self, version: str) -> str:
+        """Compiled forest of a version, where loaders look for <model>_artifact"""
+        return os.path.splitext(self.model_path(version))[0] + '_artifact'
+
+    def register(self, model: AirlineProfitModel, metrics: Dict[str, float],
+                 parent: Optional[str] = None, **metadata) -> str:
+        """
+        Save a model as a new version without promoting it
+
+        Args:
+            model (AirlineProfitModel): Trained model
+            metrics (dict): Evaluation metrics from evaluate_model
+            parent (str): Version the model was retrained from
+            **metadata: Extra JSON-serializable details, e.g. training rows
+
+        Returns:
+            str: New version identifier
+        """
+        version = f"v{len(self.index['versions']) + 1:04d}"
+        path = self.model_path(version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        model.save_model(path)
+
+        self.index['versions'].append({
+            'version': version,
+            'created_at': datetime.now().isoformat(),
+            'parent': parent,
+            'n_estimators': len(model.model.estimators_),
+            'metrics': {name: float(value) for name, value in metrics.items()},
+            **metadata
+        })
+        self._write_index()
+        return version
+
+    def promote(self, version: str) -> None:
+        """Make a registered version the production model"""
+        self.get(version)
+        self.index['production'] = version
+        self._write_index()
+
+    def publish(self, version: str, model: AirlineProfitModel) -> None:
+        """
+        Export a registered version's compiled forest into its own directory and promote it
+
+        Args:
+            version (str): Registered version of model
+            model (AirlineProfitModel): The trained model saved under that version
+        """
+        model.export_model(self.artifact_dir(version), source_path=self.model_path(version))
+        self.promote(version)
+
+    def load(self, version: Optional[str] = None) -> AirlineProfitModel:
+        """Load a version, by default the production one"""
+        version = version or self.production_version
+        if version is None:
+            raise ValueError("No production model has been promoted yet")
+
+        model = AirlineProfitModel()
+        model.load_model(self.model_path(version))
+        return model
@@ -1,18 +1,199 @@
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-import joblib
+import os
+from typing import Dict
+import uuid
+from src.tree_inference import CompiledForest, compile_forest
+from src.model_artifact import save_artifact, load_artifact, read_manifest, file_sha256
 
-def train_model(X, y):
-    """Train the Random Forest model"""
+def train_model(X, y, params=None, test_size=0.2):
+    """
+    Train the Random Forest model
+
+    Args:
+        X (pd.DataFrame): Features
+        y (pd.Series): Target
+        params (dict): RandomForestRegressor parameters, e.g. model_params.random_forest
+        test_size (float): Fraction of data held out for evaluation
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.model_selection import train_test_split
+
+    params = params or {'n_estimators': 100, 'random_state': 42}
     X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
+        X, y, test_size=test_size, random_state=params.get('random_state', 42)
     )
-    
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
+
+    model = RandomForestRegressor(**params)
     model.fit(X_train, y_train)
-    
+
     return model, X_test, y_test
 
 def save_model(model, filepath):
-    """Save the trained model"""
-    joblib.dump(model, filepath)
+    """Save the trained model, replacing any existing file atomically"""
+    import joblib
+    tmp_path = f'{filepath}.{os.getpid()}.tmp'
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, filepath)
+
+def load_model(filepath):
+    """Load a trained model"""
+    import joblib
+    return joblib.load(filepath)
+
+def export_model(model, directory, source_path=None):
+    """Export the trained forest as a memory-mappable artifact for fast inference"""
+    compiled = compile_forest(model)
+    save_artifact(compiled, directory, source_path=source_path)
+    return compiled
+
+class AirlineProfitModel:
+    def __init__(self, n_estimators: int = 100, random_state: int = 42,
+                 compiled_max_rows: int = 256, **params):
+        """
+        Initialize the airline profit model
+
+        Args:
+            n_estimators (int): Number of trees in the forest
+            random_state (int): Random seed for reproducibility
+            compiled_max_rows (int): Largest batch routed to the compiled forest
+                when the sklearn model is also loaded
+            **params: Additional RandomForestRegressor parameters
+        """
+        self.params = {'n_estimators': n_estimators, 'random_state': random_state, **params}
+        self.compiled_max_rows = compiled_max_rows
+        self.model = None
+        self.compiled = None
+        self.version = None
+        self.X_test = None
+        self.y_test = None
+
+    def train(self, X, y, test_size: float = 0.2, cv_folds: int = 5) -> Dict:
+        """
+        Train the model and report cross-validation scores
+
+        Args:
+            X (pd.DataFrame): Features
+            y (pd.Series): Target
+            test_size (float): Fraction of data held out for evaluation
+            cv_folds (int): Number of cross-validation folds
+
+        Returns:
+            dict: Training results
+        """
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.model_selection import train_test_split, cross_val_score
+
+        X_train, self.X_test, y_train, self.y_test = train_test_split(
+            X, y, test_size=test_size, random_state=self.params['random_state']
+        )
+
+        self.model = RandomForestRegressor(**self.params)
+        self.compiled = None
+        self.version = uuid.uuid4().hex
+        cv_scores = cross_val_score(self.model, X_train, y_train, cv=cv_folds, scoring='r2')
+        self.model.fit(X_train, y_train)
+
+        return {
+            'cv_scores': cv_scores.tolist(),
+            'cv_scores_mean': float(cv_scores.mean()),
+            'cv_scores_std': float(cv_scores.std())
+        }
+
+    @property
+    def feature_names(self):
+        """Column order expected by the model, if known"""
+        if self.compiled is not None and self.compiled.feature_names:
+            return self.compiled.feature_names
+        names = getattr(self.model, 'feature_names_in_', None)
+        return names.tolist() if names is not None else None
+
+    def fit(self, X, y) -> None:
+        """Fit a fresh forest on all of X without cross-validation or a holdout split"""
+        from sklearn.ensemble import RandomForestRegressor
+
+        self.model = RandomForestRegressor(**self.params)
+        self.compiled = None
+        self.version = uuid.uuid4().hex
+        self.model.fit(X, y)
+
+    def train_incremental(self, X_new, y_new, n_new_trees: int = 50,
+                          max_estimators: int = None) -> Dict:
+        """
+        Grow the existing forest with trees fitted only on new data
+
+        Uses RandomForestRegressor's warm_start, so the cost scales with the new
+        data and n_new_trees rather than with the full training history.
+
+        Args:
+            X_new (pd.DataFrame): New features, same columns as the original training data
+            y_new (pd.Series): New target
+            n_new_trees (int): Number of trees to add
+            max_estimators (int): If set, drop the oldest trees beyond this many
+
+        Returns:
+            dict: Trees added, trees dropped and total trees
+        """
+        if self.model is None:
+            raise ValueError("Model has not been trained or loaded")
+
+        n_current = len(self.model.estimators_)
+        self.model.set_params(warm_start=True, n_estimators=n_current + n_new_trees)
+        self.model.fit(X_new, y_new)
+        self.model.set_params(warm_start=False)
+
+        dropped = 0
+        if max_estimators and len(self.model.estimators_) > max_estimators:
+            dropped = len(self.model.estimators_) - max_estimators
+            self.model.estimators_ = self.model.estimators_[dropped:]
+            self.model.set_params(n_estimators=max_estimators)
+
+        self.params['n_estimators'] = len(self.model.estimators_)
+        self.compiled = None
+        self.version = uuid.uuid4().hex
+        return {
+            'trees_added': n_new_trees,
+            'trees_dropped': dropped,
+            'n_estimators': len(self.model.estimators_)
+        }
+
+    def predict(self, X):
+        """Predict profit for the given features"""
+        if self.compiled is not None and (self.model is None or len(X) <= self.compiled_max_rows):
+            return self.compiled.predict(X)
+        if self.model is None:
+            raise ValueError("Model has not been trained or loaded")
+        return self.model.predict(X)
+
+    def compile(self) -> CompiledForest:
+        """Switch predictions to the flat-array inference engine"""
+        self.compiled = compile_forest(self.model)
+        return self.compiled
+
+    def export_model(self, directory: str, source_path: str = None) -> None:
+        """
+        Export the trained forest as a memory-mappable artifact
+
+        Args:
+            directory (str): Artifact directory
+            source_path (str): Saved joblib model, recorded for staleness checks
+        """
+        self.compiled = export_model(self.model, directory, source_path)
+
+    def load_compiled(self, directory: str) -> None:
+        """Memory-map an artifact written by export_model for prediction"""
+        self.compiled = load_artifact(directory)
+        if self.model is None:
+            # Same version as the joblib file it was exported from, if known
+            manifest = read_manifest(directory)
+            source = manifest.get('source')
+            self.version = source['sha256'] if source else manifest['content_hash']
+
+    def save_model(self, filepath: str) -> None:
+        """Save the trained model"""
+        save_model(self.model, filepath)
+
+    def load_model(self, filepath: str) -> None:
+        """Load a trained model"""
+        self.model = load_model(filepath)
+        self.params = self.model.get_params()
+        self.compiled = None
+        self.version = file_sha256(filepath)
@@ -0,0 +1,102 @@
+import threading
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict
+import numpy as np
+
+@contextmanager
+def track_peak_memory(stats: Dict[str, int], stage: str):
+    """
+    Record the peak bytes allocated while the block runs
+
+    NumPy reports its buffers to tracemalloc, so array allocations are included.
+
+    Args:
+        stats (dict): Mapping updated with stage -> peak bytes above the starting level
+        stage (str): Name of the stage being measured
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+
+    start, _ = tracemalloc.get_traced_memory()
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        stats[stage] = max(0, peak - start)
+        if not was_tracing:
+            tracemalloc.stop()
+
+class LatencyTracker:
+    def __init__(self, window: int = 10000):
+        """
+        Track request latencies over a sliding window
+
+        Args:
+            window (int): Number of most recent samples kept for percentiles
+        """
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Record a single request latency in seconds"""
+        with self._lock:
+            self.samples.append(seconds)
+            self.count += 1
+
+    def summary(self) -> Dict[str, float]:
+        """Summarize latency as count, mean, p50 and p99 in milliseconds"""
+        with self._lock:
+            samples = np.fromiter(self.samples, dtype=float, count=len(self.samples))
+            count = self.count
+
+        if samples.size == 0:
+            return {'count': count, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0}
+
+        p50, p99 = np.percentile(samples, [50, 99]) * 1000
+        return {
+            'count': count,
+            'mean_ms': float(samples.mean() * 1000),
+            'p50_ms': float(p50),
+            'p99_ms': float(p99)
+        }
+
+class Histogram:
+    def __init__(self, bounds=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)):
+        """
+        Count observations into fixed upper-bound buckets
+
+        Args:
+            bounds (tuple): Inclusive upper bounds of the buckets, ascending
+        """
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record a single observation"""
+        index = int(np.searchsorted(self.bounds, value, side='left'))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def summary(self) -> Dict:
+        """Summarize bucket counts, mean and max"""
+        with self._lock:
+            labels = [f'<={bound}' for bound in self.bounds] + [f'>{self.bounds[-1]}']
+            return {
+                'count': self.count,
+                'mean': self.total / self.count if self.count else 0.0,
+                'max': self.max,
+                'buckets': dict(zip(labels, self.counts))
+            }
@@ -0,0 +1,165 @@
+# src/parallel_scoring.py
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from src.model_training import AirlineProfitModel
+
+# Model loaded once per worker process by _init_worker
+_worker_model = None
+
+def load_scoring_model(model_path: str) -> AirlineProfitModel:
+    """
+    Load a model for scoring inside a worker pool
+
+    Args:
+        model_path (str): Saved joblib model, loaded single-threaded, or an
+            exported artifact directory, memory-mapped
+
+    Returns:
+        AirlineProfitModel: Model ready for prediction
+    """
+    model = AirlineProfitModel()
+    if os.path.isdir(model_path):
+        model.load_compiled(model_path)
+    else:
+        model.load_model(model_path)
+        # The pool supplies the parallelism, so each predict stays single-threaded
+        model.model.set_params(n_jobs=1)
+    return model
+
+def _init_worker(model_path: str) -> None:
+    global _worker_model
+    _worker_model = load_scoring_model(model_path)
+
+def _score_partition(model, input_name: str, output_name: str, shape: tuple,
+                     start: int, end: int) -> None:
+    """Score rows [start, end) of the shared input into the shared output"""
+    input_shm = shared_memory.SharedMemory(name=input_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    try:
+        X = np.ndarray(shape, dtype=np.float32, buffer=input_shm.buf)
+        out = np.ndarray((shape[0],), dtype=np.float64, buffer=output_shm.buf)
+        partition = pd.DataFrame(X[start:end], columns=model.feature_names, copy=False)
+        out[start:end] = model.predict(partition)
+        del X, out, partition
+    finally:
+        input_shm.close()
+        output_shm.close()
+
+def _score_partition_in_worker(input_name: str, output_name: str, shape: tuple,
+                               start: int, end: int) -> None:
+    _score_partition(_worker_model, input_name, output_name, shape, start, end)
+
+class ParallelScorer:
+    def __init__(self, model_path: str, n_workers: Optional[int] = None,
+                 backend: str = 'process', partition_rows: int = 100000,
+                 feature_names: Optional[List[str]] = None):
+        """
+        Score large batches across a pool, sharing input and output through shared memory
+
+        Each worker loads the model once. An artifact directory is memory-mapped,
+        so every worker shares the same pages; a joblib file is unpickled once
+        per worker. Tasks carry only shared-memory names and row ranges.
+
+        Args:
+            model_path (str): Saved joblib model or exported artifact directory
+            n_workers (int): Pool size; defaults to all cores
+            backend (str): 'process' for a process pool, 'thread' for a thread pool
+                sharing one in-process model
+            partition_rows (int): Most rows per task; each batch is split into at
+                least one partition per worker
+            feature_names (list): Column order of the model; read from the
+                artifact manifest if omitted
+        """
+        self.n_workers = n_workers or os.cpu_count()
+        self.backend = backend
+        self.partition_rows = partition_rows
+
+        if backend == 'thread':
+            self.model = load_scoring_model(model_path)
+            self.executor = ThreadPoolExecutor(max_workers=self.n_workers)
+        elif backend == 'process':
+            self.model = None
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.n_workers, initializer=_init_worker, initargs=(model_path,)
+            )
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+
+        # Column order is needed up front to lay out the shared input matrix
+        self.feature_names = feature_names or self._read_feature_names(model_path)
+
+    def _read_feature_names(self, model_path: str) -> List[str]:
+        """Feature order from the artifact manifest, unpickling the model only as a last resort"""
+        from src.model_artifact import read_manifest, is_stale
+
+        if self.model is not None:
+            return self.model.feature_names
+        if os.path.isdir(model_path):
+            return read_manifest(model_path)['feature_names']
+        artifact_dir = os.path.splitext(model_path)[0] + '_artifact'
+        if not is_stale(artifact_dir, model_path):
+            return read_manifest(artifact_dir)['feature_names']
+        return load_scoring_model(model_path).feature_names
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict a batch, split into partitions scored in parallel
+
+        Args:
+            X (pd.DataFrame or dict of arrays): Features, e.g. from load_columnar_input
+
+        Returns:
+            np.ndarray: Predictions in input order
+        """
+        n_rows = len(X[self.feature_names[0]])
+        shape = (n_rows, len(self.feature_names))
+
+        # Trees compare float32 features, so float32 halves shared memory at no cost
+        input_shm = shared_memory.SharedMemory(create=True, size=max(1, n_rows * shape[1] * 4))
+        output_shm = shared_memory.SharedMemory(create=True, size=max(1, n_rows * 8))
+        try:
+            shared_X = np.ndarray(shape, dtype=np.float32, buffer=input_shm.buf)
+            for i, name in enumerate(self.feature_names):
+                shared_X[:, i] = np.asarray(X[name], dtype=np.float32)
+
+            # Every worker gets a share of the batch, however large partition_rows is
+            partition_rows = max(1, min(self.partition_rows, math.ceil(n_rows / self.n_workers)))
+            futures = [
+                self._submit(input_shm.name, output_shm.name, shape,
+                             start, min(start + partition_rows, n_rows))
+                for start in range(0, n_rows, partition_rows)
+            ]
+            for future in futures:
+                future.result()
+
+            predictions = np.ndarray((n_rows,), dtype=np.float64, buffer=output_shm.buf).copy()
+            del shared_X
+            return predictions
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+
+    def _submit(self, input_name: str, output_name: str, shape: tuple, start: int, end: int):
+        if self.backend == 'thread':
+            return self.executor.submit(_score_partition, self.model, input_name,
+                                        output_name, shape, start, end)
+        return self.executor.submit(_score_partition_in_worker, input_name,
+                                    output_name, shape, start, end)
+
+    def close(self) -> None:
+        """Shut down the worker pool"""
+        self.executor.shutdown()
+
+    def __enter__(self) -> 'ParallelScorer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
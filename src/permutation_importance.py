@@ -0,0 +1,249 @@
+# src/permutation_importance.py
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from src.model_evaluation import StreamingMetrics
+from src.shared_data import fingerprint_arrays, load_shared, shared_arrays
+
+# Per-process state set up by _init_worker: the model and a private, writable copy of X
+_worker_state = {}
+
+def stratified_subsample(y: np.ndarray, n_samples: int, n_strata: int = 10,
+                         random_state: int = 42) -> np.ndarray:
+    """
+    Indices of n_samples rows drawn proportionally from quantile strata of y
+
+    Every range of the target keeps its share of rows, so importances on
+    the subsample are not skewed by an unlucky draw of the tails.
+
+    Args:
+        y (np.ndarray): Target values
+        n_samples (int): Rows to keep
+        n_strata (int): Quantile bins of y sampled separately
+        random_state (int): Seed of the draw
+
+    Returns:
+        np.ndarray: Sorted row indices
+    """
+    n = len(y)
+    if n_samples >= n:
+        return np.arange(n)
+
+    edges = np.quantile(y, np.linspace(0, 1, n_strata + 1)[1:-1])
+    strata = np.searchsorted(edges, y, side='right')
+    counts = np.bincount(strata, minlength=n_strata)
+
+    # Proportional allocation, handing leftover rows to the largest remainders
+    exact = counts * (n_samples / n)
+    allocation = np.floor(exact).astype(np.int64)
+    leftover = n_samples - allocation.sum()
+    allocation[np.argsort(exact - allocation)[::-1][:leftover]] += 1
+
+    rng = np.random.default_rng(random_state)
+    chosen = [rng.choice(np.flatnonzero(strata == stratum), allocation[stratum], replace=False)
+              for stratum in range(n_strata) if allocation[stratum]]
+    return np.sort(np.concatenate(chosen))
+
+def _single_threaded(model):
+    """Let the pool supply the parallelism instead of each forest's joblib threads"""
+    estimator = getattr(model, 'model', model)
+    if estimator is not None and 'n_jobs' in getattr(estimator, 'get_params', dict)():
+        estimator.set_params(n_jobs=1)
+    return model
+
+def _pool_source(model):
+    """
+    What workers need to rebuild the model: a path as given, otherwise the bare
+    estimator, so wrappers such as AirlineProfitModel do not pickle their
+    training and holdout data into every worker's initargs
+    """
+    if isinstance(model, str) or not hasattr(model, 'model'):
+        return model
+    return model.model if model.model is not None else model.compiled
+
+def _init_worker(model_source, paths: Dict[str, str]) -> None:
+    from src.parallel_scoring import load_scoring_model
+
+    data = load_shared(paths)
+    model = load_scoring_model(model_source) if isinstance(model_source, str) else model_source
+    _worker_state['model'] = _single_threaded(model)
+    # Columns are permuted in place and restored, so one copy per worker is enough
+    _worker_state['X'] = np.array(data['X'])
+    _worker_state['y'] = data['y']
+
+def _score(model, X: np.ndarray, y: np.ndarray, feature_names: List[str]) -> float:
+    predictions = model.predict(pd.DataFrame(X, columns=feature_names, copy=False))
+    return StreamingMetrics().update(y, predictions).result()['r2_score']
+
+def _permuted_score(model, X: np.ndarray, y: np.ndarray, feature_names: List[str],
+                    feature: Optional[int], repeat: int, random_state: int) -> float:
+    """R² with one column shuffled; feature None scores the unpermuted data"""
+    if feature is None:
+        return _score(model, X, y, feature_names)
+
+    rng = np.random.default_rng([random_state, feature, repeat])
+    original = X[:, feature].copy()
+    X[:, feature] = original[rng.permutation(len(original))]
+    try:
+        return _score(model, X, y, feature_names)
+    finally:
+        X[:, feature] = original
+
+def _permuted_score_in_worker(feature_names: List[str], feature: Optional[int], repeat: int,
+                              random_state: int) -> float:
+    state = _worker_state
+    return _permuted_score(state['model'], state['X'], state['y'], feature_names,
+                           feature, repeat, random_state)
+
+class PermutationImportance:
+    def __init__(self, config: Dict, n_jobs: Optional[int] = None,
+                 cache_dir: Optional[str] = None, shared_dir: Optional[str] = None):
+        """
+        Permutation importance computed across a process pool and cached per model version
+
+        Impurity-based feature_importances_ favour features with many
+        distinct values; permutation importance measures how much the
+        holdout R² drops when one column is shuffled. Each (feature, repeat)
+        pair is a separate job, and workers read the holdout from
+        memory-mapped files instead of receiving it with every task.
+
+        Args:
+            config (dict): Loaded project configuration
+            n_jobs (int): Worker processes; defaults to
+                evaluation.permutation_importance.n_jobs or all cores
+            cache_dir (str): Directory of cached importance results
+            shared_dir (str): Directory for the memory-mapped holdout set
+        """
+        settings = config.get('evaluation', {}).get('permutation_importance', {})
+
+        self.n_repeats = settings.get('n_repeats', 5)
+        self.max_samples = settings.get('max_samples')
+        self.random_state = settings.get('random_state', 42)
+
+        n_jobs = n_jobs or settings.get('n_jobs')
+        self.n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        self.cache_dir = cache_dir or settings.get('cache_dir', 'models/model_metrics/importance_cache')
+        self.shared_dir = shared_dir or settings.get('shared_dir', 'data/processed/shared')
+
+    def run(self, model, X, y, feature_names: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Permutation importance of every feature, reusing a cached result when present
+
+        Args:
+            model: AirlineProfitModel, fitted estimator, or the path of a saved
+                joblib model or artifact directory
+            X (pd.DataFrame or np.ndarray): Holdout features
+            y (pd.Series or np.ndarray): Holdout target
+            feature_names (list): Column names; taken from X if it is a DataFrame
+
+        Returns:
+            pd.DataFrame: feature, importance (mean R² drop) and importance_std,
+                most important first; the per-repeat drops are in attrs['result']
+        """
+        model_source = _pool_source(model)
+        if isinstance(model, str):
+            from src.parallel_scoring import load_scoring_model
+            model = load_scoring_model(model)
+
+        if feature_names is None:
+            if isinstance(X, pd.DataFrame):
+                feature_names = list(X.columns)
+            else:
+                feature_names = list(getattr(model, 'feature_names', None) or range(np.shape(X)[1]))
+        X = X[feature_names].to_numpy(dtype=np.float32) if isinstance(X, pd.DataFrame) \
+            else np.asarray(X, dtype=np.float32)
+        y = np.asarray(y, dtype=np.float64)
+
+        if self.max_samples and self.max_samples < len(y):
+            rows = stratified_subsample(y, self.max_samples, random_state=self.random_state)
+            X, y = X[rows], y[rows]
+
+        fingerprint = fingerprint_arrays(X, y)
+        cache_path = self._cache_path(getattr(model, 'version', None), fingerprint, feature_names)
+        if cache_path is not None and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                return self._to_frame(json.load(f))
+
+        if self.n_jobs == 1:
+            # In-process, the forest keeps its own threads; permute a copy of the caller's data
+            X = X.copy()
+            baseline = _permuted_score(model, X, y, feature_names, None, 0, self.random_state)
+            scores = [[_permuted_score(model, X, y, feature_names, feature, repeat, self.random_state)
+                       for repeat in range(self.n_repeats)] for feature in range(len(feature_names))]
+        else:
+            baseline, scores = self._run_pool(model_source, X, y, fingerprint, feature_names)
+
+        result = {
+            'model_version': getattr(model, 'version', None),
+            'fingerprint': fingerprint,
+            'rows': len(y),
+            'n_repeats': self.n_repeats,
+            'random_state': self.random_state,
+            'baseline_score': baseline,
+            'features': feature_names,
+            'importances': [[baseline - score for score in feature_scores] for feature_scores in scores]
+        }
+        if cache_path is not None:
+            self._write_cache(cache_path, result)
+        return self._to_frame(result)
+
+    def _run_pool(self, model_source, X: np.ndarray, y: np.ndarray, fingerprint: str,
+                  feature_names: List[str]):
+        """Score the baseline and every (feature, repeat) permutation in worker processes"""
+        scores = [[None] * self.n_repeats for _ in feature_names]
+        jobs = [(None, 0)] + [(feature, repeat) for feature in range(len(feature_names))
+                              for repeat in range(self.n_repeats)]
+
+        baseline = None
+        # Workers memory-map one copy of the holdout; it is deleted once the pool is done
+        with shared_arrays({'X': X, 'y': y}, self.shared_dir, f'{fingerprint[:16]}_holdout') as paths, \
+                ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                    initargs=(model_source, paths)) as executor:
+            futures = {
+                executor.submit(_permuted_score_in_worker, feature_names, feature, repeat,
+                                self.random_state): (feature, repeat)
+                for feature, repeat in jobs
+            }
+            for future in as_completed(futures):
+                feature, repeat = futures[future]
+                if feature is None:
+                    baseline = future.result()
+                else:
+                    scores[feature][repeat] = future.result()
+        return baseline, scores
+
+    @staticmethod
+    def _to_frame(result: Dict) -> pd.DataFrame:
+        importances = np.array(result['importances'], dtype=np.float64).reshape(len(result['features']), -1)
+        frame = pd.DataFrame({
+            'feature': result['features'],
+            'importance': importances.mean(axis=1),
+            'importance_std': importances.std(axis=1)
+        }).sort_values('importance', ascending=False, ignore_index=True)
+        frame.attrs['result'] = result
+        return frame
+
+    def _cache_path(self, model_version: Optional[str], fingerprint: str,
+                    feature_names: List[str]) -> Optional[str]:
+        """Cache file for one (model version, holdout, settings) combination"""
+        if model_version is None:
+            # An estimator without a version cannot be told apart from a retrained one
+            return None
+        key = json.dumps(
+            [model_version, fingerprint, list(feature_names), self.n_repeats, self.random_state],
+            sort_keys=True
+        )
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _write_cache(self, cache_path: str, result: Dict) -> None:
+        """Store a result atomically"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(result, f, indent=4)
+        os.replace(tmp_path, cache_path)
@@ -1,10 +1,34 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import asyncio
+import logging
+import os
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Dict, List, Optional
+import pandas as pd
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from pydantic import BaseModel, Field, create_model
+from src.feature_engineering import derived_feature_engineer
+from src.input_output import AirlineProfitIO
+from src.model_artifact import is_stale
+from src.model_registry import resolve_model_path
+from src.model_training import AirlineProfitModel
+from src.prediction_cache import PredictionCache
+from src.request_coalescer import PredictionCoalescer
+from src.utils import load_config
 from .data_connector import PowerBIConnector
+from .upload_pipeline import LocalFileStorage, create_upload_pipeline
 
-app = FastAPI()
-connector = PowerBIConnector()
+_connector = None
+
+def get_connector() -> PowerBIConnector:
+    """Connector created on first use, so importing the app needs no PowerBI config"""
+    global _connector
+    if _connector is None:
+        _connector = PowerBIConnector()
+    return _connector
 
 class PredictionData(BaseModel):
     date: datetime
@@ -12,29 +36,309 @@ class PredictionData(BaseModel):
     actual_profit: float
     features: dict
 
-@app.post("/update_predictions")
-async def update_predictions(data: PredictionData):
+def _to_frame(records: List[PredictionData]) -> pd.DataFrame:
+    """Convert prediction records to the rows uploaded for PowerBI"""
+    return pd.DataFrame([{
+        'Date': data.date,
+        'PredictedProfit': data.predicted_profit,
+        'ActualProfit': data.actual_profit,
+        **data.features
+    } for data in records])
+
+def _enqueue(pipeline, records: List[PredictionData]) -> None:
+    # timeout=0 fails fast with queue.Full instead of holding a worker thread
+    pipeline.submit(_to_frame(records), timeout=0)
+
+router = APIRouter()
+
+def _upload_pipeline(request: Request):
+    """The app's upload pipeline, or 503 when PowerBI uploads are not configured"""
+    pipeline = request.app.state.upload_pipeline
+    if pipeline is None:
+        raise HTTPException(status_code=503, detail="PowerBI upload is not configured")
+    return pipeline
+
+async def _accept(request: Request, records: List[PredictionData]) -> dict:
+    """Hand records to the upload pipeline off the event loop and acknowledge them"""
+    state = request.app.state
+    pipeline = _upload_pipeline(request)
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(state.executor, _enqueue, pipeline, records)
+    except queue.Full:
+        raise HTTPException(status_code=503, detail="Upload queue is full, retry later")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {"status": "accepted", "records": len(records)}
+
+@router.post("/update_predictions", status_code=202)
+async def update_predictions(data: PredictionData, request: Request):
     """
     API endpoint to update prediction data
-    
+
+    The record is queued and uploaded with others from the same time window.
+
     Args:
         data (PredictionData): New prediction data
     Returns:
         dict: Status message
     """
+    return await _accept(request, [data])
+
+@router.post("/update_predictions/batch", status_code=202)
+async def update_predictions_batch(records: List[PredictionData], request: Request):
+    """
+    API endpoint to queue many prediction records in one call
+
+    Args:
+        records (list): New prediction data
+    Returns:
+        dict: Status message with the number of records accepted
+    """
+    return await _accept(request, records)
+
+@router.post("/flush")
+async def flush(request: Request):
+    """
+    Upload every queued record now instead of at the end of its window
+
+    Returns:
+        dict: Upload pipeline statistics after the flush
+    """
+    pipeline = _upload_pipeline(request)
+    await asyncio.get_running_loop().run_in_executor(request.app.state.executor, pipeline.flush)
+    return pipeline.stats()
+
+@router.get("/upload_stats")
+async def upload_stats(request: Request):
+    """Upload pipeline counters: rows queued and uploaded, blobs, retries, failures"""
+    return _upload_pipeline(request).stats()
+
+def build_feature_model(features: Dict):
+    """
+    Pydantic request schema for one flight, generated from the features block of config.yaml
+
+    Column names such as 'Load Factor (%)' are not valid identifiers, so each
+    field gets a snake_case name and accepts the original column name as alias.
+
+    Args:
+        features (dict): Feature lists with 'numerical' and 'categorical' columns
+    Returns:
+        type: Pydantic model class
+    """
+    fields = {}
+    for name in features.get('numerical', []):
+        fields[_field_name(name)] = (float, Field(..., alias=name))
+    for name in features.get('categorical', []):
+        fields[_field_name(name)] = (str, Field(..., alias=name))
+    return create_model('FeatureRecord', **fields)
+
+def _field_name(column: str) -> str:
+    return re.sub(r'\W+', '_', column).strip('_').lower()
+
+def check_feature_schema(features: Dict, feature_names: Optional[List[str]]) -> None:
+    """
+    Make sure the generated request schema provides every column the model needs
+
+    Args:
+        features (dict): features block of config.yaml the schema is built from
+        feature_names (list): Raw columns the model needs, derived features
+            excluded; None skips the check
+    Raises:
+        ValueError: If the model needs columns the schema does not accept
+    """
+    if not feature_names:
+        return
+    schema_columns = features.get('numerical', []) + features.get('categorical', [])
+    missing = [name for name in feature_names if name not in schema_columns]
+    if missing:
+        raise ValueError(f"Model features missing from config.yaml features: {missing}; "
+                         f"requests could never provide them")
+    unused = [name for name in schema_columns if name not in feature_names]
+    if unused:
+        logging.warning(f"Request fields not used by the model and dropped before scoring: {unused}")
+
+def load_serving_model(serving_config: Dict) -> AirlineProfitModel:
+    """
+    Load the model served by the API once, at startup
+
+    Args:
+        serving_config (dict): serving block of config.yaml
+    Returns:
+        AirlineProfitModel: Model ready for prediction
+    """
+    model_path = resolve_model_path(serving_config.get('model_path', 'models/saved_models/model.joblib'))
+    compiled = serving_config.get('compiled', True)
+    artifact_dir = os.path.splitext(model_path)[0] + '_artifact'
+
+    model = AirlineProfitModel()
+    if compiled and not is_stale(artifact_dir, source_path=model_path):
+        model.load_compiled(artifact_dir)
+    else:
+        model.load_model(model_path)
+        # The scoring pool supplies the parallelism; per-call joblib threads only add latency
+        model.model.set_params(n_jobs=1)
+        if compiled:
+            model.compile()
+    return model
+
+def _model_input(record: BaseModel, feature_names: Optional[List[str]]) -> Dict:
+    """Request record keyed by column name, limited to the columns the model was trained on"""
+    dump = getattr(record, 'model_dump', None) or record.dict
+    data = dump(by_alias=True)
+    if feature_names:
+        data = {name: data[name] for name in feature_names if name in data}
+    return data
+
+def _check_result(result: Dict) -> Dict:
+    if result.get('status') != 'success':
+        raise HTTPException(status_code=400, detail=result.get('message', 'Prediction failed'))
+    return result
+
+def _prediction_router(record_model) -> APIRouter:
+    """Prediction routes whose request bodies use the generated feature schema"""
+    predict_router = APIRouter()
+
+    @predict_router.post("/predict")
+    async def predict(record: record_model, request: Request):
+        """
+        Predict profit for one flight with the warm model
+
+        Args:
+            record (FeatureRecord): Input features, keyed by config.yaml column names
+        Returns:
+            dict: Prediction result
+        """
+        state = request.app.state
+        if state.io_handler is None:
+            raise HTTPException(status_code=503, detail="Model not loaded")
+
+        data = _model_input(record, state.feature_names)
+        if state.coalescer is not None:
+            # Concurrent single requests are scored together in one batch
+            result = await state.coalescer.predict(data)
+            result.pop('input_data', None)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(
+                state.scoring_executor, state.io_handler.process_single_input, data, False
+            )
+        return _check_result(result)
+
+    @predict_router.post("/predict/batch")
+    async def predict_batch(records: List[record_model], request: Request):
+        """
+        Predict profit for many flights in one vectorized call
+
+        Args:
+            records (list): Input feature records
+        Returns:
+            dict: Predictions in request order
+        """
+        state = request.app.state
+        if state.io_handler is None:
+            raise HTTPException(status_code=503, detail="Model not loaded")
+
+        data = [_model_input(record, state.feature_names) for record in records]
+        result = await asyncio.get_running_loop().run_in_executor(
+            state.scoring_executor, state.io_handler.process_batch_input, data, False
+        )
+        return _check_result(result)
+
+    return predict_router
+
+def _start_scoring(app: FastAPI, config: Dict) -> None:
+    """Load the model once and set up the scoring pool, leaving predictions disabled on failure"""
+    serving_config = config.get('serving', {})
+    app.state.io_handler = None
+    app.state.feature_names = None
+    app.state.coalescer = None
+    app.state.scoring_executor = ThreadPoolExecutor(
+        max_workers=serving_config.get('workers', os.cpu_count())
+    )
+
     try:
-        # Convert data to DataFrame
-        df = pd.DataFrame([{
-            'Date': data.date,
-            'PredictedProfit': data.predicted_profit,
-            'ActualProfit': data.actual_profit,
-            **data.features
-        }])
-        
-        # Upload to Azure
-        connector.upload_to_azure(df, f'predictions_{data.date.date()}.csv')
-        
-        return {"status": "success", "message": "Data updated successfully"}
-    
+        model = load_serving_model(serving_config)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        print(f"Prediction routes disabled, error loading model: {str(e)}")
+        return
+    feature_engineer = derived_feature_engineer(config, model.feature_names)
+
+    cache_config = serving_config.get('cache', {})
+    cache = None
+    if cache_config.get('enabled', False):
+        cache = PredictionCache(max_size=cache_config.get('max_size', 10000),
+                                ttl_seconds=cache_config.get('ttl_seconds', 300))
+    io_handler = AirlineProfitIO(model, cache=cache, schema=config.get('features', {}),
+                                 feature_engineer=feature_engineer)
+    # Requests carry raw columns; derived features are computed from them before scoring.
+    # A model needing columns the schema does not accept would fail on every request
+    check_feature_schema(config.get('features', {}), io_handler.input_columns)
+    app.state.io_handler = io_handler
+    app.state.feature_names = io_handler.input_columns
+
+    coalescing = serving_config.get('coalescing', {})
+    if coalescing.get('enabled', False):
+        app.state.coalescer = PredictionCoalescer(
+            app.state.io_handler,
+            max_batch_size=coalescing.get('max_batch_size', 64),
+            max_wait_ms=coalescing.get('max_wait_ms', 2)
+        )
+
+def _start_uploads(app: FastAPI, upload_config: Dict) -> None:
+    """Start the upload pipeline, leaving the ingestion routes disabled if PowerBI is not configured"""
+    app.state.upload_pipeline = None
+    storage = app.state.storage
+    try:
+        if storage is None:
+            if upload_config.get('storage', 'azure') == 'local':
+                storage = LocalFileStorage(upload_config.get('local_dir', 'data/processed/powerbi_uploads'))
+            else:
+                storage = get_connector().storage
+    except Exception as e:
+        print(f"Ingestion routes disabled, PowerBI storage not configured: {str(e)}")
+        return
+    app.state.upload_pipeline = create_upload_pipeline(storage, upload_config, date_column='Date')
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the model and start the upload pipeline with the app; drain both on shutdown"""
+    config = app.state.config
+    _start_scoring(app, config)
+    if app.state.coalescer is not None:
+        await app.state.coalescer.start()
+
+    powerbi_config = config.get('powerbi', {})
+    _start_uploads(app, powerbi_config.get('upload', {}))
+    app.state.executor = ThreadPoolExecutor(
+        max_workers=powerbi_config.get('api', {}).get('workers', 4)
+    )
+    try:
+        yield
+    finally:
+        if app.state.coalescer is not None:
+            await app.state.coalescer.stop()
+        if app.state.upload_pipeline is not None:
+            app.state.upload_pipeline.close()
+        app.state.executor.shutdown()
+        app.state.scoring_executor.shutdown()
+
+def create_app(storage=None, config=None) -> FastAPI:
+    """
+    Build the API app: PowerBI ingestion plus predictions from one warm model
+
+    Args:
+        storage: Blob storage for uploads; defaults to powerbi.upload in config.yaml
+        config (dict): Project configuration; loaded from config.yaml if omitted
+    Returns:
+        FastAPI: Application
+    """
+    config = config if config is not None else load_config()
+    app = FastAPI(lifespan=lifespan)
+    app.state.storage = storage
+    app.state.config = config
+    app.include_router(router)
+    app.include_router(_prediction_router(build_feature_model(config.get('features', {}))))
+    return app
+
+app = create_app()
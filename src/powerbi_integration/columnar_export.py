@@ -0,0 +1,148 @@
+# src/powerbi_integration/columnar_export.py
+
+import io
+import json
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import quote
+import pandas as pd
+from .upload_pipeline import serialize_csv
+
+FORMAT_EXTENSIONS = {'parquet': '.parquet', 'csv': '.csv.gz'}
+# Partition value used for missing keys, as in Hive/Spark layouts
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+def serialize_frame(df: pd.DataFrame, file_format: str = 'parquet',
+                    compression: str = 'snappy') -> bytes:
+    """
+    Serialize a frame for export
+
+    Args:
+        df (pd.DataFrame): Rows to serialize
+        file_format (str): 'parquet' (needs pyarrow or fastparquet) or 'csv' (gzipped)
+        compression (str): Parquet codec, e.g. 'snappy', 'gzip' or 'zstd'
+
+    Returns:
+        bytes: File contents
+    """
+    if file_format == 'parquet':
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False, compression=compression)
+        return buffer.getvalue()
+    if file_format == 'csv':
+        return serialize_csv(df, compress=True)
+    raise ValueError(f"Unknown export format: {file_format}")
+
+def deserialize_frame(data: bytes, file_format: str = 'parquet') -> pd.DataFrame:
+    """Read bytes written by serialize_frame"""
+    if file_format == 'parquet':
+        return pd.read_parquet(io.BytesIO(data))
+    return pd.read_csv(io.BytesIO(data), compression='gzip')
+
+class PartitionedExporter:
+    def __init__(self, storage, dataset: str = 'predictions', date_column: str = 'Date',
+                 route_column: Optional[str] = None, file_format: str = 'parquet',
+                 compression: str = 'snappy'):
+        """
+        Write a dataset as compressed files partitioned by date and optionally route type
+
+        Files are laid out as <dataset>/date=<YYYY-MM-DD>[/route=<value>]/part-<n>
+        and listed in <dataset>/_manifest.json. Every file gets an increasing
+        sequence number, so a reader that remembers the last sequence it saw
+        only has to fetch the partitions written since.
+
+        Args:
+            storage: Object with upload(blob_name, data) and download(blob_name),
+                e.g. AzureBlobStorage, LocalFileStorage or InMemoryStorage
+            dataset (str): Dataset name, used as the blob prefix
+            date_column (str): Column whose calendar date selects the partition
+            route_column (str): Optional second partition column, e.g. 'Route Type'
+            file_format (str): 'parquet' or 'csv' (gzipped)
+            compression (str): Parquet codec
+        """
+        self.storage = storage
+        self.dataset = dataset
+        self.date_column = date_column
+        self.route_column = route_column
+        self.file_format = file_format
+        self.compression = compression
+        self.manifest_name = f'{dataset}/_manifest.json'
+        self._lock = threading.Lock()
+
+    def read_manifest(self) -> Dict:
+        """Current manifest, or an empty one before the first export"""
+        data = self.storage.download(self.manifest_name)
+        if data is None:
+            return {'dataset': self.dataset, 'format': self.file_format,
+                    'last_sequence': 0, 'partitions': []}
+        return json.loads(data)
+
+    def _partition_path(self, date, route=None) -> str:
+        path = f'{self.dataset}/date={date}'
+        if self.route_column is not None:
+            value = NULL_PARTITION if pd.isna(route) else quote(str(route), safe='')
+            path += f'/route={value}'
+        return path
+
+    def export(self, df: pd.DataFrame) -> List[Dict]:
+        """
+        Write rows into their partitions and record the new files in the manifest
+
+        Args:
+            df (pd.DataFrame): Rows to export; must contain date_column
+                (and route_column if set)
+
+        Returns:
+            list: Manifest entries of the files written
+        """
+        if df.empty:
+            return []
+
+        dates = pd.to_datetime(df[self.date_column]).dt.strftime('%Y-%m-%d')
+        keys = [dates] if self.route_column is None else [dates, df[self.route_column]]
+
+        with self._lock:
+            manifest = self.read_manifest()
+            sequence = manifest['last_sequence']
+            entries = []
+            for key, part in df.groupby(keys, sort=True, dropna=False):
+                date, route = (key, None) if self.route_column is None else key
+                # pandas 2 yields 1-tuples when grouping by a one-element list
+                if isinstance(date, tuple):
+                    date = date[0]
+
+                sequence += 1
+                data = serialize_frame(part, self.file_format, self.compression)
+                name = (f'{self._partition_path(date, route)}/'
+                        f'part-{sequence:08d}{FORMAT_EXTENSIONS[self.file_format]}')
+                self.storage.upload(name, data)
+
+                entry = {
+                    'path': name,
+                    'sequence': sequence,
+                    'date': date,
+                    'rows': len(part),
+                    'bytes': len(data),
+                    'created_at': datetime.now().isoformat()
+                }
+                if self.route_column is not None:
+                    entry['route'] = None if pd.isna(route) else str(route)
+                entries.append(entry)
+
+            # The manifest is written after the files, so it never lists a missing file
+            manifest['partitions'].extend(entries)
+            manifest['last_sequence'] = sequence
+            self.storage.upload(self.manifest_name, json.dumps(manifest, indent=4).encode('utf-8'))
+        return entries
+
+    def new_partitions(self, after_sequence: int = 0) -> List[Dict]:
+        """Manifest entries written after the given sequence number"""
+        return [entry for entry in self.read_manifest()['partitions']
+                if entry['sequence'] > after_sequence]
+
+    def read_partitions(self, entries: List[Dict]) -> pd.DataFrame:
+        """Load and concatenate the files behind manifest entries"""
+        frames = [deserialize_frame(self.storage.download(entry['path']), self.file_format)
+                  for entry in entries]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
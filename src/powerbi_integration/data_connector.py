@@ -1,8 +1,35 @@
 import pandas as pd
 from datetime import datetime
-import pyodbc
-from azure.storage.blob import BlobServiceClient
 import json
+import time
+from .upload_pipeline import AzureBlobStorage, serialize_csv
+from .columnar_export import PartitionedExporter
+from .merge_join import sorted_merge_join
+
+def row_keys(df):
+    """
+    Stable content hash of every row, identifying rows delivered in an earlier refresh
+
+    Args:
+        df (pd.DataFrame): Merged rows; LastUpdated is ignored
+    Returns:
+        pd.Series: Hex key per row
+    """
+    columns = [column for column in df.columns if column != 'LastUpdated']
+    hashes = pd.util.hash_pandas_object(df[columns], index=False)
+    return hashes.map('{:016x}'.format)
+
+def _since_watermark(df, since):
+    """Rows dated on or after the watermark; its own Date may have received late rows"""
+    return df[pd.to_datetime(df['Date']) >= since]
+
+def _drop_delivered(df, since, delivered):
+    """Drop rows on the watermark's Date whose keys were already delivered"""
+    if since is None or not delivered or df.empty:
+        return df
+    on_watermark = (pd.to_datetime(df['Date']) == since).to_numpy()
+    seen = on_watermark & row_keys(df).isin(delivered).to_numpy()
+    return df[~seen]
 
 class PowerBIConnector:
     def __init__(self, config_path='config/powerbi_config.json'):
@@ -14,16 +41,26 @@ class PowerBIConnector:
         self.container_name = self.config['container_name']
         self.workspace_id = self.config['workspace_id']
 
-    def prepare_prediction_data(self, predictions_df, actual_df):
+        # One container client shared by every upload
+        self.storage = AzureBlobStorage(self.connection_string, self.container_name)
+
+    def prepare_prediction_data(self, predictions_df, actual_df, since=None, delivered=None):
         """
         Prepare data for PowerBI
         
         Args:
             predictions_df (pd.DataFrame): Model predictions
             actual_df (pd.DataFrame): Actual values
+            since (datetime): Only merge rows with a Date on or after this watermark
+            delivered (set): row_keys already delivered on the watermark's Date
         Returns:
             pd.DataFrame: Formatted data for PowerBI
         """
+        # Filter both sides before merging so only the delta is joined
+        if since is not None:
+            predictions_df = _since_watermark(predictions_df, since)
+            actual_df = _since_watermark(actual_df, since)
+
         # Merge predictions with actual values
         combined_df = pd.merge(
             predictions_df,
@@ -32,11 +69,37 @@ class PowerBIConnector:
             suffixes=('_predicted', '_actual')
         )
         
+        combined_df = _drop_delivered(combined_df, since, delivered)
+
         # Add timestamp
         combined_df['LastUpdated'] = datetime.now()
         
         return combined_df
 
+    def stream_prediction_data(self, predictions_chunks, actual_chunks, since=None, delivered=None):
+        """
+        Out-of-core prepare_prediction_data for inputs too large to merge in memory
+        
+        Args:
+            predictions_chunks (iterable): Prediction DataFrames sorted by Date,
+                e.g. read_sorted_csv(path, chunksize=100000)
+            actual_chunks (iterable): Actual-value DataFrames sorted by Date
+            since (datetime): Only merge rows with a Date on or after this watermark
+            delivered (set): row_keys already delivered on the watermark's Date
+        Yields:
+            pd.DataFrame: Formatted batches, together equal to prepare_prediction_data
+        """
+        if since is not None:
+            predictions_chunks = (_since_watermark(chunk, since) for chunk in predictions_chunks)
+            actual_chunks = (_since_watermark(chunk, since) for chunk in actual_chunks)
+
+        last_updated = datetime.now()
+        for batch in sorted_merge_join(predictions_chunks, actual_chunks, on='Date',
+                                       suffixes=('_predicted', '_actual')):
+            batch = _drop_delivered(batch, since, delivered)
+            batch['LastUpdated'] = last_updated
+            yield batch
+
     def upload_to_azure(self, df, blob_name):
         """
         Upload data to Azure Blob Storage for PowerBI
@@ -46,28 +109,94 @@ class PowerBIConnector:
             blob_name (str): Name of the blob
         """
         try:
-            # Create blob service client
-            blob_service_client = BlobServiceClient.from_connection_string(
-                self.connection_string
-            )
-            
-            # Get container client
-            container_client = blob_service_client.get_container_client(
-                self.container_name
-            )
-            
-            # Convert DataFrame to CSV
-            csv_data = df.to_csv(index=False)
-            
-            # Upload to blob
-            blob_client = container_client.get_blob_client(blob_name)
-            blob_client.upload_blob(csv_data, overwrite=True)
+            self.storage.upload(blob_name, serialize_csv(df, compress=blob_name.endswith('.gz')))
             
             print(f"Successfully uploaded data to {blob_name}")
             
         except Exception as e:
             print(f"Error uploading to Azure: {str(e)}")
 
+    def incremental_refresh(self, dataset, predictions, actuals, watermarks, exporter=None):
+        """
+        Merge and upload only the rows newer than the dataset's watermark
+        
+        The watermark advances to the latest merged Date only after the
+        upload succeeds, so a failed refresh is retried in full next time.
+        Dates have day granularity, so the watermark's own Date is merged
+        again on every refresh; the keys of rows already delivered on it
+        are stored with the watermark and skipped, and only rows that
+        arrived late for that day are uploaded.
+
+        DataFrames are merged in memory. Chunk iterables, e.g. from
+        read_sorted_csv, must be sorted by Date and are merged with
+        stream_prediction_data, uploading one blob per joined batch.
+        
+        Args:
+            dataset (str): Dataset name, used for the watermark and blob names
+            predictions (pd.DataFrame or iterable): Model predictions with a Date column
+            actuals (pd.DataFrame or iterable): Actual values with a Date column
+            watermarks (WatermarkStore): Persisted high-water marks
+            exporter (PartitionedExporter): Write the delta as partitioned files
+                instead of gzipped CSV blobs
+        Returns:
+            dict: Rows processed, duration and the old and new watermark
+        """
+        start = time.perf_counter()
+        since = watermarks.get(dataset)
+        delivered = watermarks.delivered(dataset) if since is not None else set()
+        streaming = not (isinstance(predictions, pd.DataFrame) and isinstance(actuals, pd.DataFrame))
+        if streaming:
+            batches = self.stream_prediction_data(predictions, actuals, since, delivered)
+        else:
+            batches = [self.prepare_prediction_data(predictions, actuals, since, delivered)]
+
+        start_label = since.strftime('%Y%m%d') if since is not None else 'initial'
+        watermark = since
+        keys = set()
+        rows = 0
+        for part, delta in enumerate(batch for batch in batches if not batch.empty):
+            dates = pd.to_datetime(delta['Date'])
+            latest = dates.max()
+            # Batches come in Date order, so only the last Date's keys are kept
+            latest_keys = set(row_keys(delta[(dates == latest).to_numpy()]))
+            if not rows or latest > watermark:
+                watermark, keys = latest, latest_keys
+            else:
+                keys |= latest_keys
+            if exporter is not None:
+                exporter.export(delta)
+            else:
+                blob_name = f'{dataset}/delta_{start_label}_{latest.strftime("%Y%m%d")}'
+                if streaming:
+                    blob_name += f'_{part:05d}'
+                self.storage.upload(f'{blob_name}.csv.gz', serialize_csv(delta, compress=True))
+            rows += len(delta)
+
+        if rows:
+            if watermark == since:
+                keys |= delivered
+            watermarks.set(dataset, watermark, keys)
+
+        return {
+            'dataset': dataset,
+            'rows_processed': rows,
+            'previous_watermark': since.isoformat() if since is not None else None,
+            'watermark': watermark.isoformat() if watermark is not None else None,
+            'duration_seconds': time.perf_counter() - start
+        }
+
+    def create_exporter(self, dataset, **kwargs):
+        """
+        Partitioned columnar exporter writing to this connector's container
+        
+        Args:
+            dataset (str): Dataset name, e.g. 'predictions' or 'actuals'
+            **kwargs: PartitionedExporter options (date_column, route_column, file_format, compression)
+        Returns:
+            PartitionedExporter: Exporter sharing the connector's blob client
+        """
+        return PartitionedExporter(self.storage, dataset, **kwargs)
+
     def refresh_dataset(self, dataset_id):
         """
         Trigger PowerBI dataset refresh
@@ -0,0 +1,100 @@
+# src/powerbi_integration/merge_join.py
+
+from typing import Iterable, Iterator, Optional, Tuple
+import pandas as pd
+
+class _SortedChunks:
+    def __init__(self, chunks: Iterable[pd.DataFrame], on: str):
+        """Chunk iterator that checks its key column stays sorted across chunks"""
+        self._chunks = iter(chunks)
+        self.on = on
+        self.exhausted = False
+        self._last_key = None
+
+    def read(self) -> Optional[pd.DataFrame]:
+        """Next non-empty chunk, or None once the input is exhausted"""
+        for chunk in self._chunks:
+            if chunk.empty:
+                continue
+            keys = chunk[self.on]
+            if keys.isna().any():
+                raise ValueError(f"Merge key '{self.on}' contains missing values")
+            if not keys.is_monotonic_increasing or (
+                self._last_key is not None and keys.iloc[0] < self._last_key
+            ):
+                raise ValueError(f"Input is not sorted by '{self.on}'")
+            self._last_key = keys.iloc[-1]
+            return chunk.reset_index(drop=True)
+        self.exhausted = True
+        return None
+
+def _extend(buffer: Optional[pd.DataFrame], reader: _SortedChunks) -> Optional[pd.DataFrame]:
+    """Append the reader's next chunk to a buffer"""
+    chunk = reader.read()
+    if chunk is None:
+        return buffer
+    if buffer is None or buffer.empty:
+        return chunk
+    return pd.concat([buffer, chunk], ignore_index=True)
+
+def sorted_merge_join(left_chunks: Iterable[pd.DataFrame], right_chunks: Iterable[pd.DataFrame],
+                      on: str = 'Date',
+                      suffixes: Tuple[str, str] = ('_predicted', '_actual')) -> Iterator[pd.DataFrame]:
+    """
+    Inner-join two key-sorted chunked inputs, yielding joined batches
+
+    Equivalent to pd.merge(left, right, on=on, suffixes=suffixes, sort=True)
+    on the concatenated inputs, rows in the same order, but only the current
+    chunks plus any run of duplicate keys spanning chunks are held in memory.
+    Rows are emitted once both sides have moved past their key, so
+    duplicate keys produce the same cross product as pd.merge.
+
+    Args:
+        left_chunks (iterable): DataFrames sorted by `on`, e.g. from
+            pd.read_csv(..., chunksize=...)
+        right_chunks (iterable): DataFrames sorted by `on`
+        on (str): Join key column
+        suffixes (tuple): Suffixes for overlapping non-key columns
+
+    Yields:
+        pd.DataFrame: Joined rows, in key order
+    """
+    left_reader = _SortedChunks(left_chunks, on)
+    right_reader = _SortedChunks(right_chunks, on)
+    left = _extend(None, left_reader)
+    right = _extend(None, right_reader)
+
+    while left is not None and right is not None and not left.empty and not right.empty:
+        live = [buffer[on].iloc[-1] for buffer, reader in
+                ((left, left_reader), (right, right_reader)) if not reader.exhausted]
+        if not live:
+            batch = pd.merge(left, right, on=on, suffixes=suffixes, sort=True)
+            if not batch.empty:
+                yield batch
+            return
+
+        # Keys below the smallest buffered maximum of a live input are complete on both sides
+        bound = min(live)
+        left_end = left[on].searchsorted(bound, side='left')
+        right_end = right[on].searchsorted(bound, side='left')
+        if left_end and right_end:
+            batch = pd.merge(left.iloc[:left_end], right.iloc[:right_end],
+                             on=on, suffixes=suffixes, sort=True)
+            if not batch.empty:
+                yield batch
+        left = left.iloc[left_end:]
+        right = right.iloc[right_end:]
+
+        # Read more from whichever side set the bound
+        if not left_reader.exhausted and (left.empty or left[on].iloc[-1] == bound):
+            left = _extend(left, left_reader)
+        if not right_reader.exhausted and (right.empty or right[on].iloc[-1] == bound):
+            right = _extend(right, right_reader)
+
+        # An exhausted, drained side can match nothing more
+        if (left.empty and left_reader.exhausted) or (right.empty and right_reader.exhausted):
+            return
+
+def read_sorted_csv(filepath: str, on: str = 'Date', chunksize: int = 100000) -> Iterator[pd.DataFrame]:
+    """Read a CSV sorted by `on` in chunks, parsing the key as dates"""
+    return pd.read_csv(filepath, chunksize=chunksize, parse_dates=[on])
@@ -1,27 +1,121 @@
 from datetime import datetime
-import schedule
+import queue
+import threading
 import time
 from .data_connector import PowerBIConnector
+from .watermarks import WatermarkStore
 
 class PowerBIScheduler:
-    def __init__(self, connector: PowerBIConnector):
-        """Initialize scheduler with PowerBI connector"""
+    def __init__(self, connector: PowerBIConnector, load_data=None, watermarks=None,
+                 dataset='predictions', exporter=None):
+        """
+        Initialize scheduler with PowerBI connector
+
+        Args:
+            connector (PowerBIConnector): Connector used to upload the delta
+            load_data (callable): Returns (predictions_df, actual_df) to refresh from
+            watermarks (WatermarkStore): Persisted high-water marks
+            dataset (str): Dataset name for the watermark and blobs
+            exporter (PartitionedExporter): Optional partitioned columnar export
+        """
         self.connector = connector
+        self.load_data = load_data
+        self.watermarks = watermarks or WatermarkStore()
+        self.dataset = dataset
+        self.exporter = exporter
+
+        self.runs = 0
+        self.failures = 0
+        self.rows_processed = 0
+        self.last_refresh = None
+        self._events = queue.Queue()
+        self._thread = None
+
+    def trigger(self):
+        """Request a refresh now, e.g. after new predictions were written"""
+        self._events.put('refresh')
+
+    def start(self, interval_hours=24):
+        """Run schedule_refresh in a daemon thread"""
+        self._thread = threading.Thread(
+            target=self.schedule_refresh, args=(interval_hours,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Run any refresh already requested, then stop the scheduler loop"""
+        self._events.put('stop')
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_refresh(self):
+        """
+        Refresh the dataset once from load_data
+
+        Returns:
+            dict: Refresh metrics, or None if there is nothing to refresh from
+        """
+        if self.load_data is None:
+            print(f"Starting scheduled refresh at {datetime.now()}: no data source configured")
+            return None
+
+        start = time.perf_counter()
+        try:
+            predictions_df, actual_df = self.load_data()
+            result = self.connector.incremental_refresh(
+                self.dataset, predictions_df, actual_df, self.watermarks, self.exporter
+            )
+        except Exception as e:
+            self.failures += 1
+            print(f"Error refreshing {self.dataset}: {str(e)}")
+            return None
+
+        # Duration includes loading the source data, not just merge and upload
+        result['duration_seconds'] = time.perf_counter() - start
+        self.runs += 1
+        self.rows_processed += result['rows_processed']
+        self.last_refresh = result
+        print(f"Refreshed {self.dataset}: {result['rows_processed']} new rows in "
+              f"{result['duration_seconds']:.2f}s (watermark {result['watermark']})")
+        return result
+
+    def metrics(self):
+        """Report refresh counts, rows processed and the last refresh"""
+        return {
+            'runs': self.runs,
+            'failures': self.failures,
+            'rows_processed': self.rows_processed,
+            'last_refresh': self.last_refresh
+        }
 
     def schedule_refresh(self, interval_hours=24):
         """
-        Schedule regular data refreshes
-        
+        Refresh on every trigger() and at least every interval_hours
+
+        Blocks until stop() is called; the loop sleeps on its event queue,
+        so it wakes only for a trigger, a stop or the interval.
+
         Args:
-            interval_hours (int): Refresh interval in hours
+            interval_hours (float): Longest time between refreshes
         """
-        def refresh_job():
-            print(f"Starting scheduled refresh at {datetime.now()}")
-            # Add your refresh logic here
-            
-        # Schedule job
-        schedule.every(interval_hours).hours.do(refresh_job)
-        
         while True:
-            schedule.run_pending()
-            time.sleep(60)
+            try:
+                event = self._events.get(timeout=interval_hours * 3600)
+            except queue.Empty:
+                event = 'refresh'
+
+            # Triggers that piled up during a refresh collapse into one
+            stop = event == 'stop'
+            pending = event == 'refresh'
+            while not stop:
+                try:
+                    event = self._events.get_nowait()
+                except queue.Empty:
+                    break
+                stop = event == 'stop'
+                pending = pending or event == 'refresh'
+
+            if pending:
+                self.run_refresh()
+            if stop:
+                return
@@ -0,0 +1,338 @@
+# src/powerbi_integration/upload_pipeline.py
+
+import gzip
+import io
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+import pandas as pd
+
+class InMemoryStorage:
+    def __init__(self):
+        """Blob storage stand-in that keeps uploaded blobs in a dict"""
+        self.blobs = {}
+        self._lock = threading.Lock()
+
+    def upload(self, blob_name: str, data: bytes) -> None:
+        with self._lock:
+            self.blobs[blob_name] = data
+
+    def download(self, blob_name: str) -> Optional[bytes]:
+        with self._lock:
+            return self.blobs.get(blob_name)
+
+class LocalFileStorage:
+    def __init__(self, directory: str):
+        """
+        Blob storage stand-in that writes each blob to a file
+
+        Args:
+            directory (str): Directory receiving the blobs
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def upload(self, blob_name: str, data: bytes) -> None:
+        path = os.path.join(self.directory, blob_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def download(self, blob_name: str) -> Optional[bytes]:
+        path = os.path.join(self.directory, blob_name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
+class AzureBlobStorage:
+    def __init__(self, connection_string: str, container_name: str):
+        """
+        Azure Blob Storage container with one client reused for every upload
+
+        Args:
+            connection_string (str): Storage account connection string
+            container_name (str): Container receiving the blobs
+        """
+        self.connection_string = connection_string
+        self.container_name = container_name
+        self._container_client = None
+        self._lock = threading.Lock()
+
+    @property
+    def container_client(self):
+        """Container client, created on first use"""
+        with self._lock:
+            if self._container_client is None:
+                from azure.storage.blob import BlobServiceClient
+                service_client = BlobServiceClient.from_connection_string(self.connection_string)
+                self._container_client = service_client.get_container_client(self.container_name)
+            return self._container_client
+
+    def upload(self, blob_name: str, data: bytes) -> None:
+        self.container_client.get_blob_client(blob_name).upload_blob(data, overwrite=True)
+
+    def download(self, blob_name: str) -> Optional[bytes]:
+        blob_client = self.container_client.get_blob_client(blob_name)
+        if not blob_client.exists():
+            return None
+        return blob_client.download_blob().readall()
+
+def serialize_csv(df: pd.DataFrame, compress: bool = True) -> bytes:
+    """
+    Write a frame as CSV, gzip-compressing it while it is written
+
+    Args:
+        df (pd.DataFrame): Rows to serialize
+        compress (bool): Gzip the CSV
+
+    Returns:
+        bytes: Blob contents
+    """
+    buffer = io.BytesIO()
+    raw = gzip.GzipFile(fileobj=buffer, mode='wb') if compress else buffer
+    text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    df.to_csv(text, index=False)
+    text.flush()
+    # Detach so closing the wrapper does not close the buffer being returned
+    text.detach()
+    if compress:
+        raw.close()
+    return buffer.getvalue()
+
+class BlobUploadPipeline:
+    def __init__(self, storage, window_seconds: float = 5.0, max_rows: int = 10000,
+                 max_queue: int = 1000, compress: bool = True, max_retries: int = 3,
+                 backoff_seconds: float = 0.5, blob_prefix: str = 'predictions',
+                 exporter=None):
+        """
+        Background uploader that coalesces prediction rows into one blob per window
+
+        Frames submitted within window_seconds (or until max_rows accumulate)
+        are concatenated and uploaded as a single CSV blob by a worker
+        thread, so callers never wait on the network.
+
+        Args:
+            storage: Object with upload(blob_name, data), e.g. AzureBlobStorage,
+                LocalFileStorage or InMemoryStorage
+            window_seconds (float): Longest time rows wait before being uploaded
+            max_rows (int): Rows that trigger an upload before the window ends
+            max_queue (int): Submitted frames held before submit() blocks
+            compress (bool): Gzip blobs (name ends in .csv.gz)
+            max_retries (int): Retries of a failed upload before it is dropped
+            backoff_seconds (float): First retry delay, doubled on every retry
+            blob_prefix (str): Blob name prefix
+            exporter (PartitionedExporter): Write each window as partitioned
+                columnar files instead of one CSV blob
+        """
+        self.storage = storage
+        self.window_seconds = window_seconds
+        self.max_rows = max_rows
+        self.compress = compress
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.blob_prefix = blob_prefix
+        self.exporter = exporter
+
+        self.rows_submitted = 0
+        self.rows_uploaded = 0
+        self.blobs_uploaded = 0
+        self.bytes_uploaded = 0
+        self.retries = 0
+        self.failed_blobs = 0
+        self.last_error = None
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._sequence = 0
+        self._stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='blob-upload', daemon=True)
+        self._thread.start()
+
+    def submit(self, df: pd.DataFrame, timeout: Optional[float] = None) -> None:
+        """
+        Queue rows for upload, blocking while the queue is full
+
+        Args:
+            df (pd.DataFrame): Rows to upload
+            timeout (float): Seconds to wait for queue space, None to wait indefinitely
+
+        Raises:
+            queue.Full: No space became available within timeout
+        """
+        if not self._thread.is_alive():
+            raise RuntimeError("Upload pipeline is closed")
+        self._queue.put(df, timeout=timeout)
+        with self._stats_lock:
+            self.rows_submitted += len(df)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every submitted row has been uploaded or dropped
+
+        Args:
+            timeout (float): Seconds to wait, None to wait until done
+
+        Returns:
+            bool: True once flushed, False if the timeout expired first
+
+        Raises:
+            RuntimeError: The worker thread is not running
+        """
+        if not self._thread.is_alive():
+            raise RuntimeError("Upload pipeline is closed")
+        done = threading.Event()
+        self._queue.put(done, timeout=timeout)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Poll so a worker that died cannot leave the caller waiting forever
+        while not done.wait(0.1):
+            if not self._thread.is_alive():
+                raise RuntimeError(f"Upload worker stopped before the flush completed: {self.last_error}")
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Upload pending rows and stop the worker thread
+
+        Args:
+            timeout (float): Seconds to wait for the worker, None to wait until done
+        """
+        if self._thread.is_alive():
+            self._queue.put(None, timeout=timeout)
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        pending = []
+        pending_rows = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+
+            if isinstance(item, pd.DataFrame):
+                if not pending:
+                    deadline = time.monotonic() + self.window_seconds
+                pending.append(item)
+                pending_rows += len(item)
+                if pending_rows < self.max_rows:
+                    continue
+
+            # Window elapsed, row limit reached, flush requested or closing
+            if pending:
+                self._upload(pending)
+                pending = []
+                pending_rows = 0
+                deadline = None
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                return
+
+    def _blob_name(self) -> str:
+        self._sequence += 1
+        suffix = '.csv.gz' if self.compress else '.csv'
+        return f'{self.blob_prefix}_{datetime.now().strftime("%Y%m%d_%H%M%S")}_{self._sequence:06d}{suffix}'
+
+    def _upload(self, frames: List[pd.DataFrame]) -> None:
+        """Concatenate frames into one blob and upload it, retrying with exponential backoff"""
+        blob_name = self.exporter.manifest_name if self.exporter is not None else self._blob_name()
+        try:
+            df = pd.concat(frames, ignore_index=True)
+            if self.exporter is not None:
+                def write() -> int:
+                    return sum(entry['bytes'] for entry in self.exporter.export(df))
+            else:
+                data = serialize_csv(df, self.compress)
+
+                def write() -> int:
+                    self.storage.upload(blob_name, data)
+                    return len(data)
+        except Exception as e:
+            # A batch that cannot be serialized is dropped without retrying; the worker keeps running
+            self.last_error = str(e)
+            with self._stats_lock:
+                self.failed_blobs += 1
+            print(f"Error preparing {blob_name}: {self.last_error}")
+            return
+
+        delay = self.backoff_seconds
+        for attempt in range(self.max_retries + 1):
+            try:
+                n_bytes = write()
+                with self._stats_lock:
+                    self.rows_uploaded += len(df)
+                    self.blobs_uploaded += 1
+                    self.bytes_uploaded += n_bytes
+                return
+            except Exception as e:
+                self.last_error = str(e)
+                if attempt == self.max_retries:
+                    break
+                with self._stats_lock:
+                    self.retries += 1
+                time.sleep(delay)
+                delay *= 2
+
+        with self._stats_lock:
+            self.failed_blobs += 1
+        print(f"Error uploading {blob_name} after {self.max_retries + 1} attempts: {self.last_error}")
+
+    def stats(self) -> Dict:
+        """Report rows, blobs, bytes, retries and failures so far"""
+        with self._stats_lock:
+            return {
+                'queued': self._queue.qsize(),
+                'rows_submitted': self.rows_submitted,
+                'rows_uploaded': self.rows_uploaded,
+                'blobs_uploaded': self.blobs_uploaded,
+                'bytes_uploaded': self.bytes_uploaded,
+                'retries': self.retries,
+                'failed_blobs': self.failed_blobs,
+                'last_error': self.last_error
+            }
+
+def create_upload_pipeline(storage, upload_config: Dict,
+                           date_column: str = 'PredictedAt') -> BlobUploadPipeline:
+    """
+    Build an upload pipeline from the powerbi.upload block of config.yaml
+
+    Args:
+        storage: Blob storage the pipeline writes to
+        upload_config (dict): powerbi.upload settings; storage and local_dir
+            are ignored because the caller has already picked the storage
+        date_column (str): Column partitioning the files in parquet format
+
+    Returns:
+        BlobUploadPipeline: Started pipeline
+    """
+    # Imported here because columnar_export imports this module
+    from .columnar_export import PartitionedExporter
+
+    settings = dict(upload_config)
+    settings.pop('storage', None)
+    settings.pop('local_dir', None)
+    file_format = settings.pop('format', 'csv')
+    route_column = settings.pop('route_column', None)
+    compression = settings.pop('parquet_compression', 'snappy')
+
+    # Parquet mode writes each window into date partitions listed in a manifest
+    exporter = None
+    if file_format == 'parquet':
+        exporter = PartitionedExporter(
+            storage,
+            settings.get('blob_prefix', 'predictions'),
+            date_column=date_column,
+            route_column=route_column,
+            compression=compression
+        )
+    return BlobUploadPipeline(storage, exporter=exporter, **settings)
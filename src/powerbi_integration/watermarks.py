@@ -0,0 +1,64 @@
+# src/powerbi_integration/watermarks.py
+
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional, Set
+import pandas as pd
+
+# Entry of the JSON file holding {dataset: [row keys delivered on the watermark Date]}
+DELIVERED_KEY = '_delivered'
+
+class WatermarkStore:
+    def __init__(self, path: str = 'data/processed/powerbi_watermarks.json'):
+        """
+        Persisted high-water mark per dataset for incremental refresh
+
+        Args:
+            path (str): JSON file holding {dataset: ISO timestamp}, plus the keys
+                of the rows already delivered on each watermark's Date
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+    def all(self) -> Dict[str, str]:
+        """Every stored watermark as ISO strings"""
+        return {dataset: value for dataset, value in self._read().items() if dataset != DELIVERED_KEY}
+
+    def delivered(self, dataset: str) -> Set[str]:
+        """Keys of the rows already delivered on the watermark's Date"""
+        return set(self._read().get(DELIVERED_KEY, {}).get(dataset, []))
+
+    def get(self, dataset: str) -> Optional[pd.Timestamp]:
+        """Latest Date already delivered for a dataset, or None before the first refresh"""
+        value = self.all().get(dataset)
+        return pd.Timestamp(value) if value is not None else None
+
+    def set(self, dataset: str, value, delivered: Optional[Iterable[str]] = None) -> None:
+        """
+        Advance a dataset's watermark, written atomically
+
+        Args:
+            dataset (str): Dataset name
+            value: Latest Date delivered
+            delivered (iterable): Keys of the rows delivered on that Date, so
+                rows arriving later for the same Date can be told apart
+        """
+        with self._lock:
+            marks = self._read()
+            marks[dataset] = pd.Timestamp(value).isoformat()
+            if delivered is not None:
+                marks.setdefault(DELIVERED_KEY, {})[dataset] = sorted(delivered)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(marks, f, indent=4)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,113 @@
+# src/prediction_cache.py
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from numbers import Number
+from typing import Dict, Optional
+
+class PredictionCache:
+    def __init__(self, max_size: int = 10000, ttl_seconds: Optional[float] = 300.0):
+        """
+        In-process LRU cache of predictions with time-to-live expiry
+
+        Entries belong to one model version; seeing a different version
+        clears the cache, so a swapped model never serves stale predictions.
+
+        Args:
+            max_size (int): Maximum number of cached predictions
+            ttl_seconds (float): Lifetime of an entry, or None to never expire
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.model_version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(input_data: Dict) -> str:
+        """Canonical hash of an input feature dict, independent of key order and int/float spelling"""
+        canonical = {
+            str(name): float(value) if isinstance(value, Number) and not isinstance(value, bool)
+            else value
+            for name, value in input_data.items()
+        }
+        payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _check_version(self, model_version) -> None:
+        """Drop every entry when the model version changes; caller holds the lock"""
+        if model_version != self.model_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.model_version = model_version
+
+    def get(self, key: str, model_version) -> Optional[float]:
+        """
+        Look up a cached prediction
+
+        Args:
+            key (str): Key from make_key
+            model_version: Version of the model that would score the input
+
+        Returns:
+            float: Cached prediction, or None on a miss
+        """
+        with self._lock:
+            self._check_version(model_version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, model_version, value: float) -> None:
+        """Store a prediction, evicting the least recently used entries if full"""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._check_version(model_version)
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Drop every cached prediction"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        """Report size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
@@ -0,0 +1,117 @@
+# src/prediction_server.py
+
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+from src.input_output import AirlineProfitIO
+from src.monitoring import LatencyTracker
+from src.request_coalescer import PredictionCoalescer
+
+class PredictionServer:
+    def __init__(self, io_handler: AirlineProfitIO, latency_window: int = 10000,
+                 coalescer: PredictionCoalescer = None):
+        """
+        Long-lived prediction service keeping a single model warm in memory
+
+        Args:
+            io_handler (AirlineProfitIO): IO handler wrapping the loaded model
+            latency_window (int): Number of recent requests used for percentiles
+            coalescer (PredictionCoalescer): Optional micro-batcher for single requests,
+                already started with start_background
+        """
+        self.io_handler = io_handler
+        self.coalescer = coalescer
+        self.latency = {
+            'single': LatencyTracker(latency_window),
+            'batch': LatencyTracker(latency_window)
+        }
+        self.started_at = time.time()
+
+    def handle(self, method: str, path: str, payload: Any = None) -> Tuple[int, Dict]:
+        """
+        Dispatch a request in-process
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+            payload: Decoded JSON body
+
+        Returns:
+            tuple: HTTP status code and response body
+        """
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        if method == 'GET' and path == '/stats':
+            return 200, self.stats()
+        if method == 'POST' and path == '/predict':
+            handler = (self.coalescer.predict_blocking if self.coalescer
+                       else self.io_handler.process_single_input)
+            return self._predict('single', handler, payload)
+        if method == 'POST' and path == '/predict/batch':
+            return self._predict('batch', self.io_handler.process_batch_input, payload)
+        return 404, {'status': 'error', 'message': f'Unknown route {method} {path}'}
+
+    def _predict(self, kind: str, handler, payload: Any) -> Tuple[int, Dict]:
+        """Run a prediction handler and record its latency"""
+        start = time.perf_counter()
+        result = handler(payload)
+        self.latency[kind].record(time.perf_counter() - start)
+
+        status = 200 if result.get('status') == 'success' else 400
+        return status, result
+
+    def stats(self) -> Dict:
+        """Report uptime and latency percentiles per request type"""
+        stats = {
+            'uptime_seconds': time.time() - self.started_at,
+            'latency': {kind: tracker.summary() for kind, tracker in self.latency.items()}
+        }
+        if self.coalescer:
+            stats['coalescing'] = self.coalescer.stats()
+        if self.io_handler.cache is not None:
+            stats['cache'] = self.io_handler.cache.stats()
+        return stats
+
+    def make_http_server(self, host: str = '127.0.0.1', port: int = 8080) -> ThreadingHTTPServer:
+        """Build an HTTP server routing requests to this service"""
+        service = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def _respond(self, status: int, body: Dict) -> None:
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond(*service.handle('GET', self.path))
+
+            def do_POST(self):
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    payload = json.loads(self.rfile.read(length) or b'null')
+                except ValueError as e:
+                    self._respond(400, {'status': 'error', 'message': f'Invalid JSON: {e}'})
+                    return
+                self._respond(*service.handle('POST', self.path, payload))
+
+            def log_message(self, format, *args):
+                pass
+
+        return ThreadingHTTPServer((host, port), RequestHandler)
+
+    def serve_forever(self, host: str = '127.0.0.1', port: int = 8080) -> None:
+        """Serve predictions over HTTP until interrupted"""
+        httpd = self.make_http_server(host, port)
+        print(f"Serving predictions on http://{host}:{httpd.server_address[1]}")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+            print("\nLatency summary:")
+            print(json.dumps(self.stats()['latency'], indent=2))
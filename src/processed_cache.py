@@ -0,0 +1,215 @@
+# src/processed_cache.py
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+from src.data_preprocessing import PIPELINE_VERSION, infer_dtypes, preprocess_data
+from src.model_artifact import file_sha256
+
+MANIFEST_NAME = 'manifest.json'
+PART_ROWS = 100000
+
+def cache_format() -> str:
+    """'parquet' when a parquet engine is installed, otherwise 'pickle'"""
+    for engine in ('pyarrow', 'fastparquet'):
+        if importlib.util.find_spec(engine) is not None:
+            return 'parquet'
+    return 'pickle'
+
+def cache_key(raw_sha256: str, target_column: Optional[str] = None,
+              lossy_float32: bool = False) -> str:
+    """Key of the processed data: raw file contents, pipeline version and settings"""
+    settings = json.dumps({
+        'raw_sha256': raw_sha256,
+        'pipeline_version': PIPELINE_VERSION,
+        'target_column': target_column,
+        'lossy_float32': lossy_float32
+    }, sort_keys=True)
+    return hashlib.sha256(settings.encode('utf-8')).hexdigest()
+
+def _cache_dir_for(filepath: str, cache_dir: str, key: str) -> str:
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(cache_dir, f'{stem}-{key[:16]}')
+
+def _write_part(df: pd.DataFrame, path: str, file_format: str) -> None:
+    if file_format == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_pickle(path)
+
+def _read_part(path: str, file_format: str) -> pd.DataFrame:
+    if file_format == 'parquet':
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+def read_manifest(directory: str) -> Optional[Dict]:
+    """Manifest of a processed data cache, or None if it was never completed"""
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def _concat_parts(frames: List[pd.DataFrame], categorical: List[str]) -> pd.DataFrame:
+    """Concatenate parts, keeping columns categorical even if parts saw different values"""
+    if len(frames) == 1:
+        return frames[0]
+    for column in categorical:
+        # Parts are categorized separately; align categories so concat does not fall back to object
+        for frame in frames:
+            if not isinstance(frame[column].dtype, pd.CategoricalDtype):
+                frame[column] = frame[column].astype('category')
+        categories = pd.api.types.union_categoricals(
+            [frame[column] for frame in frames], ignore_order=True
+        ).categories
+        for frame in frames:
+            frame[column] = frame[column].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+def _prune(filepath: str, cache_dir: str, keep: str) -> None:
+    """Remove caches of earlier versions of the same raw file"""
+    raw_path = os.path.abspath(filepath)
+    for name in os.listdir(cache_dir):
+        directory = os.path.join(cache_dir, name)
+        if directory == keep or not os.path.isdir(directory):
+            continue
+        manifest = read_manifest(directory)
+        if manifest is not None and manifest.get('raw_path') == raw_path:
+            shutil.rmtree(directory, ignore_errors=True)
+
+def _build(filepath: str, cache_dir: str, target_column: Optional[str], lossy_float32: bool,
+           raw_sha256: str, directory: str, part_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Preprocess the CSV chunk by chunk, writing each chunk as a part file
+
+    A first pass over the CSV picks one set of dtypes for the whole file
+    (see infer_dtypes), so every part has the same schema. Parts are written
+    to a temporary directory that is renamed into place with its manifest
+    once the whole file has been processed, so readers never see a partial
+    cache.
+    """
+    file_format = cache_format()
+    if file_format == 'pickle':
+        logging.warning("No parquet engine installed (pyarrow or fastparquet); "
+                        "caching processed data as pickle, which is slower and larger")
+    tmp_dir = f'{directory}.tmp-{os.getpid()}'
+    os.makedirs(tmp_dir, exist_ok=True)
+    try:
+        parts = []
+        exclude = [target_column] if target_column is not None else None
+        dtypes = infer_dtypes(pd.read_csv(filepath, chunksize=part_rows), exclude, lossy_float32)
+        categorical = {column for column, dtype in dtypes.items() if dtype == 'category'}
+        rows = 0
+        for chunk in pd.read_csv(filepath, chunksize=part_rows):
+            chunk = preprocess_data(chunk, dtypes=dtypes)
+            name = f'part-{len(parts):05d}.{file_format}'
+            _write_part(chunk, os.path.join(tmp_dir, name), file_format)
+            parts.append({'path': name, 'rows': len(chunk)})
+            rows += len(chunk)
+            yield chunk
+
+        manifest = {
+            'raw_path': os.path.abspath(filepath),
+            'raw_sha256': raw_sha256,
+            'pipeline_version': PIPELINE_VERSION,
+            'target_column': target_column,
+            'lossy_float32': lossy_float32,
+            'format': file_format,
+            'rows': rows,
+            'dtypes': dtypes,
+            'categorical': sorted(categorical),
+            'parts': parts,
+            'created_at': datetime.now().isoformat()
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=4)
+
+        try:
+            os.replace(tmp_dir, directory)
+        except OSError:
+            # Another process published the same cache first; its contents are identical
+            if read_manifest(directory) is None:
+                raise
+        else:
+            _prune(filepath, cache_dir, directory)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def _locate(filepath: str, cache_dir: str, target_column: Optional[str],
+            lossy_float32: bool):
+    raw_sha256 = file_sha256(filepath)
+    directory = _cache_dir_for(filepath, cache_dir,
+                               cache_key(raw_sha256, target_column, lossy_float32))
+    return raw_sha256, directory, read_manifest(directory)
+
+def iter_processed(filepath: str, cache_dir: str, chunksize: int = PART_ROWS,
+                   target_column: Optional[str] = None,
+                   lossy_float32: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Iterate over preprocessed data in chunks, from the cache when it is current
+
+    A missing or stale cache is rebuilt while the chunks are consumed, so
+    the first pass costs one CSV parse and memory stays bounded by chunksize.
+
+    Args:
+        filepath (str): Raw CSV file
+        cache_dir (str): Directory holding processed data caches
+        chunksize (int): Most rows per chunk
+        target_column (str): Column kept at full precision
+        lossy_float32 (bool): Store every float feature as float32
+
+    Yields:
+        pd.DataFrame: Preprocessed rows in file order
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    raw_sha256, directory, manifest = _locate(filepath, cache_dir, target_column, lossy_float32)
+    if manifest is None:
+        yield from _build(filepath, cache_dir, target_column, lossy_float32,
+                          raw_sha256, directory, chunksize)
+        return
+
+    for part in manifest['parts']:
+        df = _read_part(os.path.join(directory, part['path']), manifest['format'])
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize] if len(df) > chunksize else df
+
+def load_processed(filepath: str, cache_dir: str, target_column: Optional[str] = None,
+                   lossy_float32: bool = False, part_rows: int = PART_ROWS) -> pd.DataFrame:
+    """
+    Load preprocessed data, building the binary cache from the CSV if needed
+
+    The cache lives in <cache_dir>/<file stem>-<key>/ and is keyed on the
+    SHA-256 of the raw file, PIPELINE_VERSION and the preprocessing
+    settings, so editing the CSV or the pipeline invalidates it.
+
+    Args:
+        filepath (str): Raw CSV file
+        cache_dir (str): Directory holding processed data caches
+        target_column (str): Column kept at full precision
+        lossy_float32 (bool): Store every float feature as float32
+        part_rows (int): Rows per part file when the cache is built
+
+    Returns:
+        pd.DataFrame: Preprocessed data
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    raw_sha256, directory, manifest = _locate(filepath, cache_dir, target_column, lossy_float32)
+    if manifest is None:
+        frames = list(_build(filepath, cache_dir, target_column, lossy_float32,
+                             raw_sha256, directory, part_rows))
+        categorical = sorted({column for frame in frames
+                              for column in frame.select_dtypes('category').columns})
+    else:
+        frames = [_read_part(os.path.join(directory, part['path']), manifest['format'])
+                  for part in manifest['parts']]
+        categorical = manifest['categorical']
+
+    if not frames:
+        return pd.read_csv(filepath)
+    return _concat_parts(frames, categorical)
@@ -0,0 +1,137 @@
+# src/request_coalescer.py
+
+import asyncio
+import threading
+from typing import Dict, List, Optional
+from src.input_output import AirlineProfitIO
+from src.monitoring import Histogram
+
+class PredictionCoalescer:
+    def __init__(self, io_handler: AirlineProfitIO, max_batch_size: int = 64,
+                 max_wait_ms: float = 2.0):
+        """
+        Coalesce concurrent single predictions into vectorized batches
+
+        Args:
+            io_handler (AirlineProfitIO): IO handler wrapping the loaded model
+            max_batch_size (int): Maximum number of rows scored per batch
+            max_wait_ms (float): Maximum time the first queued request waits for company
+        """
+        self.io_handler = io_handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue_depth = Histogram(bounds=(0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024))
+        self.batch_size = Histogram()
+        self._queue = None
+        self._worker = None
+        self._loop = None
+        self._thread = None
+
+    async def start(self) -> None:
+        """Start the batching worker on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Flush queued requests and stop the batching worker"""
+        await self._queue.put(None)
+        await self._worker
+
+    async def predict(self, input_data: Dict) -> Dict:
+        """
+        Queue a single prediction and wait for its batched result
+
+        Args:
+            input_data (dict): Dictionary containing input features
+
+        Returns:
+            dict: Prediction results, as returned by process_single_input
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((input_data, future))
+        return await future
+
+    def start_background(self) -> None:
+        """Run the coalescer on its own event loop thread for use from synchronous code"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.start(), self._loop).result()
+
+    def stop_background(self) -> None:
+        """Stop the background event loop started by start_background"""
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def predict_blocking(self, input_data: Dict, timeout: Optional[float] = None) -> Dict:
+        """Submit a prediction from another thread and block until it is scored"""
+        return asyncio.run_coroutine_threadsafe(self.predict(input_data), self._loop).result(timeout)
+
+    def stats(self) -> Dict:
+        """Report queue-depth and batch-size histograms"""
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'queue_depth': self.queue_depth.summary(),
+            'batch_size': self.batch_size.summary()
+        }
+
+    async def _run(self) -> None:
+        """Gather queued requests into batches until stopped"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout > 0:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    else:
+                        item = self._queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self.queue_depth.observe(self._queue.qsize())
+            self.batch_size.observe(len(batch))
+
+            # Score off the event loop so new requests keep queueing meanwhile
+            try:
+                results = await loop.run_in_executor(None, self._score, [data for data, _ in batch])
+            except Exception as e:
+                # Fail this batch's callers, not the worker serving everyone after them
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _score(self, records: List[Dict]) -> List[Dict]:
+        """Score a batch with one predict call, falling back per row on failure"""
+        result = self.io_handler.process_batch_input(records)
+        if result['status'] != 'success':
+            # One bad record must not fail its neighbours
+            return [self.io_handler.process_single_input(record) for record in records]
+
+        return [
+            {
+                'status': 'success',
+                'predicted_profit': float(prediction),
+                'input_data': record
+            }
+            for record, prediction in zip(records, result['predictions'])
+        ]
@@ -0,0 +1,81 @@
+# src/shared_data.py
+
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+def fingerprint_arrays(*arrays: np.ndarray) -> str:
+    """
+    Content hash of one or more arrays, including their shapes and dtypes
+
+    Args:
+        *arrays (np.ndarray): Arrays to hash
+
+    Returns:
+        str: Hex digest identifying the data
+    """
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode('utf-8'))
+        digest.update(array.data)
+    return digest.hexdigest()
+
+def share_arrays(arrays: Dict[str, np.ndarray], directory: str) -> Dict[str, str]:
+    """
+    Write arrays to .npy files that worker processes can memory-map
+
+    Files already present are reused, so directory should be unique to the data
+    (e.g. named after fingerprint_arrays).
+
+    Args:
+        arrays (dict): Name -> array
+        directory (str): Directory to write the files to
+
+    Returns:
+        dict: Name -> .npy path, to be passed to load_shared
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name, array in arrays.items():
+        path = os.path.join(directory, f'{name}.npy')
+        if not os.path.exists(path):
+            # Write under a temporary name so readers never see a partial file
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(tmp_path, path)
+        paths[name] = path
+    return paths
+
+def load_shared(paths: Dict[str, str]) -> Dict[str, np.ndarray]:
+    """Memory-map arrays written by share_arrays read-only; pages are shared across processes"""
+    return {name: np.load(path, mmap_mode='r') for name, path in paths.items()}
+
+@contextmanager
+def shared_arrays(arrays: Dict[str, np.ndarray], shared_dir: str,
+                  prefix: str) -> Iterator[Dict[str, str]]:
+    """
+    share_arrays into a fresh directory under shared_dir, removed on exit
+
+    Each use gets its own directory, so concurrent runs over the same data
+    never delete files another run's workers are still reading.
+
+    Args:
+        arrays (dict): Name -> array
+        shared_dir (str): Parent directory for the per-run copies
+        prefix (str): Directory name prefix, e.g. a data fingerprint
+
+    Yields:
+        dict: Name -> .npy path, to be passed to load_shared
+    """
+    os.makedirs(shared_dir, exist_ok=True)
+    directory = tempfile.mkdtemp(prefix=f'{prefix}_', dir=shared_dir)
+    try:
+        yield share_arrays(arrays, directory)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,134 @@
+# src/tree_inference.py
+
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+NODE_DTYPE = np.dtype([
+    ('feature', np.int32),
+    ('threshold', np.float64),
+    ('left', np.int32),
+    ('right', np.int32),
+    ('value', np.float64)
+])
+
+# Upper bound on (rows x trees) node indices held in memory per traversal chunk
+MAX_CHUNK_CELLS = 1 << 20
+
+class CompiledForest:
+    def __init__(self, nodes: np.ndarray, roots: np.ndarray, max_depth: int,
+                 feature_names: Optional[List[str]] = None):
+        """
+        Flat-array random forest that predicts with vectorized NumPy traversal
+
+        Args:
+            nodes (np.ndarray): Contiguous NODE_DTYPE array holding every tree's nodes.
+                Child indices are absolute and leaves point to themselves.
+            roots (np.ndarray): Index of each tree's root node
+            max_depth (int): Depth of the deepest tree
+            feature_names (list): Column order expected by the forest
+        """
+        self.nodes = nodes
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.max_depth = int(max_depth)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+        self._feature = nodes['feature']
+        self._threshold = nodes['threshold']
+        self._left = nodes['left']
+        self._right = nodes['right']
+        self._value = nodes['value']
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict by walking all trees at once for each chunk of rows
+
+        The fixed overhead is far below sklearn's, which wins on small batches;
+        sklearn's compiled traversal is still faster for very large ones.
+
+        Args:
+            X (pd.DataFrame or np.ndarray): Features
+
+        Returns:
+            np.ndarray: Mean prediction across trees
+        """
+        if isinstance(X, pd.DataFrame) and self.feature_names is not None:
+            X = X[self.feature_names]
+        # Trees split on float32 features, exactly as sklearn does
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        predictions = np.empty(len(X), dtype=np.float64)
+        chunk_rows = max(1, MAX_CHUNK_CELLS // self.n_trees)
+        for start in range(0, len(X), chunk_rows):
+            chunk = np.ascontiguousarray(X[start:start + chunk_rows])
+            predictions[start:start + len(chunk)] = self._predict_chunk(chunk)
+
+        return predictions
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        """Traverse every (row, tree) pair, dropping pairs as they reach a leaf"""
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+
+        # One cell per (row, tree); offsets locate each cell's row in flat_X
+        leaves = np.tile(self.roots, n_rows)
+        cells = np.arange(leaves.size)
+        offsets = np.repeat(np.arange(n_rows, dtype=np.int64) * n_features, self.n_trees)
+        idx = leaves.copy()
+
+        for _ in range(self.max_depth):
+            go_left = flat_X[offsets + self._feature[idx]] <= self._threshold[idx]
+            next_idx = np.where(go_left, self._left[idx], self._right[idx])
+
+            done = next_idx == idx
+            if done.any():
+                leaves[cells[done]] = idx[done]
+                active = ~done
+                cells, offsets, next_idx = cells[active], offsets[active], next_idx[active]
+            idx = next_idx
+            if cells.size == 0:
+                break
+
+        leaves[cells] = idx
+        return self._value[leaves].reshape(n_rows, self.n_trees).mean(axis=1)
+
+def compile_forest(model) -> CompiledForest:
+    """
+    Flatten a fitted RandomForestRegressor into a single node array
+
+    Args:
+        model: Fitted sklearn RandomForestRegressor
+
+    Returns:
+        CompiledForest: Equivalent flat-array forest
+    """
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    sizes = [tree.node_count for tree in trees]
+    roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+
+    nodes = np.empty(sum(sizes), dtype=NODE_DTYPE)
+    for tree, offset, size in zip(trees, roots, sizes):
+        segment = nodes[offset:offset + size]
+        own_index = np.arange(offset, offset + size, dtype=np.int32)
+        is_leaf = tree.children_left == -1
+
+        # Leaves loop back to themselves so finished traversals are easy to detect
+        segment['feature'] = np.where(is_leaf, 0, tree.feature)
+        segment['threshold'] = np.where(is_leaf, np.inf, tree.threshold)
+        segment['left'] = np.where(is_leaf, own_index, tree.children_left + offset)
+        segment['right'] = np.where(is_leaf, own_index, tree.children_right + offset)
+        segment['value'] = tree.value[:, 0, 0]
+
+    feature_names = getattr(model, 'feature_names_in_', None)
+    return CompiledForest(
+        nodes,
+        roots,
+        max(tree.max_depth for tree in trees),
+        feature_names.tolist() if feature_names is not None else None
+    )
@@ -1,15 +1,49 @@
+import os
 import pandas as pd
-from sklearn.metrics import mean_squared_error, r2_score
+import yaml
 import numpy as np
 
-def evaluate_model(model, X_test, y_test):
-    """Evaluate the model performance"""
-    predictions = model.predict(X_test)
-    mse = mean_squared_error(y_test, predictions)
-    rmse = np.sqrt(mse)
-    r2 = r2_score(y_test, predictions)
+def load_config(config_path='config.yaml'):
+    """Load the project configuration"""
+    if not os.path.exists(config_path):
+        return {}
+    with open(config_path) as f:
+        return yaml.safe_load(f) or {}
+
+def evaluate_model(model, X_test, y_test, chunksize=None):
+    """
+    Evaluate the model performance
+
+    Args:
+        model: Fitted model exposing predict()
+        X_test: Holdout features
+        y_test: Holdout target
+        chunksize (int): If given, predict this many rows at a time so only
+            one chunk of predictions is held in memory
+
+    Returns:
+        dict: RMSE and R2
+    """
+    from src.model_evaluation import StreamingMetrics
+
+    accumulator = StreamingMetrics()
+    chunksize = chunksize or max(len(X_test), 1)
+    for start in range(0, len(X_test), chunksize):
+        X_chunk = _rows(X_test, start, start + chunksize)
+        accumulator.update(_rows(y_test, start, start + chunksize), model.predict(X_chunk))
+    metrics = accumulator.result()
     
     return {
-        'RMSE': rmse,
-        'R2': r2
+        'RMSE': metrics['rmse'],
+        'R2': metrics['r2_score']
     }
+
+def _rows(data, start, stop):
+    """Positional row slice of a DataFrame, Series or array"""
+    return data.iloc[start:stop] if hasattr(data, 'iloc') else data[start:stop]
+
+def plot_feature_importance(model, X, save_path=None, importances=None):
+    """Plot feature importance of a trained model, or precomputed permutation importances"""
+    # Plotting pulls in matplotlib/seaborn, so only import it when a plot is drawn
+    from src.model_evaluation import ModelEvaluator
+    ModelEvaluator().plot_feature_importance(model, X.columns.tolist(), save_path, importances)
@@ -0,0 +1,20 @@
+import os
+import sys
+import pytest
+
+# Tests import the flat src/ modules the same way main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import make_data
+
+@pytest.fixture(scope='session')
+def airline_data():
+    return make_data(2000)
+
+@pytest.fixture(scope='session')
+def trained_model(airline_data):
+    from src.model_training import AirlineProfitModel
+
+    model = AirlineProfitModel(n_estimators=10)
+    model.fit(*airline_data)
+    return model
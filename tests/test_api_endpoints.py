@@ -0,0 +1,152 @@
+import copy
+import gzip
+import io
+import logging
+import os
+import queue
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from benchmarks.synthetic_data import FEATURES
+from src.feature_engineering import derived_feature_engineer
+from src.input_output import AirlineProfitIO
+from src.model_training import AirlineProfitModel
+from src.powerbi_integration import api_endpoints
+from src.powerbi_integration.api_endpoints import create_app, load_serving_model
+from src.powerbi_integration.upload_pipeline import InMemoryStorage
+from src.utils import load_config
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.yaml')
+RECORD = {'date': '2024-01-02T00:00:00', 'predicted_profit': 1.5, 'actual_profit': 2.0,
+          'features': {'Route Type': 'Domestic'}}
+
+@pytest.fixture(scope='module')
+def config(airline_data, tmp_path_factory):
+    """config.yaml serving a model trained with derived features; the schema
+    also accepts a column the model does not use"""
+    X, y = airline_data
+    config = load_config(CONFIG_PATH)
+    config['features']['numerical'] = FEATURES + ['Fleet Availability (%)']
+    config['features']['categorical'] = []
+    config['features']['spill_dir'] = str(tmp_path_factory.mktemp('spill'))
+
+    engineer = derived_feature_engineer(config, columns=list(X.columns))
+    model = AirlineProfitModel(n_estimators=10)
+    model.fit(engineer.create_all_features(X.copy()), y)
+    model_path = str(tmp_path_factory.mktemp('serving') / 'model.joblib')
+    model.save_model(model_path)
+
+    config['serving'].update({'model_path': model_path, 'workers': 2, 'cache': {'enabled': False}})
+    config['powerbi']['upload'].update({'window_seconds': 60, 'compress': True, 'format': 'csv'})
+    return config
+
+@pytest.fixture
+def storage():
+    return InMemoryStorage()
+
+@pytest.fixture
+def client(config, storage):
+    with TestClient(create_app(storage=storage, config=config)) as client:
+        yield client
+
+@pytest.fixture(scope='module')
+def io_handler(config):
+    """The served model outside the app, scoring through process_single_input"""
+    model = load_serving_model(config['serving'])
+    return AirlineProfitIO(model, schema=config['features'],
+                           feature_engineer=derived_feature_engineer(config, model.feature_names))
+
+def request_rows(airline_data, n_rows):
+    X, _ = airline_data
+    rows = X.iloc[:n_rows].assign(**{'Fleet Availability (%)': 90.0})
+    return rows.to_dict(orient='records')
+
+def uploaded_rows(storage):
+    return pd.concat([pd.read_csv(io.BytesIO(gzip.decompress(data))) for data in storage.blobs.values()],
+                     ignore_index=True)
+
+def test_ingestion_is_accepted_then_uploaded_on_flush(client, storage):
+    response = client.post('/update_predictions', json=RECORD)
+    assert response.status_code == 202
+    assert response.json() == {'status': 'accepted', 'records': 1}
+
+    response = client.post('/update_predictions/batch', json=[RECORD] * 3)
+    assert response.status_code == 202
+    assert response.json() == {'status': 'accepted', 'records': 3}
+    assert not storage.blobs  # still inside the 60 second window
+
+    stats = client.post('/flush').json()
+    assert stats['rows_submitted'] == 4 and stats['rows_uploaded'] == 4 and stats['blobs_uploaded'] == 1
+    assert client.get('/upload_stats').json() == stats
+
+    rows = uploaded_rows(storage)
+    assert list(rows.columns) == ['Date', 'PredictedProfit', 'ActualProfit', 'Route Type']
+    assert (rows['PredictedProfit'] == 1.5).all() and len(rows) == 4
+
+def test_ingestion_without_storage_returns_503(config, monkeypatch):
+    def no_connector():
+        raise FileNotFoundError('config/powerbi_config.json')
+
+    monkeypatch.setattr(api_endpoints, 'get_connector', no_connector)
+    with TestClient(create_app(config=config)) as client:
+        assert client.app.state.upload_pipeline is None
+        for method, path, body in [('post', '/update_predictions', RECORD),
+                                   ('post', '/update_predictions/batch', [RECORD]),
+                                   ('post', '/flush', None), ('get', '/upload_stats', None)]:
+            response = client.request(method, path, json=body)
+            assert response.status_code == 503
+            assert response.json()['detail'] == 'PowerBI upload is not configured'
+
+def test_full_upload_queue_returns_503(client, monkeypatch):
+    def full(df, timeout=None):
+        assert timeout == 0  # the request must not wait for queue space
+        raise queue.Full
+
+    monkeypatch.setattr(client.app.state.upload_pipeline, 'submit', full)
+    for path, body in [('/update_predictions', RECORD), ('/update_predictions/batch', [RECORD])]:
+        response = client.post(path, json=body)
+        assert response.status_code == 503
+        assert response.json()['detail'] == 'Upload queue is full, retry later'
+
+def test_predict_derives_features_like_process_single_input(client, io_handler, airline_data):
+    assert client.app.state.feature_names == FEATURES
+    assert set(io_handler.model.feature_names) > set(FEATURES)  # derived features are scored too
+    rows = request_rows(airline_data, 5)
+    for row in rows:
+        response = client.post('/predict', json=row)
+        assert response.status_code == 200
+        # The unused schema field is dropped before scoring, as the app does
+        expected = io_handler.process_single_input({name: row[name] for name in FEATURES}, False)
+        assert response.json() == expected
+
+    response = client.post('/predict/batch', json=rows)
+    assert response.status_code == 200
+    predictions = response.json()['predictions']
+    assert predictions == [io_handler.process_single_input({name: row[name] for name in FEATURES},
+                                                           False)['predicted_profit'] for row in rows]
+
+def test_predict_rejects_records_missing_schema_fields(client, airline_data):
+    row = request_rows(airline_data, 1)[0]
+    del row['Fleet Availability (%)']
+    assert client.post('/predict', json=row).status_code == 422
+
+def test_predict_without_a_model_returns_503(config, storage, tmp_path):
+    missing = copy.deepcopy(config)
+    missing['serving']['model_path'] = str(tmp_path / 'missing.joblib')
+    with TestClient(create_app(storage=storage, config=missing)) as client:
+        row = {name: 1.0 for name in missing['features']['numerical']}
+        assert client.post('/predict', json=row).status_code == 503
+        assert client.post('/predict/batch', json=[row]).status_code == 503
+
+def test_startup_fails_when_the_schema_lacks_a_model_feature(config, storage):
+    broken = copy.deepcopy(config)
+    broken['features']['numerical'] = FEATURES[1:]
+    with pytest.raises(ValueError, match='Revenue'):
+        with TestClient(create_app(storage=storage, config=broken)):
+            pass
+
+def test_unused_schema_fields_are_logged(config, storage, caplog):
+    with caplog.at_level(logging.WARNING):
+        with TestClient(create_app(storage=storage, config=config)):
+            pass
+    assert any('Fleet Availability (%)' in record.getMessage() for record in caplog.records)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from src.input_output import AirlineProfitIO, load_columnar_input
+
+SCHEMA = {
+    'numerical': ['Revenue (USD)', 'Operating Cost (USD)', 'Load Factor (%)',
+                  'Aircraft Utilization (Hours/Day)', 'Fleet Availability (%)'],
+    'categorical': ['Aircraft Type']
+}
+
+@pytest.fixture
+def io_handler(trained_model):
+    return AirlineProfitIO(trained_model, schema=SCHEMA)
+
+@pytest.fixture
+def columns(airline_data):
+    X, _ = airline_data
+    return {name: X[name].to_numpy() for name in X.columns[::-1]}
+
+def test_columns_the_model_does_not_use_may_be_omitted(io_handler, trained_model, airline_data,
+                                                       columns, tmp_path):
+    X, _ = airline_data
+    path = str(tmp_path / 'batch.npz')
+    np.savez(path, **columns)
+
+    result = io_handler.process_columnar_input(load_columnar_input(path))
+    assert result['status'] == 'success', result
+    assert result['n_rows'] == len(X)
+    assert result['predictions'] == pytest.approx(trained_model.predict(X).tolist())
+
+def test_structured_npy_input(io_handler, trained_model, airline_data, tmp_path):
+    X, _ = airline_data
+    path = str(tmp_path / 'batch.npy')
+    np.save(path, X.head(5).to_records(index=False))
+
+    result = io_handler.process_columnar_input(load_columnar_input(path))
+    assert result['predictions'] == pytest.approx(trained_model.predict(X.head(5)).tolist())
+
+def test_missing_mistyped_and_ragged_columns_are_rejected(io_handler, columns):
+    missing = {name: column for name, column in columns.items() if name != 'Load Factor (%)'}
+    result = io_handler.process_columnar_input(missing)
+    assert result['status'] == 'error'
+    assert "missing column 'Load Factor (%)'" in result['message']
+    assert 'Fleet Availability' not in result['message'] and 'Aircraft Type' not in result['message']
+
+    mistyped = {**columns, 'Revenue (USD)': columns['Revenue (USD)'].astype(str)}
+    assert "must be numeric" in io_handler.process_columnar_input(mistyped)['message']
+
+    ragged = {**columns, 'Revenue (USD)': columns['Revenue (USD)'][:-1]}
+    assert "different lengths" in io_handler.process_columnar_input(ragged)['message']
+
+def test_schema_applies_when_the_model_has_no_feature_names(airline_data, columns):
+    class Unnamed:
+        def predict(self, X):
+            return np.zeros(len(X))
+
+    result = AirlineProfitIO(Unnamed(), schema=SCHEMA).process_columnar_input(columns)
+    assert result['status'] == 'error'
+    assert "missing column 'Fleet Availability (%)'" in result['message']
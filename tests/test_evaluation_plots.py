@@ -0,0 +1,74 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pytest
+from src import model_evaluation
+from src.model_evaluation import ModelEvaluator, stratified_sample
+
+N_ROWS = 20000
+MAX_POINTS = 1500
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+@pytest.fixture(scope='module')
+def targets():
+    rng = np.random.default_rng(0)
+    y_true = rng.lognormal(13, 1, N_ROWS)  # long right tail, sparse at the top
+    y_pred = y_true + rng.normal(0, 5e4, N_ROWS)
+    return y_true, y_pred
+
+@pytest.fixture
+def drawn(monkeypatch):
+    """(mode, points) of every scatter or density panel drawn"""
+    calls = []
+    draw_points = model_evaluation._draw_points
+
+    def record(fig, ax, x, y, mode, bins):
+        calls.append((mode, len(x)))
+        draw_points(fig, ax, x, y, mode, bins)
+
+    monkeypatch.setattr(model_evaluation, '_draw_points', record)
+    return calls
+
+def assert_png(path):
+    with open(path, 'rb') as f:
+        assert f.read(8) == PNG_SIGNATURE
+
+@pytest.mark.parametrize('mode, expected', [('density', 'density'), ('sample', 'sample'),
+                                            ('auto', 'density')])
+def test_save_plots_writes_every_plot(targets, drawn, tmp_path, mode, expected):
+    evaluator = ModelEvaluator()
+    evaluator.calculate_metrics(*targets)
+    paths = evaluator.save_plots(str(tmp_path), mode=mode, max_points=MAX_POINTS, bins=50)
+
+    assert sorted(paths) == ['actual_vs_predicted', 'residuals']
+    for path in paths.values():
+        assert_png(path)
+
+    assert [call[0] for call in drawn] == [expected, expected]
+    if expected == 'density':
+        # Density bins every row instead of capping them
+        assert [call[1] for call in drawn] == [N_ROWS, N_ROWS]
+    else:
+        # Both plots draw the same capped sample
+        assert drawn[0][1] == drawn[1][1]
+        assert MAX_POINTS * 0.9 <= drawn[0][1] <= MAX_POINTS
+
+def test_small_sets_are_scattered_in_full(targets, drawn, tmp_path):
+    y_true, y_pred = targets
+    evaluator = ModelEvaluator()
+    evaluator.calculate_metrics(y_true[:500], y_pred[:500])
+    paths = evaluator.save_plots(str(tmp_path), mode='sample', max_points=MAX_POINTS)
+
+    assert_png(paths['residuals'])
+    assert drawn == [('scatter', 500), ('scatter', 500)]
+
+def test_sample_keeps_the_largest_errors_and_the_tail(targets):
+    y_true, y_pred = targets
+    indices = stratified_sample(y_true, y_pred, MAX_POINTS)
+
+    assert len(indices) <= MAX_POINTS and len(np.unique(indices)) == len(indices)
+    errors = np.abs(y_true - y_pred)
+    assert np.isin(np.argsort(errors)[-int(MAX_POINTS * 0.05):], indices).all()
+    # The sparse top of the range is drawn, not just the dense middle
+    assert y_true[indices].max() >= np.sort(y_true)[-10]
@@ -0,0 +1,74 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.batch_scoring import score_csv_in_chunks
+from src.feature_engineering import FeatureEngineer
+from src.feature_plan import compile_feature_plan
+from src.model_training import AirlineProfitModel
+
+SPEC = {
+    'Revenue_Cost_Ratio': {'div': ['Revenue (USD)', 'Operating Cost (USD)']},
+    'Profit_Margin': {'div': [{'sub': ['Revenue (USD)', 'Operating Cost (USD)']}, 'Revenue (USD)']},
+    'Load_Utilization': {'mul': ['Load Factor (%)', 'Aircraft Utilization (Hours/Day)']}
+}
+
+def spilling_budget(n_rows: int) -> int:
+    """Room for the scratch arrays but not for the derived-feature block"""
+    block_bytes, scratch_bytes = compile_feature_plan(SPEC).estimate_bytes(n_rows)
+    return scratch_bytes + block_bytes // 2
+
+@pytest.fixture(scope='module')
+def raw_frame():
+    rng = np.random.default_rng(0)
+    n_rows = 1000
+    return pd.DataFrame({
+        'Revenue (USD)': rng.uniform(1e5, 5e6, n_rows),
+        'Operating Cost (USD)': rng.uniform(1e5, 4e6, n_rows),
+        'Load Factor (%)': rng.uniform(50, 100, n_rows),
+        'Aircraft Utilization (Hours/Day)': rng.uniform(4, 18, n_rows),
+        'Scheduled_Departure_Hour': rng.integers(0, 24, n_rows)
+    })
+
+def test_spilled_frame_matches_in_memory_features(raw_frame, tmp_path):
+    engineer = FeatureEngineer(compile_feature_plan(SPEC))
+    expected = engineer.create_all_features(raw_frame.copy())
+
+    spill_dir = str(tmp_path / 'spill')
+    frame = engineer.create_features_buffered(raw_frame, memory_budget=spilling_budget(len(raw_frame)),
+                                              spill_dir=spill_dir)
+    with frame:
+        assert frame.is_spilled
+        # Peak_Hour lives in the float block rather than as int64
+        pd.testing.assert_frame_equal(frame.to_frame()[expected.columns], expected, check_dtype=False)
+    assert frame.block is None
+    assert os.listdir(spill_dir) == []
+    assert list(raw_frame.columns) == ['Revenue (USD)', 'Operating Cost (USD)', 'Load Factor (%)',
+                                       'Aircraft Utilization (Hours/Day)', 'Scheduled_Departure_Hour']
+
+def test_chunked_scoring_spills_and_cleans_up(raw_frame, tmp_path):
+    engineer = FeatureEngineer(compile_feature_plan(SPEC))
+    training = engineer.create_all_features(raw_frame.copy()).drop(columns='Day_Period')
+    y = training['Revenue (USD)'] - training['Operating Cost (USD)']
+    model = AirlineProfitModel(n_estimators=5)
+    model.fit(training, y)
+
+    input_path = str(tmp_path / 'input.csv')
+    raw_frame.to_csv(input_path, index=False)
+    chunksize = 300
+
+    in_memory_path = str(tmp_path / 'in_memory.csv')
+    score_csv_in_chunks(model, input_path, in_memory_path, chunksize,
+                        feature_engineer=FeatureEngineer(compile_feature_plan(SPEC)))
+
+    spill_dir = str(tmp_path / 'spill')
+    spilled_path = str(tmp_path / 'spilled.csv')
+    spilling = FeatureEngineer(compile_feature_plan(SPEC), memory_budget=spilling_budget(chunksize),
+                               spill_dir=spill_dir)
+    summary = score_csv_in_chunks(model, input_path, spilled_path, chunksize, feature_engineer=spilling)
+
+    assert summary['rows'] == len(raw_frame)
+    assert os.path.isdir(spill_dir) and os.listdir(spill_dir) == []
+    spilled = pd.read_csv(spilled_path)
+    pd.testing.assert_frame_equal(spilled, pd.read_csv(in_memory_path))
+    assert list(spilled.columns) == list(raw_frame.columns) + ['Predicted_Profit']
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.feature_engineering import FeatureEngineer, derived_feature_engineer
+from src.input_output import AirlineProfitIO
+from src.model_training import AirlineProfitModel
+from src.utils import load_config
+
+CONFIG_PATH = __file__.rsplit('tests', 1)[0] + 'config.yaml'
+
+@pytest.fixture(scope='module')
+def config():
+    return load_config(CONFIG_PATH)
+
+@pytest.fixture(scope='module')
+def raw_frame():
+    rng = np.random.default_rng(0)
+    n_rows = 500
+    return pd.DataFrame({
+        'Revenue (USD)': rng.uniform(1e5, 5e6, n_rows),
+        'Operating Cost (USD)': rng.uniform(1e5, 4e6, n_rows),
+        'Load Factor (%)': rng.uniform(50, 100, n_rows),
+        'Aircraft Utilization (Hours/Day)': rng.uniform(4, 18, n_rows),
+        'Fleet Availability (%)': rng.uniform(60, 100, n_rows),
+        'Maintenance Downtime (Hours)': rng.uniform(0, 5, n_rows),
+        'Scheduled_Departure_Hour': rng.integers(0, 24, n_rows)
+    })
+
+def test_plan_matches_per_feature_methods(config, raw_frame):
+    expected = FeatureEngineer().create_all_features(raw_frame.copy())
+    actual = FeatureEngineer.from_config(config).create_all_features(raw_frame.copy())
+
+    assert sorted(actual.columns) == sorted(expected.columns)
+    pd.testing.assert_frame_equal(actual[expected.columns], expected, check_exact=False, rtol=1e-12)
+
+def test_training_skips_features_whose_inputs_are_missing(config, raw_frame):
+    columns = [name for name in raw_frame.columns if name != 'Fleet Availability (%)']
+    engineer = derived_feature_engineer(config, columns=columns)
+    assert 'Asset_Utilization' not in engineer.plan.feature_names
+    assert 'Revenue_Cost_Ratio' in engineer.plan.feature_names
+
+    assert derived_feature_engineer(config, feature_names=['Revenue (USD)']) is None
+    assert derived_feature_engineer({**config, 'features': {**config['features'], 'derive': False}}) is None
+
+def test_predictions_derive_features_from_raw_inputs(config, raw_frame):
+    raw = raw_frame.drop(columns='Scheduled_Departure_Hour')
+    training = derived_feature_engineer(config, columns=list(raw.columns)).create_all_features(raw.copy())
+    y = training['Revenue (USD)'] - training['Operating Cost (USD)']
+    model = AirlineProfitModel(n_estimators=5)
+    model.fit(training, y)
+
+    engineer = derived_feature_engineer(config, model.feature_names)
+    io_handler = AirlineProfitIO(model, feature_engineer=engineer)
+    assert io_handler.input_columns == list(raw.columns)
+
+    records = raw.head(3).to_dict('records')
+    expected = model.predict(training.head(3))
+    assert io_handler.process_single_input(records[0])['predicted_profit'] == pytest.approx(expected[0])
+    assert io_handler.process_batch_input(records)['predictions'] == pytest.approx(list(expected))
+    columnar = io_handler.process_columnar_input({name: raw[name].to_numpy()[:3] for name in raw.columns})
+    assert columnar['predictions'] == pytest.approx(list(expected))
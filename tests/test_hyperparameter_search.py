@@ -0,0 +1,56 @@
+import os
+import numpy as np
+import pytest
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold
+from src import hyperparameter_search
+from src.hyperparameter_search import HyperparameterSearch, build_estimator
+
+CONFIG = {
+    'model_params': {'random_forest': {'n_estimators': 5, 'random_state': 0}},
+    'training': {
+        'cv_folds': 3,
+        'search': {'param_grid': {'random_forest': {'max_depth': [3, None]}}, 'random_state': 7}
+    }
+}
+
+@pytest.fixture
+def search(tmp_path):
+    return HyperparameterSearch(CONFIG, n_jobs=2, cache_dir=str(tmp_path / 'cache'),
+                                shared_dir=str(tmp_path / 'shared'))
+
+@pytest.fixture(scope='module')
+def data(airline_data):
+    X, y = airline_data
+    return X.iloc[:400], y.iloc[:400]
+
+def in_memory_scores(X, y, params):
+    """Fold scores from fitting each fold directly on the in-memory arrays"""
+    X, y = X.to_numpy(dtype=np.float64), y.to_numpy(dtype=np.float64)
+    scores = []
+    for train_idx, test_idx in KFold(3, shuffle=True, random_state=7).split(X):
+        model = build_estimator('random_forest', {**params, 'n_jobs': 1}).fit(X[train_idx], y[train_idx])
+        scores.append(r2_score(y[test_idx], model.predict(X[test_idx])))
+    return scores
+
+def test_shared_data_scores_match_in_memory_folds_and_are_removed(search, data, tmp_path):
+    results = search.run(*data)
+
+    assert len(results) == 2
+    for result in results:
+        assert result['cached_folds'] == 0
+        assert result['fold_scores'] == pytest.approx(in_memory_scores(*data, result['params']),
+                                                      rel=1e-12)
+    assert os.listdir(tmp_path / 'shared') == []
+
+def test_second_run_reuses_every_cached_fold(search, data, tmp_path, monkeypatch):
+    first = search.run(*data)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("cached folds must not be refit")
+    monkeypatch.setattr(hyperparameter_search, 'ProcessPoolExecutor', no_pool)
+    second = search.run(*data)
+
+    assert [result['cached_folds'] for result in second] == [3, 3]
+    assert [result['fold_scores'] for result in second] == [result['fold_scores'] for result in first]
+    assert os.listdir(tmp_path / 'shared') == []
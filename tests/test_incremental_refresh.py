@@ -0,0 +1,76 @@
+import pandas as pd
+from src.powerbi_integration.columnar_export import deserialize_frame
+from src.powerbi_integration.data_connector import PowerBIConnector
+from src.powerbi_integration.upload_pipeline import InMemoryStorage
+from src.powerbi_integration.watermarks import WatermarkStore
+
+def make_connector():
+    # Skip __init__, which reads the Azure settings
+    connector = PowerBIConnector.__new__(PowerBIConnector)
+    connector.storage = InMemoryStorage()
+    return connector
+
+def frames(rows):
+    predictions = pd.DataFrame({'Date': [date for date, _ in rows], 'Flight': [f for _, f in rows],
+                                'Profit': 1.0})
+    actuals = pd.DataFrame({'Date': sorted({date for date, _ in rows}), 'Actual': 2.0})
+    return predictions, actuals
+
+def test_late_rows_for_the_watermark_day_are_delivered_once(tmp_path):
+    connector = make_connector()
+    watermarks = WatermarkStore(str(tmp_path / 'watermarks.json'))
+    rows = [('2024-01-01', 'A'), ('2024-01-02', 'B')]
+
+    first = connector.incremental_refresh('predictions', *frames(rows), watermarks)
+    assert first['rows_processed'] == 2
+    assert first['watermark'] == '2024-01-02T00:00:00'
+
+    # A row for the watermark day arrives after it was refreshed
+    rows.append(('2024-01-02', 'C'))
+    second = connector.incremental_refresh('predictions', *frames(rows), watermarks)
+    assert second['rows_processed'] == 1
+
+    rows.append(('2024-01-03', 'D'))
+    third = connector.incremental_refresh('predictions', *frames(rows), watermarks)
+    assert third['rows_processed'] == 1
+    assert third['watermark'] == '2024-01-03T00:00:00'
+
+    assert connector.incremental_refresh('predictions', *frames(rows), watermarks)['rows_processed'] == 0
+    assert watermarks.all() == {'predictions': '2024-01-03T00:00:00'}
+
+def test_streaming_filter_parses_string_dates():
+    connector = make_connector()
+    predictions, actuals = frames([('2024-01-01', 'A'), ('2024-01-02', 'B'), ('2024-01-03', 'C')])
+    since = pd.Timestamp('2024-01-02')
+
+    streamed = pd.concat(connector.stream_prediction_data([predictions], [actuals], since=since))
+    expected = connector.prepare_prediction_data(predictions, actuals, since=since)
+    assert list(streamed['Flight']) == list(expected['Flight']) == ['B', 'C']
+
+def chunks(df, size):
+    return (df.iloc[start:start + size] for start in range(0, len(df), size))
+
+def test_chunked_refresh_matches_the_in_memory_refresh(tmp_path):
+    rows = [(f'2024-01-{day:02d}', f'{day}{flight}') for day in range(1, 8) for flight in 'AB']
+    late = [('2024-01-07', '7C'), ('2024-01-08', '8A')]
+
+    results = {}
+    for mode in ('frames', 'chunks'):
+        connector = make_connector()
+        watermarks = WatermarkStore(str(tmp_path / f'{mode}.json'))
+        uploaded = []
+        for refresh_rows in (rows, rows + late):
+            predictions, actuals = frames(refresh_rows)
+            if mode == 'chunks':
+                predictions, actuals = chunks(predictions, 3), chunks(actuals, 2)
+            result = connector.incremental_refresh('predictions', predictions, actuals, watermarks)
+            uploaded.append((result['rows_processed'], result['watermark']))
+        blobs = [deserialize_frame(connector.storage.blobs[name], 'csv')
+                 for name in sorted(connector.storage.blobs)]
+        results[mode] = (uploaded, pd.concat(blobs).drop(columns='LastUpdated'), len(blobs))
+
+    assert results['chunks'][0] == results['frames'][0] == [(14, '2024-01-07T00:00:00'),
+                                                            (2, '2024-01-08T00:00:00')]
+    pd.testing.assert_frame_equal(results['chunks'][1].reset_index(drop=True),
+                                  results['frames'][1].reset_index(drop=True))
+    assert results['frames'][2] == 2 and results['chunks'][2] > 2
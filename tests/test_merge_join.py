@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.powerbi_integration.merge_join import read_sorted_csv, sorted_merge_join
+
+def chunked(df: pd.DataFrame, size: int):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+def merge_streaming(left, right, left_size, right_size):
+    batches = list(sorted_merge_join(chunked(left, left_size), chunked(right, right_size)))
+    return pd.concat(batches, ignore_index=True) if batches else None
+
+def expected_merge(left, right):
+    return pd.merge(left, right, on='Date', suffixes=('_predicted', '_actual'), sort=True)
+
+def test_duplicate_keys_spanning_chunks_give_the_cross_product():
+    left = pd.DataFrame({'Date': [1, 2, 2, 2, 3, 5], 'Profit': np.arange(6.0)})
+    right = pd.DataFrame({'Date': [2, 2, 3, 3, 4], 'Profit': np.arange(5.0) * 10})
+    expected = expected_merge(left, right)
+    assert len(expected) == 8
+
+    for left_size, right_size in [(1, 1), (2, 3), (4, 1), (6, 5)]:
+        pd.testing.assert_frame_equal(merge_streaming(left, right, left_size, right_size), expected)
+
+def test_keys_without_a_match_are_dropped():
+    left = pd.DataFrame({'Date': [1, 3, 5], 'Profit': [1.0, 3.0, 5.0]})
+    right = pd.DataFrame({'Date': [2, 4, 6], 'Profit': [2.0, 4.0, 6.0]})
+    assert expected_merge(left, right).empty
+    assert merge_streaming(left, right, 1, 2) is None
+
+    right = pd.DataFrame({'Date': [0, 3, 7], 'Profit': [0.0, 3.0, 7.0]})
+    pd.testing.assert_frame_equal(merge_streaming(left, right, 2, 1), expected_merge(left, right))
+
+def test_random_inputs_match_pd_merge():
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        n_left, n_right = rng.integers(0, 40, 2)
+        left = pd.DataFrame({'Date': np.sort(rng.integers(0, 10, n_left)), 'Profit': rng.normal(size=n_left)})
+        right = pd.DataFrame({'Date': np.sort(rng.integers(0, 10, n_right)), 'Profit': rng.normal(size=n_right)})
+        expected = expected_merge(left, right)
+        result = merge_streaming(left, right, *rng.integers(1, 8, 2))
+        if expected.empty:
+            assert result is None
+        else:
+            pd.testing.assert_frame_equal(result, expected)
+
+def test_unsorted_input_is_rejected():
+    left = pd.DataFrame({'Date': [3, 1], 'Profit': [1.0, 2.0]})
+    right = pd.DataFrame({'Date': [1, 3], 'Profit': [1.0, 2.0]})
+    with pytest.raises(ValueError, match='not sorted'):
+        list(sorted_merge_join([left], [right]))
+
+def test_read_sorted_csv_joins_like_pd_merge(tmp_path):
+    dates = pd.to_datetime(['2024-01-01', '2024-01-01', '2024-01-02', '2024-01-04'])
+    left = pd.DataFrame({'Date': dates, 'Profit': [1.0, 2.0, 3.0, 4.0]})
+    right = pd.DataFrame({'Date': dates[[0, 2, 2, 3]], 'Profit': [10.0, 20.0, 30.0, 40.0]})
+    left.to_csv(tmp_path / 'left.csv', index=False)
+    right.to_csv(tmp_path / 'right.csv', index=False)
+
+    batches = sorted_merge_join(read_sorted_csv(str(tmp_path / 'left.csv'), chunksize=1),
+                                read_sorted_csv(str(tmp_path / 'right.csv'), chunksize=2))
+    pd.testing.assert_frame_equal(pd.concat(list(batches), ignore_index=True), expected_merge(left, right))
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import joblib
+from src.model_artifact import is_stale, read_manifest, verify_artifact
+
+def test_artifact_is_stale_once_its_source_changes_or_disappears(trained_model, tmp_path):
+    model_path = str(tmp_path / 'model.joblib')
+    artifact_dir = str(tmp_path / 'model_artifact')
+    trained_model.save_model(model_path)
+    trained_model.export_model(artifact_dir, source_path=model_path)
+
+    assert not is_stale(artifact_dir, source_path=model_path)
+    assert not is_stale(artifact_dir, feature_names=trained_model.feature_names)
+    assert is_stale(artifact_dir, feature_names=list(reversed(trained_model.feature_names)))
+    assert is_stale(str(tmp_path / 'missing_artifact'), source_path=model_path)
+
+    joblib.dump({'replaced': True}, model_path)
+    assert is_stale(artifact_dir, source_path=model_path)
+
+    os.remove(model_path)
+    assert is_stale(artifact_dir, source_path=model_path)
+
+REEXPORT_SCRIPT = """
+import sys
+import numpy as np
+sys.path.insert(0, {root!r})
+from benchmarks.synthetic_data import make_data
+from src.model_artifact import read_manifest
+from src.model_training import AirlineProfitModel
+
+X, y = make_data(500)
+directory = {directory!r}
+large = AirlineProfitModel(n_estimators=30)
+large.fit(X, y)
+large.export_model(directory)
+
+served = AirlineProfitModel()
+served.load_compiled(directory)
+expected = large.model.predict(X)
+
+small = AirlineProfitModel(n_estimators=3, random_state=1)
+for _ in range(3):
+    small.fit(X, y)
+    small.export_model(directory)
+
+# The served forest still reads the node file it mapped
+assert np.allclose(served.predict(X.iloc[:200]), expected[:200])
+reloaded = AirlineProfitModel()
+reloaded.load_compiled(directory)
+assert reloaded.compiled.n_trees == 3 == read_manifest(directory)['n_trees']
+assert np.allclose(reloaded.predict(X.iloc[:200]), small.model.predict(X.iloc[:200]))
+"""
+
+def test_reexport_keeps_mapped_forests_readable(tmp_path):
+    # Run in a child: mapping a truncated file is a SIGBUS, not an exception
+    directory = str(tmp_path / 'model_artifact')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run([sys.executable, '-c', REEXPORT_SCRIPT.format(root=root, directory=directory)],
+                               capture_output=True, text=True, timeout=120)
+    assert completed.returncode == 0, completed.stderr
+
+    nodes_files = sorted(name for name in os.listdir(directory) if name.endswith('.npy'))
+    assert len(nodes_files) <= 2
+    assert read_manifest(directory)['nodes_file'] in nodes_files
+    assert verify_artifact(directory)
@@ -0,0 +1,125 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from main import AirlineProfitPrediction
+from src.model_artifact import is_stale, read_manifest
+from src.model_registry import ModelRegistry, resolve_model_path
+from src.model_training import AirlineProfitModel
+
+TARGET = 'Profit (USD)'
+
+def fitted_model(data, n_estimators=10):
+    model = AirlineProfitModel(n_estimators=n_estimators)
+    model.fit(*data)
+    return model
+
+def test_train_incremental_adds_trees_and_drops_the_oldest(airline_data):
+    X, y = airline_data
+    with pytest.raises(ValueError):
+        AirlineProfitModel().train_incremental(X, y)
+
+    model = fitted_model((X[:1000], y[:1000]))
+    version = model.version
+    oldest = model.model.estimators_[0]
+    model.compile()
+
+    result = model.train_incremental(X[1000:], y[1000:], n_new_trees=5)
+    assert result == {'trees_added': 5, 'trees_dropped': 0, 'n_estimators': 15}
+    assert model.params['n_estimators'] == 15
+    assert model.compiled is None and model.version != version
+    assert model.model.warm_start is False
+
+    result = model.train_incremental(X[1000:], y[1000:], n_new_trees=5, max_estimators=12)
+    assert result == {'trees_added': 5, 'trees_dropped': 8, 'n_estimators': 12}
+    assert oldest not in model.model.estimators_
+    assert len(model.predict(X[:10])) == 10
+
+def test_register_publish_and_resolve(airline_data, tmp_path):
+    root = str(tmp_path / 'models')
+    registry = ModelRegistry(root)
+    published = os.path.join(root, 'model.joblib')
+    assert resolve_model_path(published) == published
+
+    first = registry.register(fitted_model(airline_data), {'R2': np.float64(0.9)}, training_rows=2000)
+    assert registry.production_version is None
+    second = registry.register(fitted_model(airline_data, 12), {'R2': 0.95}, parent=first)
+
+    with open(os.path.join(root, 'registry.json')) as f:
+        index = json.load(f)
+    assert index['production'] is None
+    assert [entry['version'] for entry in index['versions']] == ['v0001', 'v0002']
+    assert index['versions'][0]['metrics'] == {'R2': 0.9}
+    assert index['versions'][0]['training_rows'] == 2000 and index['versions'][0]['parent'] is None
+    assert index['versions'][1]['parent'] == 'v0001' and index['versions'][1]['n_estimators'] == 12
+
+    registry.publish(first, registry.load(first))
+    assert ModelRegistry(root).production_version == first
+    assert not is_stale(registry.artifact_dir(first), source_path=registry.model_path(first))
+    assert resolve_model_path(published) == registry.model_path(first)
+    assert resolve_model_path(os.path.join(root, 'other.joblib')) == os.path.join(root, 'other.joblib')
+
+    registry.publish(second, registry.load(second))
+    assert resolve_model_path(published) == registry.model_path(second)
+    assert read_manifest(registry.artifact_dir(second))['n_trees'] == 12
+    assert read_manifest(registry.artifact_dir(first))['n_trees'] == 10
+    with pytest.raises(KeyError):
+        registry.promote('v0099')
+
+@pytest.fixture
+def retrain(airline_data, tmp_path):
+    """Run retrain_model against a registry whose production v0001 saw the first 1000 rows"""
+    X, y = airline_data
+    root = str(tmp_path / 'models')
+    registry = ModelRegistry(root)
+    production = fitted_model((X[:1000], y[:1000]))
+    registry.publish(registry.register(production, {'R2': 0.9}), production)
+
+    new_data = str(tmp_path / 'new.csv')
+    X[1000:].assign(**{TARGET: y[1000:]}).to_csv(new_data, index=False)
+
+    def run(max_r2_drop):
+        system = AirlineProfitPrediction({
+            'paths': {'models': root},
+            'training': {'target_column': TARGET, 'test_size': 0.2},
+            'retraining': {'mode': 'warm_start', 'n_new_trees': 5, 'max_r2_drop': max_r2_drop},
+            'features': {'derive': False},
+            'preprocessing': {'cache': False}
+        })
+        system.retrain_model(new_data, os.path.join(root, 'model.joblib'))
+        return system, ModelRegistry(root)
+    return run
+
+def artifact_files(directory):
+    return {name: os.stat(os.path.join(directory, name)).st_ino for name in os.listdir(directory)}
+
+def test_retrain_promotes_into_a_new_version_directory(retrain, tmp_path):
+    production_artifact = str(tmp_path / 'models' / 'v0001' / 'model_artifact')
+    before = artifact_files(production_artifact)
+
+    system, registry = retrain(max_r2_drop=10.0)
+
+    assert registry.production_version == 'v0002'
+    entry = registry.get('v0002')
+    assert entry['parent'] == 'v0001' and entry['mode'] == 'warm_start'
+    assert entry['training_rows'] == 800 and entry['n_estimators'] == 15
+    assert isinstance(entry['metrics']['R2'], float)
+    assert len(system.model.model.estimators_) == 15
+
+    # The old version's files are untouched; the new forest lives beside the new model
+    assert artifact_files(production_artifact) == before
+    assert not is_stale(registry.artifact_dir('v0002'), source_path=registry.model_path('v0002'))
+    assert resolve_model_path(str(tmp_path / 'models' / 'model.joblib')) == registry.model_path('v0002')
+    assert not os.path.exists(tmp_path / 'models' / 'model_artifact')
+
+def test_retrain_registers_but_keeps_production_when_r2_drops(retrain, tmp_path):
+    system, registry = retrain(max_r2_drop=-10.0)
+
+    assert registry.production_version == 'v0001'
+    assert [entry['version'] for entry in registry.list_versions()] == ['v0001', 'v0002']
+    assert registry.get('v0002')['parent'] == 'v0001'
+    assert os.path.exists(registry.model_path('v0002'))
+    assert not os.path.exists(registry.artifact_dir('v0002'))
+    assert resolve_model_path(str(tmp_path / 'models' / 'model.joblib')) == registry.model_path('v0001')
+    assert system.model is None
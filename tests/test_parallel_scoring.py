@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.batch_scoring import score_csv_in_chunks
+from src.model_training import AirlineProfitModel
+from src.parallel_scoring import ParallelScorer
+from src.tree_inference import compile_forest
+
+N_ROWS = 1003  # 3 workers x 100-row partitions: 11 partitions, the last one 3 rows
+
+@pytest.fixture(scope='module')
+def saved_model(trained_model, tmp_path_factory):
+    directory = tmp_path_factory.mktemp('parallel')
+    model_path = str(directory / 'model.joblib')
+    artifact_dir = str(directory / 'model_artifact')
+    trained_model.save_model(model_path)
+    trained_model.export_model(artifact_dir, source_path=model_path)
+    return {'joblib': model_path, 'artifact': artifact_dir}
+
+@pytest.fixture(scope='module')
+def shuffled(airline_data):
+    X, _ = airline_data
+    rows = np.random.default_rng(0).permutation(len(X))[:N_ROWS]
+    return X.iloc[rows].reset_index(drop=True)
+
+def serial_predictions(trained_model, source, X):
+    # compile_forest rather than trained_model.compile(): the session fixture must stay uncompiled
+    if source == 'artifact':
+        return compile_forest(trained_model.model).predict(X)
+    return trained_model.model.predict(X)
+
+@pytest.mark.parametrize('backend', ['process', 'thread'])
+@pytest.mark.parametrize('source', ['joblib', 'artifact'])
+def test_partitions_are_reassembled_in_row_order(trained_model, saved_model, shuffled, source, backend):
+    expected = serial_predictions(trained_model, source, shuffled)
+    with ParallelScorer(saved_model[source], n_workers=3, backend=backend, partition_rows=100) as scorer:
+        assert scorer.feature_names == trained_model.feature_names
+        predictions = scorer.predict(shuffled)
+        columnar = scorer.predict({name: shuffled[name].to_numpy() for name in shuffled.columns})
+        single = scorer.predict(shuffled.iloc[:1])
+
+    np.testing.assert_allclose(predictions, expected, rtol=1e-12)
+    np.testing.assert_allclose(columnar, expected, rtol=1e-12)
+    np.testing.assert_allclose(single, expected[:1], rtol=1e-12)
+
+def test_chunked_csv_scoring_matches_serial(saved_model, shuffled, tmp_path):
+    input_path = str(tmp_path / 'input.csv')
+    shuffled.to_csv(input_path, index=False)
+
+    serial_path = str(tmp_path / 'serial.csv')
+    parallel_path = str(tmp_path / 'parallel.csv')
+    serial = AirlineProfitModel()
+    serial.load_model(saved_model['joblib'])
+    score_csv_in_chunks(serial, input_path, serial_path, chunksize=400)
+    with ParallelScorer(saved_model['joblib'], n_workers=3, partition_rows=64) as scorer:
+        summary = score_csv_in_chunks(scorer, input_path, parallel_path, chunksize=400)
+
+    assert summary['rows'] == N_ROWS and summary['chunks'] == 3
+    pd.testing.assert_frame_equal(pd.read_csv(parallel_path), pd.read_csv(serial_path), check_exact=True)
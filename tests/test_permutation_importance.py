@@ -0,0 +1,34 @@
+import os
+import pickle
+import numpy as np
+import pytest
+from src.model_training import AirlineProfitModel
+from src.permutation_importance import PermutationImportance, _pool_source
+
+@pytest.fixture(scope='module')
+def trained_model(airline_data):
+    # train() keeps the holdout on the model, as in main.py
+    model = AirlineProfitModel(n_estimators=10)
+    model.train(*airline_data, cv_folds=2)
+    return model
+
+def engine(tmp_path, n_jobs):
+    config = {'evaluation': {'permutation_importance': {'n_repeats': 2}}}
+    return PermutationImportance(config, n_jobs=n_jobs, cache_dir=str(tmp_path / f'cache_{n_jobs}'),
+                                 shared_dir=str(tmp_path / 'shared'))
+
+def test_workers_receive_only_the_estimator(trained_model):
+    assert trained_model.X_test is not None
+    source = _pool_source(trained_model)
+    assert source is trained_model.model
+    assert len(pickle.dumps(source)) < len(pickle.dumps(trained_model))
+    assert _pool_source('models/model.joblib') == 'models/model.joblib'
+
+def test_pool_matches_serial(trained_model, tmp_path):
+    X_test, y_test = trained_model.X_test, trained_model.y_test
+    serial = engine(tmp_path, 1).run(trained_model, X_test, y_test)
+    pooled = engine(tmp_path, 2).run(trained_model, X_test, y_test)
+
+    assert list(pooled['feature']) == list(serial['feature'])
+    assert np.allclose(pooled['importance'], serial['importance'], rtol=1e-9, atol=1e-12)
+    assert os.listdir(tmp_path / 'shared') == []
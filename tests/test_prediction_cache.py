@@ -0,0 +1,70 @@
+import copy
+import pytest
+from src import prediction_cache
+from src.input_output import AirlineProfitIO
+from src.prediction_cache import PredictionCache
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(prediction_cache.time, 'monotonic', clock)
+    return clock
+
+def test_keys_ignore_order_and_int_float_spelling():
+    assert PredictionCache.make_key({'a': 1, 'b': 2.5}) == PredictionCache.make_key({'b': 2.5, 'a': 1.0})
+    assert PredictionCache.make_key({'a': 1}) != PredictionCache.make_key({'a': 2})
+
+def test_least_recently_used_entry_is_evicted_at_max_size():
+    cache = PredictionCache(max_size=2, ttl_seconds=None)
+    cache.put('a', 'v1', 1.0)
+    cache.put('b', 'v1', 2.0)
+    assert cache.get('a', 'v1') == 1.0  # 'b' is now the least recently used
+
+    cache.put('c', 'v1', 3.0)
+    assert cache.get('b', 'v1') is None
+    assert cache.get('a', 'v1') == 1.0 and cache.get('c', 'v1') == 3.0
+    stats = cache.stats()
+    assert stats['size'] == 2 and stats['evictions'] == 1
+    assert stats['hits'] == 3 and stats['misses'] == 1
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(max_size=10, ttl_seconds=5)
+    cache.put('a', 'v1', 1.0)
+
+    clock.now += 4.9
+    assert cache.get('a', 'v1') == 1.0
+    clock.now += 0.1
+    assert cache.get('a', 'v1') is None
+    assert cache.stats()['expirations'] == 1 and cache.stats()['size'] == 0
+
+def test_new_model_version_invalidates_every_entry():
+    cache = PredictionCache(max_size=10, ttl_seconds=None)
+    cache.put('a', 'v1', 1.0)
+    cache.put('b', 'v1', 2.0)
+
+    assert cache.get('a', 'v2') is None
+    assert cache.get('b', 'v1') is None  # switching back does not resurrect entries
+    assert cache.stats()['invalidations'] == 1
+
+def test_io_handler_does_not_serve_predictions_of_a_replaced_model(trained_model, airline_data):
+    X, y = airline_data
+    record = {name: float(value) for name, value in X.iloc[0].items()}
+    cache = PredictionCache(max_size=10, ttl_seconds=None)
+    io_handler = AirlineProfitIO(copy.deepcopy(trained_model), cache=cache)
+
+    first = io_handler.process_single_input(record)['predicted_profit']
+    assert io_handler.process_single_input(record)['predicted_profit'] == first
+    assert cache.stats()['hits'] == 1
+
+    io_handler.model.train_incremental(X[:200], y[:200] * 3, n_new_trees=20)
+    retrained = io_handler.process_single_input(record)['predicted_profit']
+    assert retrained == pytest.approx(io_handler.model.predict(X.iloc[:1])[0])
+    assert retrained != first
+    assert cache.stats()['invalidations'] == 1
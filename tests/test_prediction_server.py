@@ -0,0 +1,64 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from src.input_output import AirlineProfitIO
+from src.prediction_server import PredictionServer
+
+@pytest.fixture
+def server(trained_model):
+    return PredictionServer(AirlineProfitIO(trained_model))
+
+@pytest.fixture
+def record(airline_data):
+    X, _ = airline_data
+    return {name: float(value) for name, value in X.iloc[0].items()}
+
+def test_handle_predicts_with_the_warm_model(server, trained_model, airline_data, record):
+    X, _ = airline_data
+    status, body = server.handle('POST', '/predict', record)
+    assert status == 200
+    assert body['predicted_profit'] == pytest.approx(trained_model.predict(X.iloc[:1])[0])
+
+    status, body = server.handle('POST', '/predict/batch', [record, record])
+    assert status == 200
+    assert len(body['predictions']) == 2
+
+def test_handle_routes_and_errors(server, record):
+    assert server.handle('GET', '/health') == (200, {'status': 'ok'})
+    assert server.handle('GET', '/missing')[0] == 404
+
+    status, body = server.handle('POST', '/predict', {'Revenue (USD)': 1.0})
+    assert status == 400
+    assert body['status'] == 'error'
+
+    server.handle('POST', '/predict', record)
+    status, stats = server.handle('GET', '/stats')
+    assert status == 200
+    assert stats['latency']['single']['count'] == 2
+
+def _post(url: str, data: bytes):
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_http_round_trip_on_ephemeral_port(server, record):
+    httpd = server.make_http_server('127.0.0.1', 0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f'http://127.0.0.1:{httpd.server_address[1]}'
+        status, body = _post(f'{url}/predict', json.dumps(record).encode('utf-8'))
+        assert status == 200 and body['status'] == 'success'
+
+        status, body = _post(f'{url}/predict', b'{"Revenue (USD)": ')
+        assert status == 400
+        assert body['message'].startswith('Invalid JSON')
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join(timeout=5)
@@ -0,0 +1,81 @@
+import logging
+import os
+import numpy as np
+import pandas as pd
+from src import processed_cache
+from src.batch_scoring import score_csv_in_chunks
+from src.data_preprocessing import infer_dtypes
+from src.processed_cache import iter_processed, load_processed, read_manifest
+
+def write_csv(path, n_rows=1000):
+    """Columns whose per-chunk dtypes would differ: small then large integers,
+    floats exact in float32 only at first, and a low-cardinality string"""
+    rows = np.arange(n_rows)
+    pd.DataFrame({
+        'Flights': np.where(rows < n_rows // 2, rows % 100, rows * 100),
+        'Load Factor (%)': np.where(rows < n_rows // 2, 0.5, 1 / 3) * rows,
+        'Route': np.where(rows % 2, 'JFK-LAX', 'LHR-CDG'),
+        'Profit (USD)': rows * 1.1
+    }).to_csv(path, index=False)
+    return path
+
+def test_parts_share_the_dtypes_chosen_for_the_whole_file(tmp_path):
+    path = write_csv(str(tmp_path / 'flights.csv'))
+    cache_dir = str(tmp_path / 'cache')
+
+    chunks = list(iter_processed(path, cache_dir, chunksize=200, target_column='Profit (USD)'))
+    cached = list(iter_processed(path, cache_dir, chunksize=200, target_column='Profit (USD)'))
+    for chunk in chunks + cached:
+        pd.testing.assert_series_equal(chunk.dtypes, chunks[0].dtypes)
+
+    expected = infer_dtypes(pd.read_csv(path, chunksize=200), ['Profit (USD)'])
+    assert expected == {'Flights': 'int32', 'Load Factor (%)': 'float64',
+                        'Route': 'category', 'Profit (USD)': 'float64'}
+    directory, = os.listdir(cache_dir)
+    assert read_manifest(os.path.join(cache_dir, directory))['dtypes'] == expected
+
+    df = load_processed(path, cache_dir, target_column='Profit (USD)')
+    raw = pd.read_csv(path)
+    assert {column: str(dtype) for column, dtype in df.dtypes.items()} == expected
+    pd.testing.assert_frame_equal(df, raw, check_dtype=False, check_categorical=False)
+
+def test_pickle_fallback_warns(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(processed_cache, 'cache_format', lambda: 'pickle')
+    path = write_csv(str(tmp_path / 'flights.csv'), n_rows=10)
+    with caplog.at_level(logging.WARNING):
+        load_processed(path, str(tmp_path / 'cache'))
+    assert any('pickle' in record.getMessage() for record in caplog.records)
+
+class SumModel:
+    feature_names = ['Flights', 'Load Factor (%)']
+
+    def predict(self, X):
+        return X.sum(axis=1).to_numpy()
+
+def read_input_columns(path):
+    """Lines of a scored CSV without the trailing Predicted_Profit field"""
+    with open(path) as f:
+        return [line.rsplit(',', 1)[0] for line in f.read().splitlines()]
+
+def test_scored_csv_keeps_the_inputs_as_read(tmp_path):
+    path = write_csv(str(tmp_path / 'flights.csv'))
+    output_path = str(tmp_path / 'scored.csv')
+    score_csv_in_chunks(SumModel(), path, output_path, chunksize=300, lossy_float32=True)
+
+    with open(path) as f:
+        assert read_input_columns(output_path) == f.read().splitlines()
+
+def test_scored_csv_with_the_cache_copies_the_raw_inputs(tmp_path):
+    path = write_csv(str(tmp_path / 'flights.csv'))
+    with open(path) as f:
+        source = f.read().splitlines()
+    prebuilt = str(tmp_path / 'prebuilt')
+    # Cache parts of 200 rows, then scored in chunks of 300 that straddle them
+    list(iter_processed(path, prebuilt, chunksize=200, target_column='Profit (USD)', lossy_float32=True))
+
+    for cache_dir in (prebuilt, str(tmp_path / 'built_while_scoring')):
+        output_path = str(tmp_path / 'scored.csv')
+        summary = score_csv_in_chunks(SumModel(), path, output_path, chunksize=300,
+                                      cache_dir=cache_dir, lossy_float32=True)
+        assert summary['rows'] == 1000
+        assert read_input_columns(output_path) == source
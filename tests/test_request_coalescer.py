@@ -0,0 +1,59 @@
+import threading
+import pytest
+from src.request_coalescer import PredictionCoalescer
+
+class FlakyIO:
+    """IO handler whose scoring raises for records marked 'explode'"""
+
+    def process_batch_input(self, records):
+        if any(record.get('explode') for record in records):
+            raise RuntimeError("model crashed")
+        return {'status': 'success', 'predictions': [record['x'] * 2.0 for record in records]}
+
+    def process_single_input(self, record):
+        raise AssertionError("not reached")
+
+def run_coalescer(max_batch_size):
+    coalescer = PredictionCoalescer(FlakyIO(), max_batch_size=max_batch_size, max_wait_ms=20)
+    coalescer.start_background()
+    return coalescer
+
+def call_concurrently(coalescer, records):
+    results = {}
+
+    def call(i, record):
+        try:
+            results[i] = coalescer.predict_blocking(record, timeout=5)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i, record)) for i, record in enumerate(records)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_only_the_failing_batch_raises():
+    # One request per batch, so exactly the exploding request shares the failure
+    coalescer = run_coalescer(max_batch_size=1)
+    try:
+        results = call_concurrently(coalescer, [{'x': i, 'explode': i == 2} for i in range(6)])
+    finally:
+        coalescer.stop_background()
+
+    assert isinstance(results[2], RuntimeError)
+    for i in (0, 1, 3, 4, 5):
+        assert results[i]['predicted_profit'] == i * 2.0
+
+def test_worker_keeps_batching_after_a_failed_batch():
+    coalescer = run_coalescer(max_batch_size=8)
+    try:
+        with pytest.raises(RuntimeError, match="model crashed"):
+            coalescer.predict_blocking({'x': 0, 'explode': True}, timeout=5)
+        results = call_concurrently(coalescer, [{'x': i} for i in range(1, 6)])
+    finally:
+        coalescer.stop_background()
+
+    assert [results[i]['predicted_profit'] for i in range(5)] == [2.0, 4.0, 6.0, 8.0, 10.0]
+    assert coalescer.stats()['batch_size']['count'] >= 2
@@ -0,0 +1,87 @@
+import json
+import numpy as np
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_absolute_percentage_error, mean_squared_error, r2_score
+from src.model_evaluation import ModelEvaluator, StreamingMetrics, evaluate_chunks
+from src.utils import evaluate_model
+
+def sklearn_metrics(y_true, y_pred):
+    return {
+        'r2_score': r2_score(y_true, y_pred),
+        'rmse': np.sqrt(mean_squared_error(y_true, y_pred)),
+        'mae': mean_absolute_error(y_true, y_pred),
+        'mape': mean_absolute_percentage_error(y_true, y_pred) * 100
+    }
+
+def assert_metrics_equal(actual, expected):
+    assert actual.keys() == expected.keys()
+    for name, value in expected.items():
+        assert actual[name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+@pytest.fixture(scope='module')
+def targets():
+    rng = np.random.default_rng(0)
+    y_true = rng.normal(1e6, 5e5, 20011)
+    y_true[::97] = 0.0  # exercises MAPE's epsilon guard
+    y_pred = y_true + rng.normal(0, 5e4, len(y_true))
+    return y_true, y_pred
+
+@pytest.mark.parametrize('chunk_rows', [1, 7, 4096, 20011])
+def test_merged_chunks_equal_calculate_metrics(targets, chunk_rows):
+    y_true, y_pred = targets
+    expected = ModelEvaluator().calculate_metrics(y_true, y_pred)
+
+    pieces = [StreamingMetrics().update(y_true[i:i + chunk_rows], y_pred[i:i + chunk_rows])
+              for i in range(0, len(y_true), chunk_rows)]
+    merged = StreamingMetrics()
+    for piece in reversed(pieces):
+        merged.merge(piece)
+
+    assert_metrics_equal(merged.result(), expected)
+    assert_metrics_equal(ModelEvaluator().finalize(merged), expected)
+
+def test_calculate_metrics_matches_sklearn(targets):
+    assert_metrics_equal(ModelEvaluator().calculate_metrics(*targets), sklearn_metrics(*targets))
+
+def test_streaming_summary_matches_numpy(targets):
+    y_true, y_pred = targets
+    evaluator = ModelEvaluator()
+    evaluator.calculate_metrics_streaming(zip(np.array_split(y_true, 5), np.array_split(y_pred, 5)))
+    summary = evaluator.accumulator.summary()
+
+    assert summary['actual_summary']['std_actual'] == pytest.approx(np.std(y_true), rel=1e-12)
+    assert summary['prediction_summary']['mean_prediction'] == pytest.approx(np.mean(y_pred), rel=1e-12)
+    assert summary['actual_summary']['min_actual'] == y_true.min()
+
+@pytest.mark.parametrize('y_pred', [[3.0, 3.0, 3.0], [2.0, 3.0, 4.0]])
+def test_constant_target(y_pred):
+    y_true = [3.0, 3.0, 3.0]
+    assert_metrics_equal(StreamingMetrics().update(y_true, y_pred).result(), sklearn_metrics(y_true, y_pred))
+
+def test_chunked_model_evaluation(trained_model, airline_data):
+    X, y = airline_data
+    expected = sklearn_metrics(y, trained_model.predict(X))
+
+    chunked = evaluate_model(trained_model, X, y, chunksize=333)
+    assert chunked['R2'] == pytest.approx(expected['r2_score'], rel=1e-12)
+    assert chunked['RMSE'] == pytest.approx(expected['rmse'], rel=1e-12)
+
+    frame = X.assign(**{'Profit (USD)': y})
+    chunks = [frame.iloc[i:i + 500] for i in range(0, len(frame), 500)]
+    assert_metrics_equal(evaluate_chunks(trained_model, chunks, 'Profit (USD)').result(), expected)
+
+def test_report_before_metrics_raises(tmp_path):
+    report_path = tmp_path / 'report.json'
+    with pytest.raises(ValueError, match='No metrics to report'):
+        ModelEvaluator().generate_evaluation_report(str(report_path))
+    assert not report_path.exists()
+
+def test_report_after_finalize(targets, tmp_path):
+    evaluator = ModelEvaluator()
+    metrics = evaluator.finalize(StreamingMetrics().update(*targets))
+    report = evaluator.generate_evaluation_report(str(tmp_path / 'report.json'))
+
+    assert report['metrics'] == metrics
+    assert report['actual_summary']['max_actual'] == targets[0].max()
+    with open(tmp_path / 'report.json') as f:
+        assert json.load(f) == report
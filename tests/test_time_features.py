@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.bench_time_features import legacy_time_features
+from src.feature_engineering import FeatureEngineer
+
+def assert_matches_legacy(hours):
+    df = pd.DataFrame({'Scheduled_Departure_Hour': hours})
+    expected = legacy_time_features(df.copy())
+    actual = FeatureEngineer().create_time_features(df.copy())
+
+    pd.testing.assert_series_equal(actual['Peak_Hour'], expected['Peak_Hour'])
+    assert list(actual['Day_Period'].astype(object)) == list(expected['Day_Period'])
+
+def test_integer_hours_including_boundaries():
+    assert_matches_legacy(np.arange(24))
+
+@pytest.mark.parametrize('hours', [
+    [0.0, 4.99, 5.0, 5.5, 9.0, 9.01, 11.99, 12.0, 16.999, 17.0, 19.0, 19.5, 21.99, 22.0, 23.0, 23.5],
+    [np.nan, 0.0, 23.0, np.nan, 7.5, 18.25],
+    [-1.0, 24.0, 100.0]
+])
+def test_fractional_out_of_range_and_missing_hours(hours):
+    assert_matches_legacy(np.array(hours, dtype=float))
+
+def test_random_hours_with_missing_values():
+    rng = np.random.default_rng(42)
+    hours = rng.uniform(0, 24, 10000)
+    hours[rng.random(len(hours)) < 0.05] = np.nan
+    assert_matches_legacy(hours)
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from src.model_artifact import load_artifact, save_artifact
+from src.model_training import AirlineProfitModel
+from benchmarks.synthetic_data import make_data
+
+@pytest.mark.parametrize('params', [{}, {'max_depth': 3}, {'min_samples_leaf': 20, 'max_features': 0.5}])
+def test_compiled_forest_matches_sklearn(params):
+    X, y = make_data(3000)
+    model = AirlineProfitModel(n_estimators=15, **params)
+    model.fit(X, y)
+    compiled = model.compile()
+
+    X_new, _ = make_data(1000, seed=7)
+    np.testing.assert_allclose(compiled.predict(X_new), model.model.predict(X_new), rtol=1e-12)
+
+def test_compiled_forest_reorders_columns_and_accepts_single_rows(trained_model):
+    X, _ = make_data(50, seed=3)
+    compiled = trained_model.compile()
+    expected = trained_model.model.predict(X)
+
+    np.testing.assert_allclose(compiled.predict(X[X.columns[::-1]]), expected, rtol=1e-12)
+    np.testing.assert_allclose(compiled.predict(X.to_numpy()[0]), expected[:1], rtol=1e-12)
+
+def test_saved_artifact_predicts_like_the_forest(trained_model, tmp_path):
+    X, _ = make_data(200, seed=5)
+    save_artifact(trained_model.compile(), str(tmp_path / 'artifact'))
+    loaded = load_artifact(str(tmp_path / 'artifact'))
+    np.testing.assert_allclose(loaded.predict(X), trained_model.model.predict(X), rtol=1e-12)
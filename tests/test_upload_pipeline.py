@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+from src.powerbi_integration import upload_pipeline
+from src.powerbi_integration.upload_pipeline import BlobUploadPipeline, InMemoryStorage
+
+def test_bad_batch_is_dropped_and_worker_keeps_running(monkeypatch):
+    real_serialize = upload_pipeline.serialize_csv
+    calls = []
+
+    def serialize_once_broken(df, compress):
+        calls.append(len(df))
+        if len(calls) == 1:
+            raise ValueError("cannot serialize")
+        return real_serialize(df, compress)
+
+    monkeypatch.setattr(upload_pipeline, 'serialize_csv', serialize_once_broken)
+    storage = InMemoryStorage()
+    pipeline = BlobUploadPipeline(storage, window_seconds=60, max_retries=0)
+    try:
+        pipeline.submit(pd.DataFrame({'a': [1, 2]}))
+        assert pipeline.flush(timeout=5)
+        pipeline.submit(pd.DataFrame({'a': [3]}))
+        assert pipeline.flush(timeout=5)
+
+        stats = pipeline.stats()
+        assert stats['failed_blobs'] == 1
+        assert stats['last_error'] == "cannot serialize"
+        assert stats['rows_uploaded'] == 1
+        assert len(storage.blobs) == 1
+    finally:
+        pipeline.close(timeout=5)
+
+def test_flush_raises_instead_of_hanging_when_worker_died():
+    pipeline = BlobUploadPipeline(InMemoryStorage(), window_seconds=60)
+    pipeline.close(timeout=5)
+    with pytest.raises(RuntimeError):
+        pipeline.flush(timeout=1)